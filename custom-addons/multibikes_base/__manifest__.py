@@ -11,10 +11,12 @@
     "depends": ["base", "sale", "sale_renting", "sale_management", "web"],
     # Fichiers de données (vues, menus, actions, etc.)
     "data": [
+        "security/ir.model.access.csv",
         "views/product_template_views.xml",
         "views/sale_order_views.xml",
         "report/sale_report_caution.xml",
         "report/sale_report_contract.xml",
+        "report/mb_deposit_report_views.xml",
         "wizard/sale_order_discount.xml",
     ],
     # Configuration d'installation
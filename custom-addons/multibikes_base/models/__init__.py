@@ -4,3 +4,6 @@
 from . import product_template
 from . import sale_order
 from . import sale_order_line
+from . import mb_report_cache
+from . import ir_actions_report
+from . import mb_deposit_report
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""Model IrActionsReport for multibikes_base module."""
+import base64
+import io
+import logging
+
+from psycopg2.errors import UniqueViolation
+
+from odoo import models
+from odoo.tools import mute_logger
+
+_logger = logging.getLogger(__name__)
+
+# Rapports imprimés en masse au comptoir : données préchargées et PDF mis
+# en cache par commande
+BATCH_REPORTS = (
+    "multibikes_base.report_rental_contract",
+    "multibikes_base.report_saleorder_with_caution",
+    "multibikes_base.report_caution_only",
+)
+
+# Champs lus par les modèles des rapports, chargés en une requête par modèle
+PREFETCH_FIELDS = {
+    "sale.order": [
+        "name", "date_order", "partner_id", "order_line", "currency_id",
+        "amount_untaxed", "amount_tax", "amount_total", "mb_caution_total",
+        "mb_type_de_caution", "mb_numero_de_caution", "company_id",
+    ],
+    "res.partner": [
+        "name", "street", "street2", "zip", "city", "country_id",
+        "phone", "mobile", "email", "lang", "vat",
+    ],
+    "sale.order.line": [
+        "name", "product_id", "product_uom_qty", "product_uom", "price_unit",
+        "price_subtotal", "price_total", "discount", "tax_id", "display_type",
+        "mb_caution_unit", "mb_caution_subtotal", "mb_value_in_case_of_theft",
+    ],
+    "product.product": ["default_code", "product_tmpl_id"],
+}
+
+
+class IrActionsReport(models.Model):
+    """
+    Impression groupée des contrats et rapports de caution
+    -----------------------------------------------------
+    - les données des modèles sont préchargées pour toutes les commandes ;
+    - les commandes sans PDF en cache sont rendues en un seul appel
+      wkhtmltopdf (découpé par commande par Odoo) ;
+    - chaque PDF est conservé dans mb.report.cache jusqu'au changement de la
+      clé de cache de la commande.
+    """
+
+    _inherit = "ir.actions.report"
+
+    def _get_rendering_context(self, report, docids, data):
+        values = super()._get_rendering_context(report, docids, data)
+        if report.report_name in BATCH_REPORTS and values.get("docs"):
+            self._prefetch_report_data(values["docs"])
+        return values
+
+    def _prefetch_report_data(self, orders):
+        """Charge en bloc commandes, clients, lignes et produits"""
+        orders.fetch(PREFETCH_FIELDS["sale.order"])
+        orders.partner_id.fetch(PREFETCH_FIELDS["res.partner"])
+        lines = orders.order_line
+        lines.fetch(PREFETCH_FIELDS["sale.order.line"])
+        lines.product_id.fetch(PREFETCH_FIELDS["product.product"])
+
+    def _render_qweb_pdf_prepare_streams(self, report_ref, data, res_ids=None):
+        report = self._get_report(report_ref)
+        # _render_qweb_pdf ajoute toujours report_type : seules d'autres
+        # données propres à l'impression empêchent la mise en cache
+        if (
+            report.report_name not in BATCH_REPORTS
+            or not res_ids
+            or set(data or {}) - {"report_type"}
+        ):
+            return super()._render_qweb_pdf_prepare_streams(report_ref, data, res_ids=res_ids)
+
+        orders = self.env["sale.order"].browse(res_ids)
+        keys = orders._get_report_cache_keys(report)
+        caches = {
+            cache.order_id.id: cache
+            for cache in self.env["mb.report.cache"].sudo().search([
+                ("order_id", "in", orders.ids),
+                ("report_name", "=", report.report_name),
+            ])
+        }
+        missing_ids = [
+            res_id for res_id in res_ids
+            if res_id not in caches or caches[res_id].cache_key != keys[res_id]
+        ]
+        _logger.info(
+            "🖨️ %s : %d commande(s), %d en cache, %d à rendre",
+            report.report_name,
+            len(res_ids),
+            len(res_ids) - len(missing_ids),
+            len(missing_ids),
+        )
+
+        rendered = {}
+        if missing_ids:
+            rendered = super()._render_qweb_pdf_prepare_streams(
+                report_ref, data, res_ids=missing_ids
+            )
+            if rendered.get(False):
+                # PDF non découpable par commande : le rendu des commandes
+                # manquantes n'est pas mis en cache et suit les PDF en cache,
+                # sans second appel à wkhtmltopdf
+                streams = {
+                    res_id: self._cached_report_stream(caches[res_id])
+                    for res_id in res_ids
+                    if res_id not in missing_ids
+                }
+                streams[False] = rendered[False]
+                return streams
+            self._store_report_cache(report, rendered, keys, caches)
+
+        streams = {}
+        for res_id in res_ids:
+            if res_id in rendered:
+                streams[res_id] = rendered[res_id]
+            else:
+                streams[res_id] = self._cached_report_stream(caches[res_id])
+        return streams
+
+    def _cached_report_stream(self, cache):
+        """Flux d'un PDF en cache, au format de _render_qweb_pdf_prepare_streams"""
+        return {"stream": io.BytesIO(base64.b64decode(cache.pdf)), "attachment": None}
+
+    def _store_report_cache(self, report, rendered, keys, caches):
+        """
+        Crée ou met à jour les PDF en cache des commandes rendues
+
+        Chaque création se fait dans un savepoint : si une impression
+        concurrente a déjà mis la même commande en cache, la violation
+        d'unicité est absorbée et l'impression continue.
+        """
+        Cache = self.env["mb.report.cache"].sudo()
+        for res_id, values in rendered.items():
+            stream = values.get("stream")
+            if not stream:
+                continue
+            pdf_values = {
+                "cache_key": keys[res_id],
+                "pdf": base64.b64encode(stream.getvalue()),
+            }
+            if res_id in caches:
+                caches[res_id].write(pdf_values)
+                continue
+            try:
+                with mute_logger("odoo.sql_db"), self.env.cr.savepoint():
+                    Cache.create(dict(
+                        pdf_values, order_id=res_id, report_name=report.report_name
+                    ))
+            except UniqueViolation:
+                _logger.info(
+                    "🖨️ %s : commande %s déjà en cache (impression concurrente)",
+                    report.report_name,
+                    res_id,
+                )
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Model MbDepositReport for multibikes_base module."""
+from odoo import fields, models, tools
+
+
+class MbDepositReport(models.Model):
+    """
+    Cautions en cours par jour
+    -------------------------
+    Vue SQL : pour chaque jour de la période de location des commandes de
+    location confirmées, nombre de commandes et total des cautions, par
+    société et type de caution. Aucune commande n'est chargée par l'ORM.
+    """
+
+    _name = "mb.deposit.report"
+    _description = "Outstanding deposits per day"
+    _auto = False
+    _order = "date desc"
+
+    date = fields.Date(string="Day", readonly=True)
+    company_id = fields.Many2one("res.company", string="Company", readonly=True)
+    currency_id = fields.Many2one("res.currency", string="Currency", readonly=True)
+    mb_type_de_caution = fields.Selection(
+        selection=lambda self: self.env["sale.order"]._fields["mb_type_de_caution"].selection,
+        string="Type of deposit",
+        readonly=True,
+    )
+    order_count = fields.Integer(string="Rentals", readonly=True, aggregator="sum")
+    caution_total = fields.Monetary(
+        string="Outstanding deposits",
+        currency_field="currency_id",
+        readonly=True,
+        aggregator="sum",
+    )
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute(
+            f"""
+            CREATE OR REPLACE VIEW {self._table} AS (
+                SELECT ROW_NUMBER() OVER (
+                           ORDER BY day, so.company_id, so.currency_id, so.mb_type_de_caution
+                       ) AS id,
+                       day::date AS date,
+                       so.company_id,
+                       so.currency_id,
+                       so.mb_type_de_caution,
+                       COUNT(*) AS order_count,
+                       SUM(so.mb_caution_total) AS caution_total
+                  FROM sale_order so
+          CROSS JOIN LATERAL generate_series(
+                           date_trunc('day', so.rental_start_date),
+                           date_trunc('day', so.rental_return_date),
+                           interval '1 day'
+                       ) AS day
+                 WHERE so.state = 'sale'
+                   AND so.is_rental_order
+                   AND so.mb_caution_total != 0
+                   AND so.rental_start_date IS NOT NULL
+                   AND so.rental_return_date IS NOT NULL
+              GROUP BY day, so.company_id, so.currency_id, so.mb_type_de_caution
+            )
+            """
+        )
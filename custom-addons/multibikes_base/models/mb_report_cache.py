@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""Model MbReportCache for multibikes_base module."""
+from odoo import models, fields
+
+
+class MbReportCache(models.Model):
+    """
+    Cache des PDF de rapports par commande
+    -------------------------------------
+    Un PDF par (commande, rapport), valable tant que la clé de cache de la
+    commande (voir SaleOrder._get_report_cache_key) n'a pas changé. Le
+    contenu est stocké dans le filestore.
+    """
+
+    _name = "mb.report.cache"
+    _description = "Rendered report cache"
+
+    order_id = fields.Many2one(
+        "sale.order",
+        string="Order",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    report_name = fields.Char(string="Report", required=True)
+    cache_key = fields.Char(string="Cache key", required=True)
+    pdf = fields.Binary(string="PDF", attachment=True, required=True)
+
+    _sql_constraints = [
+        (
+            "order_report_unique",
+            "unique(order_id, report_name)",
+            "Only one cached PDF per order and report.",
+        ),
+    ]
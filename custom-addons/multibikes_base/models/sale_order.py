@@ -93,9 +93,58 @@ class SaleOrder(models.Model):
 
         return super().action_cancel()
 
+    def _get_report_cache_keys(self, report=None):
+        """
+        Clé de cache des rapports imprimés, par commande
+        ------------------------------------------------
+        Change dès que la commande, le client, la société ou l'une des
+        lignes est modifié, ou qu'une ligne est ajoutée ou supprimée. Avec
+        report, change aussi à la modification du rapport ou d'un modèle
+        QWeb (mise en page, sous-modèles appelés par t-call).
+
+        Returns:
+            dict: {order_id: clé}
+        """
+        report_dates = ()
+        if report:
+            latest_view = self.env["ir.ui.view"].sudo().search(
+                [("type", "=", "qweb")], order="write_date desc", limit=1
+            )
+            report_dates = (report.write_date, latest_view.write_date)
+        return {
+            order.id: "|".join(
+                str(value)
+                for value in (
+                    *report_dates,
+                    order.write_date,
+                    max(order.order_line.mapped("write_date"), default=False),
+                    ",".join(str(line_id) for line_id in sorted(order.order_line.ids)),
+                    order.partner_id.write_date,
+                    order.company_id.write_date,
+                )
+            )
+            for order in self
+        }
+
     @api.depends("order_line.mb_caution_subtotal")
     def _compute_mb_caution_total(self):
-        for order in self:
+        """
+        Total des cautions, en une requête groupée pour toutes les commandes
+        -------------------------------------------------------------------
+        Les commandes en cours d'édition (onchange, non enregistrées) sont
+        calculées en mémoire, leurs lignes pouvant différer de la base.
+        """
+        saved = self.filtered("id")
+        totals = dict(
+            self.env["sale.order.line"]._read_group(
+                domain=[("order_id", "in", saved.ids)],
+                groupby=["order_id"],
+                aggregates=["mb_caution_subtotal:sum"],
+            )
+        ) if saved else {}
+        for order in saved:
+            order.mb_caution_total = totals.get(order, 0.0)
+        for order in self - saved:
             order.mb_caution_total = sum(
                 line.mb_caution_subtotal or 0.0 for line in order.order_line
             )
@@ -1,2 +1,4 @@
 from . import test_product_template
 from . import test_sale_order
+from . import test_report_cache
+from . import test_deposit_report
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime
+
+from odoo.tests import tagged
+from .common import MultibikesBaseTestCommon
+
+
+@tagged("post_install", "-at_install")
+class TestDepositReport(MultibikesBaseTestCommon):
+    """Tests de la vue SQL des cautions en cours par jour"""
+
+    def _rental(self, start, end, qty, state="sale"):
+        order = self.env["sale.order"].create({
+            "partner_id": self.partner.id,
+            "is_rental_order": True,
+            "rental_start_date": start,
+            "rental_return_date": end,
+            "mb_type_de_caution": "cheque",
+            "order_line": [(0, 0, {
+                "product_id": self.product.product_variant_id.id,
+                "product_uom_qty": qty,
+            })],
+        })
+        order.write({"state": state})
+        return order
+
+    def test_outstanding_deposits_per_day(self):
+        """Les cautions sont comptées chaque jour de la période de location"""
+        self._rental(datetime(2031, 7, 1, 9), datetime(2031, 7, 3, 18), 1)
+        self._rental(datetime(2031, 7, 2, 9), datetime(2031, 7, 2, 18), 2)
+        self._rental(datetime(2031, 7, 2, 9), datetime(2031, 7, 2, 18), 5, state="draft")
+        self.env.flush_all()
+
+        rows = self.env["mb.deposit.report"].search_read(
+            [("date", ">=", "2031-07-01"), ("date", "<=", "2031-07-04")],
+            ["date", "order_count", "caution_total"],
+            order="date",
+        )
+        self.assertEqual(
+            [(str(row["date"]), row["order_count"], row["caution_total"]) for row in rows],
+            [
+                ("2031-07-01", 1, 200.0),
+                ("2031-07-02", 2, 600.0),
+                ("2031-07-03", 1, 200.0),
+            ],
+        )
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+import base64
+from unittest.mock import patch
+
+from odoo.tests import tagged
+from .common import MultibikesBaseTestCommon
+
+CONTRACT_REPORT = "multibikes_base.report_rental_contract"
+
+# PDF minimal d'une page renvoyé à la place de wkhtmltopdf
+MINIMAL_PDF = (
+    b"%PDF-1.4\n"
+    b"1 0 obj <</Type /Catalog /Pages 2 0 R>> endobj\n"
+    b"2 0 obj <</Type /Pages /Kids [3 0 R] /Count 1>> endobj\n"
+    b"3 0 obj <</Type /Page /Parent 2 0 R /MediaBox [0 0 595 842]>> endobj\n"
+    b"trailer <</Root 1 0 R>>\n"
+    b"%%EOF\n"
+)
+
+
+@tagged("post_install", "-at_install")
+class TestReportCache(MultibikesBaseTestCommon):
+    """Tests du cache des PDF de contrats par commande"""
+
+    def _render(self, orders):
+        Report = self.env["ir.actions.report"]
+        with patch.object(
+            type(Report), "_run_wkhtmltopdf", return_value=MINIMAL_PDF
+        ) as run:
+            streams = Report._render_qweb_pdf_prepare_streams(
+                CONTRACT_REPORT, {}, res_ids=orders.ids
+            )
+        return streams, run.call_count
+
+    def _render_pdf(self, orders):
+        """Impression complète, comme depuis le bouton du contrat"""
+        Report = self.env["ir.actions.report"].with_context(
+            force_report_rendering=True
+        )
+        with patch.object(
+            type(Report), "_run_wkhtmltopdf", return_value=MINIMAL_PDF
+        ) as run:
+            pdf, report_type = Report._render_qweb_pdf(
+                CONTRACT_REPORT, res_ids=orders.ids
+            )
+        self.assertEqual(report_type, "pdf")
+        return pdf, run.call_count
+
+    def _touch(self, table, record_id):
+        """Avance la date d'écriture d'un enregistrement"""
+        self.env.cr.execute(
+            f"UPDATE {table} SET write_date = write_date + interval '1 second'"
+            " WHERE id = %s",
+            [record_id],
+        )
+        self.env.invalidate_all()
+
+    def test_contract_cached_through_render(self):
+        """L'impression via _render_qweb_pdf réutilise le PDF en cache"""
+        _pdf, calls = self._render_pdf(self.sale_order)
+        self.assertEqual(calls, 1)
+        pdf, calls = self._render_pdf(self.sale_order)
+        self.assertEqual(calls, 0)
+        self.assertTrue(pdf.startswith(b"%PDF"))
+
+        # Modification du modèle du rapport : nouveau rendu
+        view = self.env["ir.ui.view"].search([("key", "=", CONTRACT_REPORT)])
+        self.env.cr.execute(
+            """
+            UPDATE ir_ui_view
+               SET write_date = (SELECT max(write_date) FROM ir_ui_view)
+                                + interval '1 second'
+             WHERE id = %s
+            """,
+            [view.id],
+        )
+        self.env.invalidate_all()
+        _pdf, calls = self._render_pdf(self.sale_order)
+        self.assertEqual(calls, 1)
+
+    def test_contract_cached_until_change(self):
+        """Le PDF est réutilisé tant que la commande n'est pas modifiée"""
+        streams, calls = self._render(self.sale_order)
+        self.assertEqual(calls, 1)
+        self.assertEqual(streams[self.sale_order.id]["stream"].getvalue(), MINIMAL_PDF)
+        self.assertEqual(
+            self.env["mb.report.cache"].search_count([("order_id", "=", self.sale_order.id)]),
+            1,
+        )
+
+        streams, calls = self._render(self.sale_order)
+        self.assertEqual(calls, 0)
+        self.assertEqual(streams[self.sale_order.id]["stream"].getvalue(), MINIMAL_PDF)
+
+        # Modification de la commande : nouvelle date d'écriture, nouveau rendu
+        self.env.cr.execute(
+            "UPDATE sale_order SET write_date = write_date + interval '1 second' WHERE id = %s",
+            [self.sale_order.id],
+        )
+        self.sale_order.invalidate_recordset(["write_date"])
+        _streams, calls = self._render(self.sale_order)
+        self.assertEqual(calls, 1)
+
+    def test_cache_keys(self):
+        """La clé change avec les lignes de la commande"""
+        key = self.sale_order._get_report_cache_keys()[self.sale_order.id]
+        line = self.env["sale.order.line"].create(
+            {
+                "order_id": self.sale_order.id,
+                "product_id": self.product.product_variant_id.id,
+                "product_uom_qty": 1,
+            }
+        )
+        self.env.cr.execute(
+            "UPDATE sale_order_line SET write_date = write_date + interval '1 second' WHERE id = %s",
+            [line.id],
+        )
+        self.env.invalidate_all()
+        self.assertNotEqual(self.sale_order._get_report_cache_keys()[self.sale_order.id], key)
+
+    def test_cache_keys_lines_and_company(self):
+        """La clé change à la suppression d'une ligne et avec la société"""
+        lines = self.env["sale.order.line"].create(
+            [
+                {
+                    "order_id": self.sale_order.id,
+                    "product_id": self.product.product_variant_id.id,
+                    "product_uom_qty": 1,
+                }
+                for _i in range(2)
+            ]
+        )
+        key = self.sale_order._get_report_cache_keys()[self.sale_order.id]
+        # La ligne restante garde sa date d'écriture
+        lines[1:].unlink()
+        self.env.invalidate_all()
+        lines_key = self.sale_order._get_report_cache_keys()[self.sale_order.id]
+        self.assertNotEqual(lines_key, key)
+
+        self._touch("res_company", self.sale_order.company_id.id)
+        self.assertNotEqual(
+            self.sale_order._get_report_cache_keys()[self.sale_order.id], lines_key
+        )
+
+    def test_concurrent_cache_creation(self):
+        """Une mise en cache concurrente de la même commande n'échoue pas"""
+        Cache = self.env["mb.report.cache"]
+        Cache.create(
+            {
+                "order_id": self.sale_order.id,
+                "report_name": CONTRACT_REPORT,
+                "cache_key": "impression concurrente",
+                "pdf": base64.b64encode(MINIMAL_PDF),
+            }
+        )
+        # La recherche préalable ne voit pas le PDF de l'autre impression
+        with patch.object(type(Cache), "search", return_value=Cache.browse()):
+            streams, calls = self._render(self.sale_order)
+        self.assertEqual(calls, 1)
+        self.assertEqual(streams[self.sale_order.id]["stream"].getvalue(), MINIMAL_PDF)
+        self.assertEqual(
+            Cache.search_count([("order_id", "=", self.sale_order.id)]), 1
+        )
+
+    def test_unsplittable_pdf_rendered_once(self):
+        """Un PDF non découpable est rendu une fois, hors commandes en cache"""
+        self._render(self.sale_order)
+        others = self.env["sale.order"].create(
+            [{"partner_id": self.partner.id} for _i in range(2)]
+        )
+        streams, calls = self._render(self.sale_order | others)
+        self.assertEqual(calls, 1)
+        self.assertEqual(set(streams), {self.sale_order.id, False})
+        self.assertEqual(streams[False]["stream"].getvalue(), MINIMAL_PDF)
@@ -114,3 +114,33 @@ class TestSaleOrder(MultibikesBaseTestCommon):
         with self.assertRaises(ValueError):
             self.sale_order.mb_type_de_caution = "invalid_type"
 
+
+    def test_caution_total_batch(self):
+        """Test du recalcul groupé du total des cautions"""
+        variants = self.products.product_variant_ids
+        orders = self.env["sale.order"].create([
+            {
+                "partner_id": self.partner.id,
+                "order_line": [
+                    (0, 0, {"product_id": variant.id, "product_uom_qty": qty})
+                    for variant in variants[:count]
+                ],
+            }
+            for count, qty in ((0, 1), (2, 1), (5, 3))
+        ])
+        expected = [
+            sum(line.mb_caution_subtotal for line in order.order_line)
+            for order in orders
+        ]
+
+        self.env.add_to_compute(orders._fields["mb_caution_total"], orders)
+        orders.flush_recordset(["mb_caution_total"])
+        orders.invalidate_recordset(["mb_caution_total"])
+        self.assertEqual(orders.mapped("mb_caution_total"), expected)
+
+        # Commande en cours d'édition : calcul en mémoire
+        new_order = self.env["sale.order"].new({
+            "partner_id": self.partner.id,
+            "order_line": [(0, 0, {"product_id": variants[0].id, "product_uom_qty": 2})],
+        })
+        self.assertEqual(new_order.mb_caution_total, 2 * variants[0].mb_caution)
@@ -7,7 +7,7 @@
         Il ajoute une fonctionnalité pour créer des commandes de prolongation basées sur des
         commandes de location existantes.
     """,
-    "version": "1.0",
+    "version": "1.1",
     "category": "Sales/Rental",
     "depends": ["sale_renting", "stock", "sale_stock"],
     "installable": True,
@@ -18,7 +18,9 @@
         "security/ir.model.access.csv",
         "views/rental_extension_wizard_line_views.xml",
         "views/rental_extension_views.xml",
+        "views/rental_bulk_extension_wizard_views.xml",
         "views/sale_order_views.xml",
+        "views/product_category_views.xml",
     ],
     "demo": [],
     "test": [],
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Initialise la chaîne de prolongations des commandes existantes
+-------------------------------------------------------------
+Calcule la location racine des prolongations existantes, leur rang dans la
+chaîne (par ordre de création) et le compteur porté par chaque racine.
+"""
+import logging
+
+from odoo import SUPERUSER_ID, api
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    SaleOrder = env["sale.order"]
+
+    extensions = SaleOrder.search([("mb_original_rental_id", "!=", False)])
+    env.add_to_compute(SaleOrder._fields["mb_root_rental_id"], extensions)
+    extensions.flush_recordset(["mb_root_rental_id"])
+
+    cr.execute(
+        """
+        WITH ranked AS (
+            SELECT id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY mb_root_rental_id ORDER BY id
+                   ) AS sequence
+            FROM sale_order
+            WHERE mb_root_rental_id IS NOT NULL
+        )
+        UPDATE sale_order so
+        SET mb_chain_sequence = ranked.sequence
+        FROM ranked
+        WHERE so.id = ranked.id
+    """
+    )
+    cr.execute(
+        """
+        UPDATE sale_order so
+        SET mb_chain_last_sequence = chain.last_sequence
+        FROM (
+            SELECT mb_root_rental_id, MAX(mb_chain_sequence) AS last_sequence
+            FROM sale_order
+            WHERE mb_root_rental_id IS NOT NULL
+            GROUP BY mb_root_rental_id
+        ) chain
+        WHERE so.id = chain.mb_root_rental_id
+    """
+    )
+    _logger.info(
+        "Chaînes de prolongation initialisées pour %d prolongation(s)", len(extensions)
+    )
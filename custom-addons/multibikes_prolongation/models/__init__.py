@@ -1 +1,2 @@
 from . import sale_order
+from . import product_category
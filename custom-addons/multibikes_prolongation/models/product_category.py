@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Module de prolongation de location pour Multibikes - Modèle Product Category
+--------------------------------------------------------------------------
+Classification vélo/accessoire des catégories de produits, utilisée pour la
+tarification des prolongations.
+"""
+
+import re
+import unicodedata
+
+from odoo import models, fields, api
+
+RENTAL_KINDS = [("bike", "Vélo"), ("accessory", "Accessoire")]
+
+# Mots reconnus dans le nom (sans accents), au singulier ou au pluriel
+RENTAL_KIND_NAME_HINTS = (
+    ("bike", re.compile(r"\bvelos?\b")),
+    ("accessory", re.compile(r"\baccessoires?\b")),
+)
+
+
+def _normalize(name):
+    """Minuscules sans accents, pour reconnaître « Vélos » comme « velos »"""
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def _name_rental_kind(name):
+    """Type déduit du nom : mot entier « vélo(s) » ou « accessoire(s) »"""
+    normalized = _normalize(name)
+    for kind, pattern in RENTAL_KIND_NAME_HINTS:
+        if pattern.search(normalized):
+            return kind
+    return False
+
+
+class ProductCategory(models.Model):
+    """
+    Extension du modèle Product Category
+    -----------------------------------
+    Ajoute un type de location (vélo/accessoire) hérité par les sous-catégories.
+    Sans type explicite sur la catégorie ou l'un de ses parents, le type est
+    déduit du nom (« vélo », « accessoire »), comme auparavant.
+    """
+
+    _inherit = "product.category"
+
+    mb_rental_kind = fields.Selection(
+        RENTAL_KINDS,
+        string="Type de location",
+        help="Type utilisé pour la tarification des prolongations, "
+        "appliqué aussi aux sous-catégories",
+    )
+    mb_inherited_rental_kind = fields.Selection(
+        RENTAL_KINDS,
+        string="Type de location hérité",
+        compute="_compute_mb_inherited_rental_kind",
+        store=True,
+        recursive=True,
+        help="Type explicite de la catégorie ou de son plus proche parent typé",
+    )
+    mb_effective_rental_kind = fields.Selection(
+        RENTAL_KINDS,
+        string="Type de location appliqué",
+        compute="_compute_mb_effective_rental_kind",
+        store=True,
+        recursive=True,
+        help="Type explicite hérité, sinon type déduit du nom de la catégorie "
+        "ou de ses parents",
+    )
+
+    @api.depends("mb_rental_kind", "parent_id.mb_inherited_rental_kind")
+    def _compute_mb_inherited_rental_kind(self):
+        for category in self:
+            category.mb_inherited_rental_kind = (
+                category.mb_rental_kind or category.parent_id.mb_inherited_rental_kind
+            )
+
+    @api.depends(
+        "name", "mb_inherited_rental_kind", "parent_id.mb_effective_rental_kind"
+    )
+    def _compute_mb_effective_rental_kind(self):
+        """
+        Un type explicite dans la lignée l'emporte ; sinon le nom le plus
+        proche reconnu. Sans type explicite hérité, le type appliqué du parent
+        est lui-même déduit des noms, d'où la récursion sur le parent.
+        """
+        for category in self:
+            category.mb_effective_rental_kind = (
+                category.mb_inherited_rental_kind
+                or _name_rental_kind(category.name)
+                or category.parent_id.mb_effective_rental_kind
+            )
+
+    def _get_rental_kind(self):
+        """
+        Retourne le type de location de la catégorie ('bike', 'accessory' ou False)
+        Champ stocké : lu par lot avec les autres champs de la catégorie.
+        """
+        self.ensure_one()
+        return self.mb_effective_rental_kind or False
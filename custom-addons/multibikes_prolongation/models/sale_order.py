@@ -33,11 +33,36 @@ class SaleOrder(models.Model):
     mb_original_rental_id = fields.Many2one(
         "sale.order",
         string="Location d'origine",
+        index="btree_not_null",
         help="La commande de location d'origine dont celle-ci est une prolongation",
     )
+    mb_root_rental_id = fields.Many2one(
+        "sale.order",
+        string="Location racine",
+        compute="_compute_mb_root_rental_id",
+        store=True,
+        recursive=True,
+        index="btree_not_null",
+        help="Première commande de la chaîne de prolongations (vide pour une location d'origine)",
+    )
+    mb_chain_sequence = fields.Integer(
+        string="Rang dans la chaîne",
+        readonly=True,
+        copy=False,
+        default=0,
+        help="Numéro de la prolongation dans sa chaîne (0 pour la location d'origine)",
+    )
+    mb_chain_last_sequence = fields.Integer(
+        string="Dernier rang attribué",
+        readonly=True,
+        copy=False,
+        default=0,
+        help="Compteur des prolongations de la chaîne, tenu sur la location racine",
+    )
     mb_extension_count = fields.Integer(
         string="Nombre de prolongations",
         compute="_compute_mb_extension_count",
+        store=True,
         help="Nombre de prolongations liées à cette location",
     )
     mb_rental_extensions_ids = fields.One2many(
@@ -49,10 +74,13 @@ class SaleOrder(models.Model):
     mb_has_rentable_lines = fields.Boolean(
         string="A des articles prolongeables",
         compute="_compute_mb_has_rentable_lines",
+        store=True,
         help="Indique s'il reste des articles qui peuvent être prolongés (livrés mais pas encore retournés)",
     )
 
-    @api.depends("order_line.qty_delivered", "order_line.qty_returned")
+    @api.depends(
+        "order_line.is_rental", "order_line.qty_delivered", "order_line.qty_returned"
+    )
     def _compute_mb_has_rentable_lines(self):
         """
         Vérifie s'il reste des articles à prolonger (livrés mais pas encore totalement retournés)
@@ -60,48 +88,47 @@ class SaleOrder(models.Model):
         Ce champ calculé est utilisé pour déterminer si le bouton de prolongation
         doit être affiché ou non dans l'interface.
 
-        Optimisation: Utilise une requête SQL directe pour éviter de charger tous les objets
-        en mémoire, ce qui améliore significativement les performances pour les grandes commandes.
+        Optimisation: une seule requête SQL groupée pour tout le lot, puis une
+        recherche dans un ensemble (O(1)) par commande.
         """
-        # Initialiser toutes les commandes à False dès le début
-        for order in self:
-            order.mb_has_rentable_lines = False
-
-        if not self.ids:
-            return
-
-        _logger.debug(
-            "Calcul des commandes avec articles prolongeables pour %d commandes",
-            len(self),
-        )
-
-        # Exécuter une requête SQL directe pour identifier les commandes avec des articles prolongeables
-        self.env.cr.execute(
-            """
-            SELECT so.id
-            FROM sale_order so
-            JOIN sale_order_line sol ON sol.order_id = so.id
-            WHERE so.id IN %s
-            AND sol.is_rental = TRUE
-            AND sol.qty_delivered > sol.qty_returned
-            GROUP BY so.id
-        """,
-            (tuple(self.ids),),
-        )
-
-        # Récupérer les IDs des commandes avec des articles prolongeables
-        order_ids_with_rentable_lines = [row[0] for row in self.env.cr.fetchall()]
+        order_ids_with_rentable_lines = set()
 
-        if order_ids_with_rentable_lines:
+        if self.ids:
             _logger.debug(
-                "Commandes avec articles prolongeables trouvées: %s",
-                ", ".join(map(str, order_ids_with_rentable_lines)),
+                "Calcul des commandes avec articles prolongeables pour %d commandes",
+                len(self),
             )
 
-            # Mettre à jour uniquement les commandes qui ont des articles prolongeables
-            for order in self:
-                if order.id in order_ids_with_rentable_lines:
-                    order.mb_has_rentable_lines = True
+            # Les quantités en cache doivent être écrites avant la requête SQL
+            self.env["sale.order.line"].flush_model(
+                ["order_id", "is_rental", "qty_delivered", "qty_returned"]
+            )
+            self.env.cr.execute(
+                """
+                SELECT DISTINCT sol.order_id
+                FROM sale_order_line sol
+                WHERE sol.order_id IN %s
+                AND sol.is_rental = TRUE
+                AND sol.qty_delivered > sol.qty_returned
+            """,
+                (tuple(self.ids),),
+            )
+            order_ids_with_rentable_lines = {row[0] for row in self.env.cr.fetchall()}
+
+        for order in self:
+            order.mb_has_rentable_lines = order.id in order_ids_with_rentable_lines
+
+    @api.depends("mb_original_rental_id.mb_root_rental_id")
+    def _compute_mb_root_rental_id(self):
+        """
+        Calcule la location racine de la chaîne de prolongations
+        -------------------------------------------------------
+        Stockée et indexée, elle permet de retrouver toute la chaîne
+        (origine → P1 → P2...) avec un seul domaine, sans récursion.
+        """
+        for order in self:
+            original = order.mb_original_rental_id
+            order.mb_root_rental_id = original.mb_root_rental_id or original
 
     @api.depends("mb_rental_extensions_ids")
     def _compute_mb_extension_count(self):
@@ -110,14 +137,22 @@ class SaleOrder(models.Model):
         -------------------------------------------------------
         Ce champ est utilisé pour l'affichage dans l'interface et pour
         déterminer si des prolongations existent pour cette commande.
+
+        Optimisation: un seul _read_group pour tout le lot au lieu de charger
+        le One2many de chaque commande.
         """
-        for order in self:
-            count = len(order.mb_rental_extensions_ids)
-            order.mb_extension_count = count
-            if count > 0:
-                _logger.debug(
-                    "Commande %s: %d prolongation(s) trouvée(s)", order.name, count
+        counts = {}
+        if self.ids:
+            counts = {
+                original.id: count
+                for original, count in self.env["sale.order"]._read_group(
+                    [("mb_original_rental_id", "in", self.ids)],
+                    groupby=["mb_original_rental_id"],
+                    aggregates=["__count"],
                 )
+            }
+        for order in self:
+            order.mb_extension_count = counts.get(order.id, 0)
 
     def action_extend_rental(self):
         """
@@ -184,32 +219,7 @@ class SaleOrder(models.Model):
         )
 
         # Préparer les lignes de l'assistant
-        wizard_line_vals = []
-        for line in self.order_line:
-            # Ne créer une ligne que si c'est un article de location
-            if not line.is_rental:
-                continue
-
-            # Ne créer une ligne que s'il reste des articles à prolonger
-            available_qty = line.qty_delivered - line.qty_returned
-            if available_qty <= 0:
-                continue
-
-            # Créer une ligne pour chaque produit de la commande
-            wizard_line_vals.append(
-                (
-                    0,
-                    0,
-                    {
-                        "mb_order_line_id": line.id,
-                        "mb_product_id": line.product_id.id,
-                        "mb_product_name": line.name,
-                        "mb_quantity": available_qty,  # Par défaut, proposer la quantité disponible
-                        "mb_uom_id": line.product_uom.id,
-                        "mb_selected": True,  # Par défaut, tous les produits sont sélectionnés
-                    },
-                )
-            )
+        wizard_line_vals = self._prepare_extension_wizard_line_vals()
 
         if not wizard_line_vals:
             _logger.warning(
@@ -260,12 +270,53 @@ class SaleOrder(models.Model):
             "context": context,
         }
 
+    def _prepare_extension_wizard_line_vals(self):
+        """
+        Prépare les lignes de l'assistant de prolongation
+        -----------------------------------------------
+        Une ligne par article de location livré et pas encore totalement
+        retourné, sélectionnée par défaut avec toute la quantité disponible.
+
+        Returns:
+            list: Commandes (0, 0, vals) pour le champ mb_line_ids
+        """
+        self.ensure_one()
+        wizard_line_vals = []
+        for line in self.order_line:
+            # Ne créer une ligne que si c'est un article de location
+            if not line.is_rental:
+                continue
+
+            # Ne créer une ligne que s'il reste des articles à prolonger
+            available_qty = line.qty_delivered - line.qty_returned
+            if available_qty <= 0:
+                continue
+
+            # Créer une ligne pour chaque produit de la commande
+            wizard_line_vals.append(
+                (
+                    0,
+                    0,
+                    {
+                        "mb_order_line_id": line.id,
+                        "mb_product_id": line.product_id.id,
+                        "mb_product_name": line.name,
+                        "mb_quantity": available_qty,  # Par défaut, proposer la quantité disponible
+                        "mb_uom_id": line.product_uom.id,
+                        "mb_selected": True,  # Par défaut, tous les produits sont sélectionnés
+                    },
+                )
+            )
+        return wizard_line_vals
+
     def action_view_extensions(self):
         """
         Affiche les prolongations liées à cette location
         ----------------------------------------------
         Cette méthode est appelée lorsque l'utilisateur clique sur le lien
         pour voir les prolongations dans l'onglet "Prolongations".
+        Affiche les prolongations directes (mb_rental_extensions_ids), soit
+        exactement les commandes comptées par mb_extension_count.
 
         Returns:
             dict: Action pour afficher la liste des prolongations
@@ -283,10 +334,74 @@ class SaleOrder(models.Model):
             "context": {"create": False},
         }
 
+    def action_view_rental_chain(self):
+        """
+        Affiche toute la chaîne de location
+        ----------------------------------
+        Location d'origine et toutes ses prolongations, directes ou non,
+        triées par rang, quelle que soit la commande de la chaîne ouverte.
+
+        Returns:
+            dict: Action pour afficher la liste de la chaîne
+        """
+        self.ensure_one()
+        chain = self._get_rental_chain()
+        return {
+            "name": _("Chaîne de location"),
+            "type": "ir.actions.act_window",
+            "view_mode": "tree,form",
+            "res_model": "sale.order",
+            "domain": [("id", "in", chain.ids)],
+            "context": {"create": False},
+        }
+
+    def _get_rental_chain(self):
+        """
+        Retourne toute la chaîne de location (racine et prolongations),
+        triée par rang, en une seule recherche indexée.
+        """
+        self.ensure_one()
+        root = self.mb_root_rental_id or self
+        return root | self.search(
+            [("mb_root_rental_id", "=", root.id)], order="mb_chain_sequence, id"
+        )
+
+    def _reserve_chain_sequence(self):
+        """
+        Réserve le prochain rang de prolongation sur la location racine
+        --------------------------------------------------------------
+        Incrément atomique en SQL : O(1) et sûr en cas de créations
+        concurrentes (la ligne de la racine est verrouillée jusqu'au commit).
+
+        Returns:
+            int: Rang attribué à la nouvelle prolongation
+        """
+        self.ensure_one()
+        self.env.cr.execute(
+            """
+            UPDATE sale_order
+            SET mb_chain_last_sequence = COALESCE(mb_chain_last_sequence, 0) + 1
+            WHERE id = %s
+            RETURNING mb_chain_last_sequence
+        """,
+            (self.id,),
+        )
+        sequence = self.env.cr.fetchone()[0]
+        self.invalidate_recordset(["mb_chain_last_sequence"])
+        return sequence
+
     @api.model_create_multi
     def create(self, vals_list):
         """Surcharge pour gérer correctement les noms des prolongations"""
         for vals in vals_list:
+            # Attribuer le rang dans la chaîne de prolongations
+            if vals.get("mb_original_rental_id"):
+                original = self.browse(vals["mb_original_rental_id"])
+                root = original.mb_root_rental_id or original
+                vals["mb_chain_sequence"] = root._reserve_chain_sequence()
+                if self._context.get("ignore_sequence") and not vals.get("name"):
+                    vals["name"] = f"{root.name}-P{vals['mb_chain_sequence']}"
+
             if self._context.get("ignore_sequence") and not vals.get("name"):
                 # Si nous ignorons la séquence pour une prolongation,
                 # utiliser un nom temporaire qui sera modifié après
@@ -1 +1,2 @@
 from . import test_rental_extension
+from . import test_query_budgets
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""Query-count and wall-time budget for the rental extension wizard."""
+import time
+from datetime import datetime, timedelta
+
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+
+# Tailles mesurées : le nombre de requêtes ne doit pas augmenter entre la
+# petite et la grande commande.
+LINE_COUNTS = (10, 50)
+
+# Budgets maximaux constants, valables pour les deux tailles : une régression
+# de coût fait échouer le test, une amélioration doit être reportée ici.
+QUERY_BUDGET = 120
+# Widget de quantité : calcul groupé par (entrepôt, date)
+QTY_WIDGET_QUERY_BUDGET = 40
+TIME_BUDGET = 30.0
+
+
+@tagged("post_install", "-at_install", "-standard", "mb_query_budget")
+class TestExtensionWizardBudget(TransactionCase):
+    """
+    Budget de requêtes SQL et de durée de l'assistant de prolongation.
+
+    Exclu de la suite standard (durées dépendantes de la machine), à lancer
+    seul avec --test-tags mb_query_budget.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        category = cls.env["product.category"].create({"name": "Vélos budget"})
+        recurrence = cls.env["sale.temporal.recurrence"].search(
+            [("duration", "=", 1), ("unit", "=", "day")], limit=1
+        ) or cls.env["sale.temporal.recurrence"].create(
+            {"name": "Jour", "duration": 1, "unit": "day"}
+        )
+        cls.products = cls.env["product.product"].create(
+            [
+                {
+                    "name": f"Vélo budget {i}",
+                    "type": "consu",
+                    "categ_id": category.id,
+                    "rent_ok": True,
+                    "product_pricing_ids": [
+                        (0, 0, {"recurrence_id": recurrence.id, "price": 10.0 + i})
+                    ],
+                }
+                for i in range(max(LINE_COUNTS))
+            ]
+        )
+        cls.partner = cls.env["res.partner"].create({"name": "Client budget"})
+
+        cls.today = datetime.today().replace(hour=9, minute=0, second=0, microsecond=0)
+        cls.return_date = cls.today + timedelta(days=3)
+        cls.rental_orders = [cls._create_rental_order(count) for count in LINE_COUNTS]
+
+    @classmethod
+    def _create_rental_order(cls, line_count):
+        """Location confirmée et livrée de line_count vélos"""
+        order = cls.env["sale.order"].create(
+            {
+                "partner_id": cls.partner.id,
+                "is_rental_order": True,
+                "rental_start_date": cls.today,
+                "rental_return_date": cls.return_date,
+                "order_line": [
+                    (
+                        0,
+                        0,
+                        {
+                            "product_id": product.id,
+                            "product_uom_qty": 1.0,
+                            "is_rental": True,
+                        },
+                    )
+                    for product in cls.products[:line_count]
+                ],
+            }
+        )
+        order.action_confirm()
+        for line in order.order_line:
+            line.qty_delivered = line.product_uom_qty
+        return order
+
+    def _create_wizard(self, rental_order):
+        return self.env["rental.extension.wizard"].create(
+            {
+                "mb_order_id": rental_order.id,
+                "mb_start_date": self.return_date,
+                "mb_end_date": self.return_date + timedelta(days=2),
+                "mb_line_ids": [
+                    (
+                        0,
+                        0,
+                        {
+                            "mb_order_line_id": line.id,
+                            "mb_product_id": line.product_id.id,
+                            "mb_product_name": line.name,
+                            "mb_quantity": line.product_uom_qty,
+                            "mb_uom_id": line.product_uom.id,
+                            "mb_selected": True,
+                        },
+                    )
+                    for line in rental_order.order_line
+                ],
+            }
+        )
+
+    def _count_queries(self, func):
+        self.env.flush_all()
+        self.env.invalidate_all()
+        count_before = self.cr.sql_log_count
+        func()
+        self.env.flush_all()
+        return self.cr.sql_log_count - count_before
+
+    def assertConstantQueries(self, counts, budget, label):
+        """Budget constant pour chaque taille, sans croissance avec la taille"""
+        for line_count, count in zip(LINE_COUNTS, counts):
+            self.assertLessEqual(
+                count,
+                budget,
+                f"{label} ({line_count} lignes) : {count} requêtes"
+                f" pour un budget de {budget}",
+            )
+        self.assertLessEqual(
+            counts[-1],
+            counts[0],
+            f"{label} : {counts[0]} requêtes pour {LINE_COUNTS[0]} lignes,"
+            f" {counts[-1]} pour {LINE_COUNTS[-1]} :"
+            " le coût dépend du nombre de lignes",
+        )
+
+    def test_extension_wizard_budget(self):
+        """Création d'une prolongation de 10 puis 50 lignes."""
+        counts = []
+        for rental_order in self.rental_orders:
+            wizard = self._create_wizard(rental_order)
+            started = time.perf_counter()
+            counts.append(self._count_queries(wizard.create_extension_order))
+            elapsed = time.perf_counter() - started
+
+            self.assertLessEqual(
+                elapsed,
+                TIME_BUDGET,
+                f"Prolongation : {elapsed:.2f}s pour un budget de {TIME_BUDGET}s",
+            )
+            self.assertEqual(
+                len(rental_order.mb_rental_extensions_ids.order_line),
+                len(rental_order.order_line),
+            )
+        self.assertConstantQueries(counts, QUERY_BUDGET, "Prolongation")
+
+    def test_qty_widget_budget(self):
+        """Quantités du widget qty_at_date pour 10 puis 50 lignes."""
+        counts = []
+        for rental_order in self.rental_orders:
+            lines = self._create_wizard(rental_order).mb_line_ids
+
+            def read_widget(lines=lines):
+                lines.mapped("virtual_available_at_date")
+                lines.mapped("move_ids")
+
+            counts.append(self._count_queries(read_widget))
+        self.assertConstantQueries(
+            counts, QTY_WIDGET_QUERY_BUDGET, "Widget de quantité"
+        )
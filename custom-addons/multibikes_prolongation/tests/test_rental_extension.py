@@ -456,3 +456,212 @@ class TestRentalExtension(TransactionCase):
             self.rental_order.mb_has_rentable_lines,
             "La commande devrait avoir des articles prolongeables",
         )
+
+    def test_06_batch_counts(self):
+        """
+        Test des calculs groupés sur plusieurs commandes
+        ----------------------------------------------
+        Vérifie que le nombre de prolongations et la présence d'articles
+        prolongeables sont corrects pour un lot de commandes.
+        """
+        other_order = self.rental_order.copy()
+        extensions = self.env["sale.order"].create(
+            [
+                {
+                    "partner_id": self.partner.id,
+                    "mb_is_rental_extension": True,
+                    "mb_original_rental_id": self.rental_order.id,
+                }
+                for _i in range(3)
+            ]
+        )
+        orders = self.rental_order | other_order | extensions
+
+        self.assertEqual(
+            orders.mapped("mb_extension_count"),
+            [3, 0, 0, 0, 0],
+            "Seule la commande d'origine devrait avoir 3 prolongations",
+        )
+        self.assertEqual(
+            orders.mapped("mb_has_rentable_lines"),
+            [True, False, False, False, False],
+            "Seule la commande livrée devrait avoir des articles prolongeables",
+        )
+
+        # Le nombre stocké suit la suppression d'une prolongation
+        extensions[0].unlink()
+        self.assertEqual(self.rental_order.mb_extension_count, 2)
+
+    def test_07_extension_chain_index(self):
+        """
+        Test de l'index de chaîne de prolongations
+        ----------------------------------------
+        Vérifie la location racine, le rang et le nom des prolongations
+        successives (origine → P1 → P2).
+        """
+        SaleOrder = self.env["sale.order"].with_context(ignore_sequence=True)
+        first = SaleOrder.create(
+            {
+                "partner_id": self.partner.id,
+                "mb_is_rental_extension": True,
+                "mb_original_rental_id": self.rental_order.id,
+            }
+        )
+        second = SaleOrder.create(
+            {
+                "partner_id": self.partner.id,
+                "mb_is_rental_extension": True,
+                "mb_original_rental_id": first.id,
+            }
+        )
+
+        self.assertFalse(self.rental_order.mb_root_rental_id)
+        self.assertEqual(first.mb_root_rental_id, self.rental_order)
+        self.assertEqual(second.mb_root_rental_id, self.rental_order)
+        self.assertEqual((first.mb_chain_sequence, second.mb_chain_sequence), (1, 2))
+        self.assertEqual(second.name, f"{self.rental_order.name}-P2")
+        self.assertEqual(self.rental_order.mb_chain_last_sequence, 2)
+        self.assertEqual(
+            second._get_rental_chain(), self.rental_order | first | second
+        )
+        # L'action de la chaîne liste les mêmes commandes depuis n'importe laquelle
+        for order in (self.rental_order, first, second):
+            chain = SaleOrder.search(order.action_view_rental_chain()["domain"])
+            self.assertEqual(chain, self.rental_order | first | second)
+        # La liste ouverte contient exactement les commandes comptées
+        for order in (self.rental_order, first, second):
+            listed = SaleOrder.search(order.action_view_extensions()["domain"])
+            self.assertEqual(listed, order.mb_rental_extensions_ids)
+            self.assertEqual(len(listed), order.mb_extension_count)
+
+    def test_08_bulk_extension(self):
+        """
+        Test de la prolongation groupée
+        -----------------------------
+        Vérifie que plusieurs locations sont prolongées en une seule action,
+        avec les quantités retournées/livrées et la confirmation.
+        """
+        other_order = self.rental_order.copy(
+            {
+                "rental_start_date": self.today,
+                "rental_return_date": self.in_three_days,
+            }
+        )
+        other_order.action_confirm()
+        for line in other_order.order_line:
+            line.qty_delivered = line.product_uom_qty
+        orders = self.rental_order | other_order
+
+        wizard = (
+            self.env["rental.bulk.extension.wizard"]
+            .with_context(active_model="sale.order", active_ids=orders.ids)
+            .create({"mb_extension_days": 2})
+        )
+        self.assertEqual(wizard.mb_order_count, 2)
+
+        result = wizard.action_create_extensions()
+        extensions = self.env["sale.order"].search(result["domain"])
+
+        self.assertEqual(len(extensions), 2)
+        self.assertEqual(extensions.mb_original_rental_id, orders)
+        for extension in extensions:
+            self.assertEqual(extension.state, "sale")
+            self.assertEqual(
+                extension.rental_return_date,
+                self.in_three_days + timedelta(days=2),
+            )
+            for line in extension.order_line:
+                self.assertEqual(line.qty_delivered, line.product_uom_qty)
+        for line in orders.order_line:
+            self.assertEqual(line.qty_returned, line.qty_delivered)
+
+        # Une prolongation ne peut pas être prolongée en groupe
+        wizard = self.env["rental.bulk.extension.wizard"].create(
+            {"mb_order_ids": [(6, 0, extensions.ids)]}
+        )
+        with self.assertRaises(UserError):
+            wizard.action_create_extensions()
+
+    def test_09_category_rental_kind(self):
+        """
+        Test de la classification vélo/accessoire des catégories
+        ------------------------------------------------------
+        Vérifie la déduction par le nom, le type explicite et son héritage
+        par les sous-catégories, la reconnaissance des mots entiers et la
+        mise à jour lors d'un déplacement dans l'arborescence.
+        """
+        Category = self.env["product.category"]
+        bikes = self.product_bike.categ_id
+        accessories = self.product_accessory.categ_id
+        electric = Category.create({"name": "Électriques", "parent_id": bikes.id})
+        other = Category.create({"name": "Divers"})
+
+        self.assertEqual(bikes._get_rental_kind(), "bike")
+        self.assertEqual(accessories._get_rental_kind(), "accessory")
+        self.assertEqual(electric._get_rental_kind(), "bike")
+        self.assertFalse(other._get_rental_kind())
+
+        # Un type explicite l'emporte et est hérité par les sous-catégories
+        child = Category.create({"name": "Sacoches", "parent_id": other.id})
+        other.mb_rental_kind = "accessory"
+        self.assertEqual(child._get_rental_kind(), "accessory")
+
+        # Seuls les mots entiers sont reconnus
+        development = Category.create({"name": "Développement"})
+        self.assertFalse(development._get_rental_kind())
+        development.name = "Vélo de développement"
+        self.assertEqual(development._get_rental_kind(), "bike")
+
+        # Un déplacement dans l'arborescence met à jour les sous-catégories
+        electric.parent_id = other
+        self.assertEqual(electric._get_rental_kind(), "accessory")
+
+    def test_10_qty_at_date_moves(self):
+        """
+        Test du calcul groupé des quantités du widget
+        --------------------------------------------
+        Vérifie que seuls les mouvements en attente de l'entrepôt, dans la
+        fenêtre [aujourd'hui - MOVES_LOOKBACK_DAYS, date de début], sont
+        associés aux lignes.
+        """
+        warehouse = self.rental_order.warehouse_id
+        wizard = self.env["rental.extension.wizard"].create(
+            {
+                "mb_order_id": self.rental_order.id,
+                "mb_start_date": self.in_three_days,
+                "mb_end_date": self.in_three_days + timedelta(days=1),
+                "mb_line_ids": self.rental_order._prepare_extension_wizard_line_vals(),
+            }
+        )
+
+        def _move(date):
+            return self.env["stock.move"].create(
+                {
+                    "name": "Mouvement de test",
+                    "product_id": self.product_bike.id,
+                    "product_uom": self.product_bike.uom_id.id,
+                    "product_uom_qty": 1.0,
+                    "location_id": warehouse.lot_stock_id.id,
+                    "location_dest_id": self.env.ref(
+                        "stock.stock_location_customers"
+                    ).id,
+                    "date": date,
+                }
+            )
+
+        pending = _move(self.tomorrow)
+        _move(self.today - timedelta(days=400))
+        _move(self.in_three_days + timedelta(days=10))
+        wizard.mb_line_ids.invalidate_recordset()
+
+        bike_line = wizard.mb_line_ids.filtered(
+            lambda l: l.product_id == self.product_bike
+        )
+        self.assertEqual(bike_line.warehouse_id, warehouse)
+        self.assertEqual(bike_line.move_ids, pending)
+        self.assertEqual(
+            bike_line.virtual_available_at_date,
+            self.product_bike.with_context(
+                warehouse=warehouse.id, to_date=self.in_three_days
+            ).virtual_available,
+        )
@@ -1,2 +1,3 @@
 from . import rental_extension_wizard
 from . import rental_extension_wizard_line
+from . import rental_bulk_extension_wizard
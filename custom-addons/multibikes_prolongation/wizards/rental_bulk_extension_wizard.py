@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Module de prolongation de location pour Multibikes - Prolongation groupée
+-----------------------------------------------------------------------
+Assistant permettant de prolonger d'un coup de nombreuses locations (par
+exemple lors d'un épisode météo), sans passer par un assistant par commande.
+"""
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from datetime import timedelta
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class RentalBulkExtensionWizard(models.TransientModel):
+    """
+    Assistant de prolongation groupée
+    --------------------------------
+    Prolonge toutes les commandes sélectionnées du même nombre de jours, à
+    partir de leur date de retour actuelle. Tous les articles livrés et pas
+    encore retournés sont prolongés.
+
+    Les commandes et leurs lignes sont préparées puis créées en un seul
+    create(), les quantités livrées/retournées sont appliquées par écritures
+    groupées et les prolongations sont confirmées ensemble.
+    """
+
+    _name = "rental.bulk.extension.wizard"
+    _description = "Assistant de prolongation groupée de locations"
+
+    mb_order_ids = fields.Many2many(
+        "sale.order",
+        string="Locations à prolonger",
+        required=True,
+        default=lambda self: self._default_order_ids(),
+    )
+    mb_extension_days = fields.Integer(
+        string="Nombre de jours de prolongation",
+        required=True,
+        default=1,
+        help="Chaque location est prolongée de ce nombre de jours à partir de sa date de retour",
+    )
+    mb_order_count = fields.Integer(
+        string="Nombre de locations", compute="_compute_mb_order_count"
+    )
+
+    @api.model
+    def _default_order_ids(self):
+        if self.env.context.get("active_model") != "sale.order":
+            return self.env["sale.order"]
+        return self.env["sale.order"].browse(self.env.context.get("active_ids", []))
+
+    @api.depends("mb_order_ids")
+    def _compute_mb_order_count(self):
+        for wizard in self:
+            wizard.mb_order_count = len(wizard.mb_order_ids)
+
+    def _check_orders(self):
+        """
+        Vérifie que toutes les commandes peuvent être prolongées
+        -------------------------------------------------------
+        Raises:
+            UserError: Liste des commandes refusées et de la raison
+        """
+        self.ensure_one()
+        if self.mb_extension_days < 1:
+            raise UserError(_("La prolongation doit être d'au moins un jour."))
+
+        errors = []
+        now = fields.Datetime.now()
+        for order in self.mb_order_ids:
+            if not order.is_rental_order:
+                errors.append(_("%s : n'est pas une location") % order.name)
+            elif order.state not in ["sale", "done"]:
+                errors.append(_("%s : n'est pas confirmée") % order.name)
+            elif order.mb_is_rental_extension:
+                errors.append(_("%s : est déjà une prolongation") % order.name)
+            elif not order.mb_has_rentable_lines:
+                errors.append(_("%s : aucun article à prolonger") % order.name)
+            elif order.rental_return_date < now:
+                errors.append(_("%s : date de retour dépassée") % order.name)
+
+        if errors:
+            raise UserError(
+                _("Certaines locations ne peuvent pas être prolongées :\n%s")
+                % "\n".join(errors)
+            )
+
+    def action_create_extensions(self):
+        """
+        Crée les prolongations de toutes les commandes sélectionnées
+        -----------------------------------------------------------
+        1. Crée un assistant de prolongation par commande (un seul create())
+        2. Prépare et crée toutes les commandes de prolongation (un seul create())
+        3. Applique les quantités par écritures groupées et confirme le tout
+
+        Returns:
+            dict: Action affichant les prolongations créées
+        """
+        self.ensure_one()
+        self._check_orders()
+        orders = self.mb_order_ids
+
+        _logger.info(
+            "Prolongation groupée de %d location(s) de %d jour(s)",
+            len(orders),
+            self.mb_extension_days,
+        )
+
+        wizards = self.env["rental.extension.wizard"].create(
+            [
+                {
+                    "mb_order_id": order.id,
+                    "mb_start_date": order.rental_return_date,
+                    "mb_end_date": order.rental_return_date
+                    + timedelta(days=self.mb_extension_days),
+                    "mb_line_ids": order._prepare_extension_wizard_line_vals(),
+                }
+                for order in orders
+            ]
+        )
+
+        extension_orders = (
+            self.env["sale.order"]
+            .with_context(ignore_sequence=True)
+            .create(
+                [
+                    wizard._prepare_extension_order_values_with_lines()
+                    for wizard in wizards
+                ]
+            )
+        )
+
+        wizards._apply_extension_quantities(extension_orders)
+
+        _logger.info(
+            "Prolongations créées: %s", ", ".join(extension_orders.mapped("name"))
+        )
+
+        return {
+            "name": _("Prolongations créées"),
+            "type": "ir.actions.act_window",
+            "res_model": "sale.order",
+            "view_mode": "list,form",
+            "domain": [("id", "in", extension_orders.ids)],
+            "context": {"create": False},
+        }
@@ -10,6 +10,7 @@ les articles à prolonger et de définir la nouvelle période de location.
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError, ValidationError
 from datetime import datetime, timedelta
+from collections import defaultdict
 import logging
 import pytz
 
@@ -128,6 +129,39 @@ class RentalExtensionWizard(models.TransientModel):
             % (original_order.name, total_duration_days),
         }
 
+    def _prepare_extension_order_values_with_lines(self):
+        """
+        Prépare les valeurs de la commande de prolongation avec ses lignes
+        -----------------------------------------------------------------
+        Returns:
+            dict: Valeurs pour create(), lignes sélectionnées incluses
+
+        Raises:
+            UserError: Si aucun article n'est sélectionné
+        """
+        self.ensure_one()
+        extension_order_vals = self._prepare_extension_order_values()
+        extension_order_lines_vals = []
+
+        for wizard_line in self.mb_line_ids.filtered(lambda l: l.mb_selected):
+            # Ne pas passer None comme extension_order, car on n'a pas encore créé la commande
+            # Stocker les valeurs sans order_id pour l'instant
+            line_vals = self._prepare_extension_line_values(
+                self.env["sale.order"], wizard_line
+            )
+            extension_order_lines_vals.append((0, 0, line_vals))
+
+        if not extension_order_lines_vals:
+            _logger.warning("Tentative de prolongation sans sélection d'articles")
+            raise UserError(
+                _(
+                    "Aucun article n'a été sélectionné pour la prolongation. Veuillez sélectionner au moins un article."
+                )
+            )
+
+        extension_order_vals["order_line"] = extension_order_lines_vals
+        return extension_order_vals
+
     def _prepare_extension_line_values(self, extension_order, wizard_line):
 
         original_line = wizard_line.mb_order_line_id
@@ -215,22 +249,12 @@ class RentalExtensionWizard(models.TransientModel):
         # Par défaut, on utilise le prix de la ligne originale
         default_price = original_line.price_unit
 
-        # Logique de tarification basée sur la catégorie de produit
-        # Approche plus sécurisée avec identification par ID ou propriétés plutôt que par nom
+        # Logique de tarification basée sur le type de location de la catégorie
+        # (classification mise en cache, héritée des catégories parentes)
         try:
-            # Vérifier si la catégorie est une catégorie de vélos (à adapter selon votre structure)
-            is_bike_category = (
-                category.id
-                in self.env["product.category"].search([("name", "ilike", "vélo")]).ids
-            )
-
-            # Vérifier si la catégorie est une catégorie d'accessoires
-            is_accessory_category = (
-                category.id
-                in self.env["product.category"]
-                .search([("name", "ilike", "accessoire")])
-                .ids
-            )
+            rental_kind = category._get_rental_kind() if category else False
+            is_bike_category = rental_kind == "bike"
+            is_accessory_category = rental_kind == "accessory"
 
             # Appliquer la logique de tarification
             if is_bike_category:
@@ -290,50 +314,66 @@ class RentalExtensionWizard(models.TransientModel):
             extension_order.name,
         )
 
-        # Pour chaque ligne du wizard qui a été sélectionnée
-        for wizard_line in self.mb_line_ids.filtered(lambda l: l.mb_selected):
-            # 1. Marquer comme retourné dans la commande originale
-            original_line = wizard_line.mb_order_line_id
-            if original_line:
-                # Mettre à jour qty_returned pour marquer uniquement la quantité prolongée comme retournée
-                # Attention: ne pas dépasser la quantité totale
-                prolonged_qty = min(
-                    wizard_line.mb_quantity, original_line.product_uom_qty
-                )
+        self._apply_extension_quantities(extension_order)
 
-                # Si la ligne a déjà des retours partiels, on ajoute à la quantité déjà retournée
-                new_returned_qty = min(
-                    original_line.qty_returned + prolonged_qty,
-                    original_line.product_uom_qty,
-                )
+    def _apply_extension_quantities(self, extension_orders):
+        """
+        Applique les quantités retournées/livrées et confirme les prolongations
+        ---------------------------------------------------------------------
+        Version groupée de la logique de prolongation pour un ou plusieurs
+        assistants (self) et leurs commandes de prolongation (même ordre) :
+        1. Les articles sélectionnés des commandes originales sont marqués
+           comme retournés, avec une écriture par valeur de quantité
+        2. Les articles des prolongations sont marqués comme livrés, de même
+        3. Les prolongations sont confirmées ensemble
 
-                _logger.info(
-                    "Mise à jour quantité retournée: produit=%s, ligne=%s, ancienne valeur=%s, nouvelle valeur=%s",
-                    original_line.product_id.name,
-                    original_line.id,
-                    original_line.qty_returned,
-                    new_returned_qty,
-                )
+        Args:
+            extension_orders: Les commandes de prolongation, une par assistant
+        """
+        SaleOrderLine = self.env["sale.order.line"]
 
-                original_line.qty_returned = new_returned_qty
+        # 1. Quantités retournées des lignes originales
+        returned_qty_by_line = {}
+        for wizard_line in self.mb_line_ids.filtered(lambda l: l.mb_selected):
+            original_line = wizard_line.mb_order_line_id
+            if not original_line:
+                continue
+            # Attention: ne pas dépasser la quantité totale
+            prolonged_qty = min(wizard_line.mb_quantity, original_line.product_uom_qty)
+            # Si la ligne a déjà des retours partiels, on ajoute à la quantité déjà retournée
+            current_qty = returned_qty_by_line.get(
+                original_line, original_line.qty_returned
+            )
+            returned_qty_by_line[original_line] = min(
+                current_qty + prolonged_qty, original_line.product_uom_qty
+            )
 
-        # 2. Marquer comme livré dans la nouvelle commande de prolongation
-        for extension_line in extension_order.order_line:
-            # Marquer tous les articles de la prolongation comme livrés
+        lines_by_returned_qty = defaultdict(lambda: SaleOrderLine)
+        for original_line, returned_qty in returned_qty_by_line.items():
+            lines_by_returned_qty[returned_qty] |= original_line
+        for returned_qty, lines in lines_by_returned_qty.items():
             _logger.info(
-                "Mise à jour quantité livrée: produit=%s, ligne=%s, valeur=%s",
-                extension_line.product_id.name,
-                extension_line.id,
-                extension_line.product_uom_qty,
+                "Mise à jour quantité retournée=%s pour %d ligne(s)",
+                returned_qty,
+                len(lines),
             )
-            extension_line.qty_delivered = extension_line.product_uom_qty
-
-        # 3. Confirmer la commande de prolongation si elle n'est pas déjà confirmée
-        if extension_order.state in ["draft", "sent"]:
+            lines.write({"qty_returned": returned_qty})
+
+        # 2. Marquer comme livrés tous les articles des prolongations
+        lines_by_delivered_qty = defaultdict(lambda: SaleOrderLine)
+        for extension_line in extension_orders.order_line:
+            lines_by_delivered_qty[extension_line.product_uom_qty] |= extension_line
+        for delivered_qty, lines in lines_by_delivered_qty.items():
+            lines.write({"qty_delivered": delivered_qty})
+
+        # 3. Confirmer les prolongations qui ne le sont pas encore
+        to_confirm = extension_orders.filtered(lambda o: o.state in ["draft", "sent"])
+        if to_confirm:
             _logger.info(
-                "Confirmation de la commande de prolongation %s", extension_order.name
+                "Confirmation des commandes de prolongation %s",
+                ", ".join(to_confirm.mapped("name")),
             )
-            extension_order.action_confirm()
+            to_confirm.action_confirm()
 
     def create_extension_order(self):
         """
@@ -388,57 +428,18 @@ class RentalExtensionWizard(models.TransientModel):
         # par le mécanisme de quantités livrées/retournées
         # self._check_extension_overlaps()
 
-        # Préparer les valeurs pour la nouvelle commande
-        extension_order_vals = self._prepare_extension_order_values()
-        extension_order_lines_vals = []
-
-        for wizard_line in self.mb_line_ids.filtered(lambda l: l.mb_selected):
-            # Ne pas passer None comme extension_order, car on n'a pas encore créé la commande
-            # Stocker les valeurs sans order_id pour l'instant
-            line_vals = self._prepare_extension_line_values(
-                self.env["sale.order"], wizard_line
-            )
-            extension_order_lines_vals.append((0, 0, line_vals))
-
-        if not extension_order_lines_vals:
-            _logger.warning("Tentative de prolongation sans sélection d'articles")
-            raise UserError(
-                _(
-                    "Aucun article n'a été sélectionné pour la prolongation. Veuillez sélectionner au moins un article."
-                )
-            )
-
-        extension_order_vals["order_line"] = extension_order_lines_vals
-
-        # Créer la nouvelle commande de prolongation dans une transaction
-        # pour éviter les problèmes de numérotation
-        original_order = self.mb_order_id
-        extension_number = (
-            self.env["sale.order"].search_count(
-                [("mb_original_rental_id", "=", original_order.id)]
-            )
-            + 1
-        )
+        # Préparer les valeurs pour la nouvelle commande et ses lignes
+        extension_order_vals = self._prepare_extension_order_values_with_lines()
 
-        # Créer la nouvelle commande de prolongation
+        # Créer la nouvelle commande de prolongation : son nom
+        # (<racine>-P<rang>) est attribué à la création à partir du compteur
+        # de la location racine, sans recherche
         _logger.info("Création de la commande de prolongation")
-        with self.env.cr.savepoint():
-            # Utilisez la méthode suivante pour éviter les sauts dans la séquence
-            extension_order = (
-                self.env["sale.order"]
-                .with_context(ignore_sequence=True)
-                .create(extension_order_vals)
-            )
-
-            # Ensuite, définissez le nom manuellement
-            original_order = self.mb_order_id
-            extension_number = self.env["sale.order"].search_count(
-                [
-                    ("mb_original_rental_id", "=", original_order.id),
-                    ("id", "!=", original_order.id),  # Ne pas compter le SO original
-                ]
-            )
-            extension_order.name = f"{original_order.name}-P{extension_number}"
+        extension_order = (
+            self.env["sale.order"]
+            .with_context(ignore_sequence=True)
+            .create(extension_order_vals)
+        )
 
         _logger.info("Commande de prolongation créée: %s", extension_order.name)
 
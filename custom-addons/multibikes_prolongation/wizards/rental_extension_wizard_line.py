@@ -10,11 +10,15 @@ les articles à prolonger et de définir la nouvelle période de location.
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError, ValidationError
 from odoo.tools.float_utils import float_compare
+from collections import defaultdict
 from datetime import datetime, timedelta
 import logging
 
 _logger = logging.getLogger(__name__)
 
+# Ancienneté maximale des mouvements en retard affichés dans le widget
+MOVES_LOOKBACK_DAYS = 90
+
 
 class RentalExtensionWizardLine(models.TransientModel):
     """
@@ -173,7 +177,13 @@ class RentalExtensionWizardLine(models.TransientModel):
         Cette méthode fournit les informations de stock nécessaires pour le widget
         qty_at_date_widget, permettant d'afficher les disponibilités prévisionnelles
         des produits à la date de début de la prolongation.
+
+        Les lignes sont regroupées par (entrepôt, date) : les quantités de tous
+        les produits d'un groupe sont lues en une fois, et les mouvements sont
+        cherchés une seule fois par groupe, limités à l'entrepôt et à la fenêtre
+        [aujourd'hui - MOVES_LOOKBACK_DAYS, date prévue].
         """
+        grouped_lines = defaultdict(lambda: self.env["rental.extension.wizard.line"])
         for line in self:
             if not line.product_id or not line.mb_wizard_id.mb_start_date:
                 # Valeurs par défaut si pas de produit ou date
@@ -187,42 +197,88 @@ class RentalExtensionWizardLine(models.TransientModel):
                 line.qty_to_deliver = 0
                 line.is_mto = False
                 continue
-
-            # Utiliser la logique de calcul de stock similaire à celle de sale.order.line
-            scheduled_date = line.mb_wizard_id.mb_start_date
             warehouse = line.mb_order_line_id.order_id.warehouse_id
+            grouped_lines[(warehouse, line.mb_wizard_id.mb_start_date)] |= line
 
-            # Obtenir le stock disponible à la date planifiée
-            qty_available = line.product_id.with_context(
-                warehouse=warehouse.id, to_date=scheduled_date
-            ).virtual_available
-
-            # Obtenir les quantités actuelles
-            product = line.product_id.with_context(warehouse=warehouse.id)
-
-            line.warehouse_id = warehouse
-            line.scheduled_date = scheduled_date
-            line.forecast_expected_date = scheduled_date
-            line.virtual_available_at_date = qty_available
-            line.qty_available_today = product.qty_available
-            line.free_qty_today = product.free_qty
-            line.qty_to_deliver = line.product_uom_qty
-            line.is_mto = (
-                line.product_id.type == "product"
-                and float_compare(
-                    line.product_id.nbr_reordering_rules,
-                    0,
-                    precision_rounding=line.product_id.uom_id.rounding,
-                )
-                > 0
+        today_qties = {}
+        for (warehouse, scheduled_date), lines in grouped_lines.items():
+            products = lines.product_id
+
+            # Stock prévu à la date planifiée, pour tous les produits du groupe
+            virtual_qties = {
+                product["id"]: product["virtual_available"]
+                for product in products.with_context(
+                    warehouse=warehouse.id, to_date=scheduled_date
+                ).read(["virtual_available"])
+            }
+
+            # Quantités actuelles, partagées entre les groupes d'un même entrepôt
+            missing = products.filtered(
+                lambda p, wh=warehouse: (wh.id, p.id) not in today_qties
             )
+            if missing:
+                for product in missing.with_context(warehouse=warehouse.id).read(
+                    ["qty_available", "free_qty"]
+                ):
+                    today_qties[(warehouse.id, product["id"])] = (
+                        product["qty_available"],
+                        product["free_qty"],
+                    )
 
-            # Trouver les mouvements de stock associés
-            moves = self.env["stock.move"].search(
-                [
-                    ("product_id", "=", line.product_id.id),
-                    ("state", "not in", ["done", "cancel"]),
-                    ("date", "<=", scheduled_date),
-                ]
+            moves_by_product = self._get_pending_moves_by_product(
+                products, warehouse, scheduled_date
             )
-            line.move_ids = moves
+
+            for line in lines:
+                product = line.product_id
+                qty_available, free_qty = today_qties[(warehouse.id, product.id)]
+                line.warehouse_id = warehouse
+                line.scheduled_date = scheduled_date
+                line.forecast_expected_date = scheduled_date
+                line.virtual_available_at_date = virtual_qties[product.id]
+                line.qty_available_today = qty_available
+                line.free_qty_today = free_qty
+                line.qty_to_deliver = line.product_uom_qty
+                line.is_mto = (
+                    product.type == "product"
+                    and float_compare(
+                        product.nbr_reordering_rules,
+                        0,
+                        precision_rounding=product.uom_id.rounding,
+                    )
+                    > 0
+                )
+                line.move_ids = moves_by_product.get(product.id, self.env["stock.move"])
+
+    @api.model
+    def _get_pending_moves_by_product(self, products, warehouse, scheduled_date):
+        """
+        Mouvements de stock en attente des produits, regroupés par produit
+        -----------------------------------------------------------------
+        Une seule recherche pour tous les produits, limitée aux mouvements
+        entrant ou sortant de l'entrepôt et prévus entre aujourd'hui moins
+        MOVES_LOOKBACK_DAYS jours et la date planifiée.
+
+        Returns:
+            dict: {product_id: stock.move}
+        """
+        domain = [
+            ("product_id", "in", products.ids),
+            ("state", "not in", ["done", "cancel"]),
+            (
+                "date",
+                ">=",
+                fields.Datetime.now() - timedelta(days=MOVES_LOOKBACK_DAYS),
+            ),
+            ("date", "<=", scheduled_date),
+        ]
+        if warehouse:
+            domain += [
+                "|",
+                ("location_id.warehouse_id", "=", warehouse.id),
+                ("location_dest_id.warehouse_id", "=", warehouse.id),
+            ]
+        moves_by_product = defaultdict(lambda: self.env["stock.move"])
+        for move in self.env["stock.move"].search(domain):
+            moves_by_product[move.product_id.id] |= move
+        return moves_by_product
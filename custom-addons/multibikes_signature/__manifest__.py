@@ -11,6 +11,8 @@
     "depends": ["base", "sale", "sale_renting", "sale_management", "web", "sign", "multibikes_base"],
     # Fichiers de données (vues, menus, actions, etc.)
     "data": [
+        "security/ir.model.access.csv",
+        "data/ir_cron.xml",
         "views/sale_order_views.xml",
     ],
     # Configuration d'installation
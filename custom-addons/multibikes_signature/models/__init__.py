@@ -1,2 +1,8 @@
 from . import sale_order
-from . import sign_request
\ No newline at end of file
+from . import sign_request
+from . import sign_job_mixin
+from . import sign_pdf_job
+from . import sign_confirm_job
+from . import ir_attachment
+from . import sign_template
+from . import ir_actions_report
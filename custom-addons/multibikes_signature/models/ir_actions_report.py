@@ -0,0 +1,58 @@
+from odoo import models
+import io
+import logging
+
+from .sale_order import CONTRACT_REPORT
+
+_logger = logging.getLogger(__name__)
+
+
+class IrActionsReport(models.Model):
+    _inherit = 'ir.actions.report'
+
+    def _render_qweb_pdf_prepare_streams(self, report_ref, data, res_ids=None):
+        """Contrat de location : renvoyer le contrat figé des commandes signées
+
+        Les commandes signées (mb_signed_contract_id) ne sont pas rendues ;
+        les autres passent par le rendu habituel.
+        """
+        report = self._get_report(report_ref)
+        # _render_qweb_pdf ajoute toujours report_type : seules d'autres
+        # données propres à l'impression imposent le rendu
+        if (
+            report.report_name != CONTRACT_REPORT
+            or not res_ids
+            or set(data or {}) - {'report_type'}
+        ):
+            return super()._render_qweb_pdf_prepare_streams(report_ref, data, res_ids=res_ids)
+
+        orders = self.env['sale.order'].browse(res_ids)
+        signed = {
+            order.id: order.sudo().mb_signed_contract_id
+            for order in orders
+            if order.sudo().mb_signed_contract_id
+        }
+        to_render = [res_id for res_id in res_ids if res_id not in signed]
+        rendered = {}
+        if to_render:
+            rendered = super()._render_qweb_pdf_prepare_streams(report_ref, data, res_ids=to_render)
+            if rendered.get(False):
+                # PDF non découpable par commande : les contrats signés restent
+                # servis tels quels, suivis du rendu des autres commandes
+                streams = {
+                    res_id: {'stream': io.BytesIO(signed[res_id].raw), 'attachment': None}
+                    for res_id in res_ids
+                    if res_id in signed
+                }
+                streams[False] = rendered[False]
+                return streams
+        if signed:
+            _logger.info(f"🔒 {len(signed)} contrat(s) signé(s) servi(s) sans rendu")
+
+        streams = {}
+        for res_id in res_ids:
+            if res_id in signed:
+                streams[res_id] = {'stream': io.BytesIO(signed[res_id].raw), 'attachment': None}
+            else:
+                streams[res_id] = rendered[res_id]
+        return streams
@@ -0,0 +1,56 @@
+from odoo import models, fields
+import logging
+
+from ..tools import pdf_pages
+
+_logger = logging.getLogger(__name__)
+
+
+class IrAttachment(models.Model):
+    _inherit = 'ir.attachment'
+
+    mb_pdf_page_count = fields.Integer(
+        string='Nombre de pages (PDF)',
+        readonly=True,
+        help="Nombre de pages mis en cache, valable pour le contenu dont "
+             "l'empreinte est mb_pdf_page_count_checksum",
+    )
+    mb_pdf_page_count_checksum = fields.Char(
+        string='Empreinte du nombre de pages',
+        readonly=True,
+    )
+
+    def _mb_get_pdf_page_count(self):
+        """Nombre de pages du PDF, mis en cache par empreinte du contenu
+
+        Le fichier est lu directement dans le filestore (pas d'aller-retour
+        base64) ; un contenu identique déjà compté sur une autre pièce jointe
+        est réutilisé.
+
+        Returns:
+            int: Nombre de pages, 0 si inconnu
+        """
+        self.ensure_one()
+        attachment = self.sudo()
+        checksum = attachment.checksum
+        if checksum and attachment.mb_pdf_page_count_checksum == checksum:
+            return attachment.mb_pdf_page_count
+
+        known = checksum and attachment.search([
+            ('checksum', '=', checksum),
+            ('mb_pdf_page_count_checksum', '=', checksum),
+        ], limit=1)
+        if known:
+            page_count = known.mb_pdf_page_count
+        elif attachment.store_fname:
+            page_count = pdf_pages.count_pages_file(attachment._full_path(attachment.store_fname))
+        else:
+            page_count = pdf_pages.count_pages(attachment.raw or b'')
+
+        page_count = page_count or 0
+        if checksum:
+            attachment.write({
+                'mb_pdf_page_count': page_count,
+                'mb_pdf_page_count_checksum': checksum,
+            })
+        return page_count
@@ -1,10 +1,35 @@
-from odoo import models, fields, api, Command
+from odoo import models, fields, api, tools
 from odoo.exceptions import UserError
-import base64
 import logging
 
+from ..tools import pdf_pages
+
 _logger = logging.getLogger(__name__)
 
+CONTRACT_REPORT = 'multibikes_base.report_rental_contract'
+
+# Zones de signature de chaque rapport, placées sur la dernière page
+SIGNATURE_ITEM_LAYOUTS = {
+    CONTRACT_REPORT: (
+        # 1. Case à cocher d'acceptation des conditions, à gauche
+        ('sign.sign_item_type_checkbox', {
+            'posX': 0.06,
+            'posY': 0.475,
+            'width': 0.019,
+            'height': 0.019,
+            'name': 'accept_conditions',
+        }),
+        # 2. Signature du client, à droite en dessous de la case
+        ('sign.sign_item_type_signature', {
+            'posX': 0.66,
+            'posY': 0.75,
+            'width': 0.2,
+            'height': 0.05,
+            'name': 'customer_signature',
+        }),
+    ),
+}
+
 class SaleOrder(models.Model):
     _inherit = 'sale.order'
 
@@ -29,75 +54,122 @@ class SaleOrder(models.Model):
         ('cancelled', 'Annulée')
     ], string='Statut signature', compute='_compute_signature_status', store=True)
 
-    @api.depends('sign_request_ids', 'sign_request_ids.state')
-    def _compute_sign_request(self):
-        """Calculer les demandes de signature liées via reference_doc"""
-        ref_values = [f"sale.order,{rec.id}" for rec in self]
-
-        if not ref_values:
-            self.update({
-                'sign_request_ids': False,
-                'sign_request_count': 0
-            })
-            return
-
-        sign_data = self.env["sign.request"]._read_group(
-            domain=[('reference_doc', 'in', ref_values)],
-            groupby=['reference_doc'],
-            aggregates=['id:recordset'],
-        )
+    # Contrat figé à la signature, renvoyé tel quel par le rapport de contrat
+    mb_signed_contract_id = fields.Many2one(
+        'ir.attachment',
+        string='Contrat signé',
+        readonly=True,
+        copy=False,
+    )
 
-        # Initialiser tous les enregistrements
+    def write(self, vals):
+        """Le contrat signé est immuable une fois enregistré"""
+        if 'mb_signed_contract_id' in vals and not self.env.context.get('mb_reset_signed_contract'):
+            if any(order.mb_signed_contract_id for order in self):
+                raise UserError("Le contrat signé d'une commande ne peut pas être remplacé.")
+        return super().write(vals)
+
+    def _store_signed_contract(self, source_attachment):
+        """Fige le contrat signé de la commande
+
+        Copie le PDF envoyé en signature dans une pièce jointe de la commande
+        (même fichier dans le filestore, dédupliqué par empreinte). Sans effet
+        si un contrat est déjà enregistré.
+        """
+        self.ensure_one()
+        if self.mb_signed_contract_id or not source_attachment:
+            return self.mb_signed_contract_id
+        attachment = self.env['ir.attachment'].sudo().create({
+            'name': f'Contrat_signé_{self.name}.pdf',
+            'type': 'binary',
+            'raw': source_attachment.sudo().raw,
+            'res_model': 'sale.order',
+            'res_id': self.id,
+            'mimetype': 'application/pdf',
+        })
+        self.sudo().mb_signed_contract_id = attachment
+        _logger.info(f"🔒 Contrat signé enregistré pour {self.name}: {attachment.id}")
+        return attachment
+
+    @api.depends('sign_request_ids')
+    def _compute_sign_request(self):
+        """Compter les demandes de signature liées, en une requête groupée
+
+        sign_request_ids est l'inverse de sign.request.sale_order_id (stocké
+        et indexé) : un seul _read_group sur ce champ suffit, sans analyser
+        reference_doc ni vérifier l'existence de chaque commande.
+        """
+        counts = dict(self.env["sign.request"]._read_group(
+            domain=[('sale_order_id', 'in', self.ids)],
+            groupby=['sale_order_id'],
+            aggregates=['__count'],
+        ))
         for order in self:
-            order.sign_request_ids = False
-            order.sign_request_count = 0
-
-        # Grouper les demandes par commande
-        for reference_doc, sign_requests in sign_data:
-            if sign_requests and reference_doc:
-                # Extraire l'ID de la commande depuis la référence
-                try:
-                    model, res_id = reference_doc.split(',')
-                    if model == 'sale.order':
-                        order = self.browse(int(res_id))
-                        if order.exists():
-                            order.sign_request_ids = [Command.set(sign_requests.ids)]
-                            order.sign_request_count = len(sign_requests)
-                except (ValueError, AttributeError):
-                    _logger.warning(f"Référence invalide: {reference_doc}")
-                    continue
+            order.sign_request_count = counts.get(order._origin, 0)
 
     @api.depends('sign_request_ids.state', 'sign_request_ids.request_item_ids.state')
     def _compute_signature_status(self):
-        """Calculer le statut de signature basé sur les demandes"""
+        """Calculer le statut de signature basé sur les demandes
+
+        Un seul agrégat SQL par lot de commandes, groupé par commande, avec
+        l'ordre de priorité suivant :
+
+        - aucune demande : 'none'
+        - uniquement des demandes annulées : 'cancelled'
+        - une demande active 'completed' : 'completed'
+        - un signataire d'une demande active 'signed' ou 'completed' : 'signed'
+        - une demande active 'sent' : 'sent'
+        - sinon : 'none'
+        """
+        flags = self._get_signature_status_flags()
         for order in self:
-            if not order.sign_request_ids:
-                order.signature_status = 'none'
-                continue
-
-            # Récupérer toutes les demandes actives (non supprimées)
-            active_requests = order.sign_request_ids.filtered(lambda r: r.state != 'canceled')
-
-            if not active_requests:
-                order.signature_status = 'cancelled'
-                continue
-
-            # Analyser les états des demandes
-            states = active_requests.mapped('state')
-
-            # Vérifier l'état des items de signature
-            all_request_items = active_requests.mapped('request_item_ids')
-            item_states = all_request_items.mapped('state')
-
-            # Logique de détermination du statut
-            if 'completed' in states:
-                order.signature_status = 'completed'
-            elif 'signed' in item_states or any(item.state == 'completed' for item in all_request_items):
-                order.signature_status = 'signed'
-            elif 'sent' in states:
-                order.signature_status = 'sent'
-            else:
-                order.signature_status = 'none'
+            order.signature_status = self._signature_status_from_flags(
+                flags.get(order._origin.id)
+            )
+
+    def _get_signature_status_flags(self):
+        """Indicateurs agrégés des demandes de signature, par commande
+
+        Returns:
+            dict: {order_id: (has_active, has_completed, has_signed_item, has_sent)}
+        """
+        order_ids = [order_id for order_id in self._origin.ids if order_id]
+        if not order_ids:
+            return {}
+        self.env['sign.request'].flush_model(['sale_order_id', 'state'])
+        self.env['sign.request.item'].flush_model(['sign_request_id', 'state'])
+        self.env.cr.execute("""
+            SELECT sr.sale_order_id,
+                   bool_or(sr.state != 'canceled'),
+                   bool_or(sr.state = 'completed'),
+                   bool_or(sr.state != 'canceled' AND EXISTS (
+                       SELECT 1
+                         FROM sign_request_item sri
+                        WHERE sri.sign_request_id = sr.id
+                          AND sri.state IN ('signed', 'completed')
+                   )),
+                   bool_or(sr.state = 'sent')
+              FROM sign_request sr
+             WHERE sr.sale_order_id = ANY(%s)
+          GROUP BY sr.sale_order_id
+        """, [order_ids])
+        return {row[0]: row[1:] for row in self.env.cr.fetchall()}
+
+    @api.model
+    def _signature_status_from_flags(self, flags):
+        """Statut de signature à partir des indicateurs agrégés d'une commande"""
+        if not flags:
+            return 'none'
+        has_active, has_completed, has_signed_item, has_sent = flags
+        if not has_active:
+            return 'cancelled'
+        if has_completed:
+            return 'completed'
+        if has_signed_item:
+            return 'signed'
+        if has_sent:
+            return 'sent'
+        return 'none'
 
     def _get_signature_status_info(self):
         """Méthode utilitaire pour obtenir des informations détaillées sur le statut"""
@@ -168,8 +240,7 @@ class SaleOrder(models.Model):
         action = self.env["ir.actions.actions"]._for_xml_id("sign.sign_request_action")
 
         if self.sign_request_count > 1:
-            ref_values = [f"sale.order,{self.id}"]
-            action["domain"] = [('reference_doc', 'in', ref_values)]
+            action["domain"] = [('sale_order_id', '=', self.id)]
             action["context"] = {'default_reference_doc': f"sale.order,{self.id}"}
         elif self.sign_request_count == 1:
             action["views"] = [(False, "form")]
@@ -218,20 +289,36 @@ class SaleOrder(models.Model):
                 _logger.info(f"Demande existante trouvée: {existing_request.ids}")
                 # Renvoyer la demande existante plutôt que d'en créer une nouvelle
                 existing_request.action_send()
-            else:
-                # Créer template et demande
-                sign_template = self._create_sign_template()
-                sign_request = self._create_sign_request(sign_template)
-                sign_request.reference_doc = f"sale.order,{self.id}"
+                return {
+                    'type': 'ir.actions.client',
+                    'tag': 'display_notification',
+                    'params': {
+                        'title': 'Email envoyé!',
+                        'message': f'La demande de signature a été envoyée à {self.partner_id.email}',
+                        'type': 'success',
+                    }
+                }
 
-            # Le statut sera automatiquement mis à jour par _compute_signature_status
+            # Le contrat est généré en arrière-plan (mb.sign.pdf.job) : la
+            # demande est créée et l'utilisateur notifié une fois le PDF prêt
+            if not self.env['mb.sign.pdf.job']._enqueue(self):
+                return {
+                    'type': 'ir.actions.client',
+                    'tag': 'display_notification',
+                    'params': {
+                        'title': 'Génération en cours',
+                        'message': 'Le contrat de ce devis est déjà en cours de génération.',
+                        'type': 'info',
+                    }
+                }
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
                 'params': {
-                    'title': 'Email envoyé!',
-                    'message': f'La demande de signature a été envoyée à {self.partner_id.email}',
-                    'type': 'success',
+                    'title': 'Génération en cours',
+                    'message': 'Le contrat est en cours de génération, vous serez notifié '
+                               f'dès l\'envoi de la demande à {self.partner_id.email}.',
+                    'type': 'info',
                 }
             }
 
@@ -247,92 +334,200 @@ class SaleOrder(models.Model):
                     'sticky': True,
                 }
             }
+
+    def action_send_signature_bulk(self):
+        """Envoi en signature groupé depuis la liste des devis
+
+        Les commandes éligibles (client avec email, aucune demande de
+        signature non annulée) sont mises en file d'attente en une fois ; le
+        cron rend leurs contrats par lots.
+        """
+        eligible = self.filtered(
+            lambda o: o.partner_id.email
+            and not o.sign_request_ids.filtered(lambda r: r.state != 'canceled')
+        )
+        jobs = self.env['mb.sign.pdf.job']._enqueue(eligible)
+        skipped = len(self) - len(jobs)
+        _logger.info(f"📨 Envoi groupé en signature: {len(jobs)} en file, {skipped} ignoré(s)")
+
+        message = f'{len(jobs)} contrat(s) en cours de génération, vous serez notifié à leur envoi.'
+        if skipped:
+            message += f' {skipped} commande(s) ignorée(s) : sans email client, déjà en ' \
+                       'signature ou déjà en file d\'attente.'
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': 'Envoi en signature',
+                'message': message,
+                'type': 'info' if jobs else 'warning',
+                'sticky': bool(skipped),
+            }
+        }
+
+    def _create_signature_request(self):
+        """Génère le contrat, crée le modèle et la demande de signature
+
+        Appelé par mb.sign.pdf.job, hors de la requête HTTP de l'utilisateur.
+        """
+        self.ensure_one()
+        return self._create_signature_requests()[self]
+
+    def _create_signature_requests(self):
+        """Version groupée de _create_signature_request
+
+        Un seul rendu wkhtmltopdf pour toutes les commandes, puis des create()
+        groupés pour les pièces jointes, modèles, zones et demandes.
+
+        Returns:
+            dict: {sale.order: sign.request}
+        """
+        templates = self._create_sign_templates(self._render_contract_pdfs())
+        return self._create_sign_requests(templates)
+
+    def _render_contract_pdfs(self):
+        """Rend les contrats de toutes les commandes en un seul appel wkhtmltopdf
+
+        Odoo découpe le PDF obtenu par commande ; si le découpage échoue, les
+        commandes concernées sont rendues une par une.
+
+        Returns:
+            dict: {sale.order: bytes}
+        """
+        _logger.info(f"=== GÉNÉRATION PDF DEPUIS QWEB ({len(self)} commande(s)) ===")
+        streams = self.env['ir.actions.report']._render_qweb_pdf_prepare_streams(
+            CONTRACT_REPORT, {}, res_ids=self.ids
+        )
+        pdfs = {}
+        for order in self:
+            stream = (streams.get(order.id) or {}).get('stream')
+            if stream:
+                pdfs[order] = stream.getvalue()
+            else:
+                pdfs[order], _ = self.env['ir.actions.report']._render_qweb_pdf(
+                    CONTRACT_REPORT, order.ids
+                )
+        for values in streams.values():
+            if values.get('stream'):
+                values['stream'].close()
+        return pdfs
+
     def _create_sign_template(self):
-        """Votre logique existante - génération auto template depuis QWeb"""
-        try:
-            _logger.info("=== GÉNÉRATION PDF DEPUIS QWEB ===")
+        """Génération auto template depuis QWeb, réutilisé si le PDF est identique"""
+        self.ensure_one()
+        return self._create_sign_templates(self._render_contract_pdfs())[self]
 
-            # Générer le PDF depuis le rapport QWeb
-            pdf_content, _ = self.env['ir.actions.report']._render_qweb_pdf(
-                'multibikes_base.report_rental_contract', self.ids
-            )
-            _logger.info(f"PDF généré: {len(pdf_content)} bytes")
-
-            # Créer l'attachment
-            attachment = self.env['ir.attachment'].create({
-                'name': f'Devis_{self.name}.pdf',
-                'type': 'binary',
-                'datas': base64.b64encode(pdf_content),
-                'res_model': 'sale.order',
-                'res_id': self.id,
-                'mimetype': 'application/pdf',
-            })
-            _logger.info(f"Attachment créé: {attachment.id}")
-
-            # Créer le template Sign
-            template = self.env['sign.template'].create({
-                'attachment_id': attachment.id,
-                'name': f'Template_Devis_{self.name}',
-            })
-            _logger.info(f"Template créé: {template.id}")
-
-            # Ajouter zone de signature
-            self._add_signature_field(template)
-
-            return template
+    def _create_sign_templates(self, pdfs):
+        """Modèles de signature des PDF rendus, réutilisés si le contenu est identique
+
+        Les modèles sont adressés par contenu (sign.template.mb_content_key) :
+        un contrat dont le rendu n'a pas changé réutilise la pièce jointe et le
+        modèle existants au lieu d'en créer de nouveaux.
+
+        Args:
+            pdfs (dict): {sale.order: bytes}
+
+        Returns:
+            dict: {sale.order: sign.template}
+        """
+        try:
+            keys = {order: pdf_pages.content_key(pdf) for order, pdf in pdfs.items()}
+            templates_by_key = {
+                template.mb_content_key: template
+                for template in self.env['sign.template'].search([
+                    ('mb_content_key', 'in', list(set(keys.values()))),
+                    ('sign_item_ids', '!=', False),
+                ])
+            }
+            if templates_by_key:
+                _logger.info(f"♻️ Template(s) réutilisé(s): {[t.id for t in templates_by_key.values()]}")
+
+            # Une seule création par contenu, pour la première commande concernée
+            new_orders = {}
+            for order, key in keys.items():
+                if key not in templates_by_key:
+                    new_orders.setdefault(key, order)
+
+            if new_orders:
+                attachments = self.env['ir.attachment'].create([{
+                    'name': f'Devis_{order.name}.pdf',
+                    'type': 'binary',
+                    'raw': pdfs[order],
+                    'res_model': 'sale.order',
+                    'res_id': order.id,
+                    'mimetype': 'application/pdf',
+                } for order in new_orders.values()])
+                _logger.info(f"Attachment(s) créé(s): {attachments.ids}")
+
+                new_templates = self.env['sign.template'].create([{
+                    'attachment_id': attachment.id,
+                    'name': f'Template_Devis_{order.name}',
+                    'mb_content_key': key,
+                } for (key, order), attachment in zip(new_orders.items(), attachments)])
+                _logger.info(f"Template(s) créé(s): {new_templates.ids}")
+
+                # Ajouter zones de signature
+                self._add_signature_fields(dict(zip(new_orders.values(), new_templates)))
+                templates_by_key.update(zip(new_orders, new_templates))
+
+            return {order: templates_by_key[key] for order, key in keys.items()}
 
         except Exception as e:
             _logger.error(f"Erreur création template: {e}")
             raise
 
-    def _add_signature_field(self, template):
-        """Ajouter zone signature + case à cocher sur la dernière page"""
-        try:
-            signature_type = self.env.ref('sign.sign_item_type_signature', raise_if_not_found=False)
-            checkbox_type = self.env.ref('sign.sign_item_type_checkbox', raise_if_not_found=False)
-            customer_role = self.env.ref('sign.sign_item_role_customer', raise_if_not_found=False)
-
-            if not signature_type or not customer_role or not checkbox_type:
-                _logger.warning("Types de signature/checkbox non trouvés")
-                return
+    @api.model
+    @tools.ormcache('report_name', 'page_count')
+    def _get_signature_item_layout(self, report_name, page_count):
+        """Valeurs des zones de signature d'un rapport, par nombre de pages
+
+        Returns:
+            tuple: Un tuple de paires (champ, valeur) par zone, sans template_id
+
+        Raises:
+            UserError: si les types de zone ou le rôle client sont introuvables ;
+            rien n'est alors mis en cache
+        """
+        item_types = {
+            xmlid: self.env.ref(xmlid, raise_if_not_found=False)
+            for xmlid, _position in SIGNATURE_ITEM_LAYOUTS[report_name]
+        }
+        customer_role = self.env.ref('sign.sign_item_role_customer', raise_if_not_found=False)
+        if not customer_role or not all(item_types.values()):
+            _logger.warning("Types de signature/checkbox non trouvés")
+            raise UserError(
+                "Les types de zone de signature ou le rôle client sont introuvables."
+            )
 
-            _logger.info(f"Types trouvés - Signature: {signature_type.id}, Checkbox: {checkbox_type.id}, Customer: {customer_role.id}")
+        return tuple(
+            tuple(sorted({
+                'type_id': item_types[xmlid].id,
+                'required': True,
+                'responsible_id': customer_role.id,
+                'page': page_count,
+                **position,
+            }.items()))
+            for xmlid, position in SIGNATURE_ITEM_LAYOUTS[report_name]
+        )
 
-            # Déterminer le nombre de pages du PDF
-            last_page = self._get_pdf_page_count(template)
+    def _add_signature_fields(self, templates):
+        """Ajouter zone signature + case à cocher sur la dernière page
 
-            _logger.info(f"Nombre de pages détecté: {last_page}")
+        Args:
+            templates (dict): {sale.order: sign.template}, zones créées en un seul create()
+        """
+        try:
+            item_values = []
+            for order, template in templates.items():
+                # Déterminer le nombre de pages du PDF
+                last_page = order._get_pdf_page_count(template)
+                _logger.info(f"Nombre de pages détecté ({order.name}): {last_page}")
 
-            # 1. Créer la case à cocher AVANT la signature
-            checkbox_item = self.env['sign.item'].create({
-                'template_id': template.id,
-                'type_id': checkbox_type.id,
-                'required': True,
-                'responsible_id': customer_role.id,
-                'page': last_page,
-                'posX': 0.06,  # Position à gauche
-                'posY': 0.475,  # Un peu plus haut que la signature
-                'width': 0.019,  # Petite case
-                'height': 0.019,
-                'name': 'accept_conditions',  # Nom unique pour la case
-            })
-
-            # 2. Créer la zone de signature
-            signature_item = self.env['sign.item'].create({
-                'template_id': template.id,
-                'type_id': signature_type.id,
-                'required': True,
-                'responsible_id': customer_role.id,
-                'page': last_page,
-                'posX': 0.66,   # Position à droite
-                'posY': 0.75,   # En dessous de la case
-                'width': 0.2,
-                'height': 0.05,
-                'name': 'customer_signature',  # Nom unique pour la signature
-            })
+                layout = self._get_signature_item_layout(CONTRACT_REPORT, last_page)
+                item_values += [dict(values, template_id=template.id) for values in layout]
 
-            _logger.info(f"Case à cocher créée: {checkbox_item.id}")
-            _logger.info(f"Zone de signature créée: {signature_item.id}")
+            items = self.env['sign.item'].create(item_values)
+            _logger.info(f"Zones de signature créées: {items.ids}")
 
         except Exception as e:
             _logger.error(f"Erreur ajout signature/checkbox: {e}")
@@ -340,35 +535,24 @@ class SaleOrder(models.Model):
 
 
     def _get_pdf_page_count(self, template):
-        """Déterminer le nombre de pages du PDF avec pdfminer"""
+        """Déterminer le nombre de pages du PDF
+
+        Lu dans l'arbre des pages du fichier (voir tools/pdf_pages.py) et mis
+        en cache sur la pièce jointe par empreinte du contenu.
+        """
         try:
             if not template.attachment_id:
                 _logger.warning("Aucun attachment trouvé sur le template")
                 return self._estimate_last_page()
 
-            # Utiliser pdfminer pour compter les pages
-            try:
-                from pdfminer.high_level import extract_pages
-                import io
-
-                # Décoder le PDF
-                pdf_data = base64.b64decode(template.attachment_id.datas)
-                pdf_file = io.BytesIO(pdf_data)
-
-                # Compter les pages avec pdfminer
-                pages = list(extract_pages(pdf_file))
-                page_count = len(pages)
-
-                _logger.info(f"Nombre de pages via pdfminer: {page_count}")
-                return page_count
-
-            except ImportError:
-                _logger.warning("pdfminer non disponible, utilisation de l'estimation")
-                return self._estimate_last_page()
-            except Exception as e:
-                _logger.error(f"Erreur pdfminer: {e}")
+            page_count = template.attachment_id._mb_get_pdf_page_count()
+            if not page_count:
+                _logger.warning("Nombre de pages illisible, utilisation de l'estimation")
                 return self._estimate_last_page()
 
+            _logger.info(f"Nombre de pages du PDF: {page_count}")
+            return page_count
+
         except Exception as e:
             _logger.error(f"Erreur détection pages PDF: {e}")
             return self._estimate_last_page()
@@ -402,30 +586,43 @@ class SaleOrder(models.Model):
             return 3  # Valeur par défaut sécurisée
 
 
-    def _create_sign_request(self, sign_template):
-        """Votre logique existante - création demande avec items"""
-        try:
-            _logger.info("=== CRÉATION DEMANDE SIGNATURE ===")
+    def _create_sign_requests(self, templates):
+        """Création groupée des demandes avec items
+
+        Les emails de signature sont mis dans la file d'envoi (mail_notify_force_send)
+        plutôt qu'envoyés pendant la création.
+
+        Args:
+            templates (dict): {sale.order: sign.template}
 
-            sign_request_data = {
-                'template_id': sign_template.id,
-                'reference': f'Signature_Devis_{self.name}',
-                'subject': f'Signature du devis {self.name}',
-                'message': f'Veuillez signer le devis {self.name}',
+        Returns:
+            dict: {sale.order: sign.request}
+        """
+        try:
+            _logger.info(f"=== CRÉATION DEMANDES SIGNATURE ({len(templates)}) ===")
+            customer_role = self.env.ref('sign.sign_item_role_customer')
+
+            orders = list(templates)
+            sign_requests = self.env['sign.request'].with_context(
+                mail_notify_force_send=False,
+            ).create([{
+                'template_id': templates[order].id,
+                'reference': f'Signature_Devis_{order.name}',
+                'reference_doc': f'sale.order,{order.id}',
+                'subject': f'Signature du devis {order.name}',
+                'message': f'Veuillez signer le devis {order.name}',
                 'request_item_ids': [(0, 0, {
-                    'role_id': self.env.ref('sign.sign_item_role_customer').id,
-                    'partner_id': self.partner_id.id,
-                    'signer_email': self.partner_id.email,
+                    'role_id': customer_role.id,
+                    'partner_id': order.partner_id.id,
+                    'signer_email': order.partner_id.email,
                 })]
-            }
+            } for order in orders])
+            _logger.info(f"Sign request(s) créé(s): {sign_requests.ids}")
 
-            sign_request = self.env['sign.request'].create(sign_request_data)
-            _logger.info(f"Sign request créé: {sign_request.id}, état: {sign_request.state}")
-
-            return sign_request
+            return dict(zip(orders, sign_requests))
 
         except Exception as e:
             _logger.error(f"Erreur création sign request: {e}")
             import traceback
             _logger.error(traceback.format_exc())
-            raise
\ No newline at end of file
+            raise
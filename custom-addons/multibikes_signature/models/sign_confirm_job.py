@@ -0,0 +1,116 @@
+from odoo import models, fields, api
+from odoo.tools import mute_logger
+from psycopg2.errors import UniqueViolation
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class SignConfirmJob(models.Model):
+    """File d'attente de confirmation des devis signés
+
+    La confirmation d'une location (transferts, réservations, contrôles de
+    disponibilité) n'est plus faite pendant la requête du signataire :
+    _handle_signed_quotation crée un job, traité par le cron
+    cron_process_sign_confirm_jobs (déclenché immédiatement).
+
+    Idempotent : un seul job par demande de signature, et un devis déjà
+    confirmé n'est pas reconfirmé.
+    """
+    _name = 'mb.sign.confirm.job'
+    _inherit = 'mb.sign.job.mixin'
+    _description = 'Confirmation différée du devis signé'
+    _batch_size_param = 'multibikes_signature.confirm_batch_size'
+    _cron_xmlid = 'multibikes_signature.cron_process_sign_confirm_jobs'
+
+    order_id = fields.Many2one(
+        'sale.order',
+        string='Commande',
+        required=True,
+        ondelete='cascade',
+        index=True,
+    )
+    sign_request_id = fields.Many2one(
+        'sign.request',
+        string='Demande de signature',
+        required=True,
+        ondelete='cascade',
+    )
+
+    _sql_constraints = [
+        ('sign_request_unique', 'unique(sign_request_id)',
+         'Un seul job de confirmation par demande de signature.'),
+    ]
+
+    @api.model
+    def _enqueue(self, sign_requests):
+        """Crée un job par demande signée n'en ayant pas déjà un
+
+        Chaque job est créé dans un savepoint : si un autre signataire de la
+        même demande l'a créé entre-temps, la violation de sign_request_unique
+        est absorbée et la demande est considérée comme déjà en file.
+
+        Returns:
+            mb.sign.confirm.job: Les jobs créés
+        """
+        existing = self.sudo().search([('sign_request_id', 'in', sign_requests.ids)])
+        to_queue = sign_requests - existing.sign_request_id
+        jobs = self.sudo().browse()
+        for request in to_queue.filtered('sale_order_id'):
+            try:
+                with mute_logger('odoo.sql_db'), self.env.cr.savepoint():
+                    jobs |= self.sudo().create({
+                        'order_id': request.sale_order_id.id,
+                        'sign_request_id': request.id,
+                    })
+            except UniqueViolation:
+                _logger.info(f"✍️ Confirmation de {request.reference} déjà en file d'attente")
+        if jobs:
+            self.env.ref(self._cron_xmlid)._trigger()
+            _logger.info(f"✍️ {len(jobs)} devis signé(s) en attente de confirmation")
+        return jobs
+
+    @api.model
+    def _cron_process_jobs(self):
+        """Traite un lot de jobs en attente, chacun dans son propre savepoint
+
+        Chaque confirmation est validée (commit) dès son traitement ; s'il
+        reste des jobs en attente, le cron est relancé aussitôt.
+        """
+        jobs = self._lock_pending(self._get_batch_size())
+        auto_commit = self._auto_commit()
+        for job in jobs:
+            job._process()
+            if auto_commit:
+                self.env.cr.commit()
+        # Lot suivant sans attendre le prochain passage planifié
+        self._trigger_if_pending(jobs)
+        return len(jobs)
+
+    def _process(self):
+        """Confirme le devis signé s'il ne l'est pas déjà et notifie la commande"""
+        self.ensure_one()
+        order = self.order_id.with_company(self.order_id.company_id)
+        try:
+            with self.env.cr.savepoint():
+                if order.state in ['draft', 'sent']:
+                    order.action_confirm()
+                    _logger.info(f"Devis {order.name} confirmé automatiquement après signature")
+
+                # Notification sur la commande
+                order.message_post(
+                    body="✅ Le devis a été signé avec succès. Document signé disponible dans les demandes de signature.",
+                    message_type='notification'
+                )
+        except Exception as e:
+            self.env.invalidate_all()
+            if self._record_failure(e):
+                order.message_post(
+                    body=f"⚠️ Le devis a été signé mais n'a pas pu être confirmé automatiquement : {e}",
+                    message_type='notification'
+                )
+            return False
+
+        self.write({'state': 'done', 'error_message': False})
+        _logger.info(f"Devis signé traité: {order.name}")
+        return True
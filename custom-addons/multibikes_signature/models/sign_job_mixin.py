@@ -0,0 +1,96 @@
+from odoo import models, fields, api
+from odoo.tools import SQL
+import logging
+import threading
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 10
+MAX_ATTEMPTS = 3
+
+
+class SignJobMixin(models.AbstractModel):
+    """Socle commun des files d'attente de la signature
+
+    État, tentatives et dernière erreur d'un job, verrouillage des jobs en
+    attente (FOR UPDATE SKIP LOCKED) et taille de lot paramétrable. Tant que
+    des jobs attendent, le cron est relancé à la fin de chaque lot. Un job
+    en erreur reste en attente et est repris au passage suivant du cron,
+    jusqu'à MAX_ATTEMPTS tentatives.
+    """
+    _name = 'mb.sign.job.mixin'
+    _description = 'File d\'attente de la signature'
+    _order = 'id'
+
+    # Paramètre système donnant le nombre de jobs traités par passage du cron
+    _batch_size_param = None
+    # Cron traitant la file, relancé tant que des jobs attendent
+    _cron_xmlid = None
+
+    state = fields.Selection([
+        ('pending', 'En attente'),
+        ('done', 'Terminée'),
+        ('failed', 'Échec'),
+    ], string='État', default='pending', required=True, index=True)
+    attempts = fields.Integer(string='Tentatives', default=0)
+    error_message = fields.Text(string='Erreur')
+
+    @api.model
+    def _get_batch_size(self):
+        try:
+            return int(self.env['ir.config_parameter'].sudo().get_param(
+                self._batch_size_param, DEFAULT_BATCH_SIZE
+            ))
+        except (TypeError, ValueError):
+            return DEFAULT_BATCH_SIZE
+
+    @api.model
+    def _auto_commit(self):
+        return not getattr(threading.current_thread(), 'testing', False)
+
+    @api.model
+    def _trigger_if_pending(self, processed):
+        """Relance le cron immédiatement si d'autres jobs que processed attendent
+
+        Les jobs en erreur de ce passage ne déclenchent pas de relance : ils
+        sont repris au passage planifié suivant.
+
+        Returns:
+            bool: True si le cron a été relancé
+        """
+        remaining = self.search_count([
+            ('state', '=', 'pending'),
+            ('id', 'not in', processed.ids),
+        ], limit=1)
+        if remaining:
+            self.env.ref(self._cron_xmlid)._trigger()
+        return bool(remaining)
+
+    @api.model
+    def _lock_pending(self, limit):
+        """Verrouille jusqu'à limit jobs en attente non verrouillés par un autre worker"""
+        self.env.cr.execute(SQL("""
+            SELECT id
+              FROM %s
+             WHERE state = 'pending'
+          ORDER BY id
+             LIMIT %s
+               FOR UPDATE SKIP LOCKED
+        """, SQL.identifier(self._table), limit))
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
+
+    def _record_failure(self, error):
+        """Incrémente les tentatives et abandonne le job au-delà de MAX_ATTEMPTS
+
+        Returns:
+            bool: True si le job est abandonné
+        """
+        self.ensure_one()
+        attempts = self.attempts + 1
+        self.write({
+            'attempts': attempts,
+            'error_message': str(error),
+            'state': 'failed' if attempts >= MAX_ATTEMPTS else 'pending',
+        })
+        _logger.error(f"❌ {self._description} #{self.id} (tentative {attempts}): {error}")
+        return self.state == 'failed'
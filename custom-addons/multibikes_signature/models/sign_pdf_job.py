@@ -0,0 +1,142 @@
+from odoo import models, fields, api
+import logging
+from collections import defaultdict
+
+_logger = logging.getLogger(__name__)
+
+
+class SignPdfJob(models.Model):
+    """File d'attente de génération des contrats à signer
+
+    Le rendu wkhtmltopdf du contrat n'est plus fait dans la requête HTTP de
+    l'utilisateur : action_send_signature_by_email et l'envoi groupé créent
+    des jobs, traités par le cron cron_process_sign_pdf_jobs (déclenché
+    immédiatement). Odoo n'exécute jamais deux fois le même cron en
+    parallèle : au plus un rendu à la fois par base, et au plus
+    pdf_batch_size contrats par passage, rendus ensemble.
+    """
+    _name = 'mb.sign.pdf.job'
+    _inherit = 'mb.sign.job.mixin'
+    _description = 'Génération différée du contrat à signer'
+    _batch_size_param = 'multibikes_signature.pdf_batch_size'
+    _cron_xmlid = 'multibikes_signature.cron_process_sign_pdf_jobs'
+
+    order_id = fields.Many2one(
+        'sale.order',
+        string='Commande',
+        required=True,
+        ondelete='cascade',
+        index=True,
+    )
+    user_id = fields.Many2one(
+        'res.users',
+        string='Demandé par',
+        required=True,
+        default=lambda self: self.env.user,
+    )
+    sign_request_id = fields.Many2one('sign.request', string='Demande de signature')
+
+    @api.model
+    def _enqueue(self, orders):
+        """Crée un job par commande n'en ayant pas déjà un en attente
+
+        Returns:
+            mb.sign.pdf.job: Les jobs créés
+        """
+        pending = self.sudo().search([
+            ('order_id', 'in', orders.ids),
+            ('state', '=', 'pending'),
+        ])
+        to_queue = orders - pending.order_id
+        jobs = self.sudo().create([
+            {'order_id': order.id, 'user_id': self.env.user.id}
+            for order in to_queue
+        ])
+        if jobs:
+            self.env.ref(self._cron_xmlid)._trigger()
+            _logger.info(f"📄 {len(jobs)} contrat(s) à signer mis en file d'attente")
+        return jobs
+
+    @api.model
+    def _cron_process_jobs(self):
+        """Traite un lot de jobs en attente, regroupés par utilisateur et société
+
+        Chaque groupe est rendu en un seul appel wkhtmltopdf puis validé
+        (commit) : les demandes déjà envoyées ne sont pas perdues si un groupe
+        suivant interrompt le passage. S'il reste des jobs en attente, le cron
+        est relancé aussitôt. Les jobs en erreur restent en attente et sont
+        repris au passage planifié suivant.
+        """
+        jobs = self._lock_pending(self._get_batch_size())
+        groups = defaultdict(lambda: self.browse())
+        for job in jobs:
+            groups[(job.user_id, job.order_id.company_id)] |= job
+        auto_commit = self._auto_commit()
+        for group in groups.values():
+            group._process()
+            if auto_commit:
+                self.env.cr.commit()
+        # Lot suivant sans attendre le prochain passage planifié
+        self._trigger_if_pending(jobs)
+        return len(jobs)
+
+    def _process(self):
+        """Génère les contrats, crée les demandes de signature et notifie l'utilisateur
+
+        Tous les jobs doivent appartenir au même utilisateur et à la même
+        société. En cas d'erreur sur un lot, chaque job est repris seul pour
+        isoler la commande en cause.
+        """
+        if not self:
+            return
+        user = self.user_id
+        orders = self.order_id.with_user(user).with_company(self.order_id.company_id)
+        try:
+            with self.env.cr.savepoint():
+                sign_requests = orders._create_signature_requests()
+        except Exception as e:
+            self.env.invalidate_all()
+            if len(self) > 1:
+                _logger.warning(f"⚠️ Échec du lot de {len(self)} contrats, reprise un par un: {e}")
+                for job in self:
+                    job._process()
+                return
+            self._handle_failure(e)
+            return
+
+        for job in self:
+            job.write({
+                'state': 'done',
+                'sign_request_id': sign_requests[job.order_id].id,
+                'error_message': False,
+            })
+            job.order_id.message_post(
+                body=f"La demande de signature a été envoyée à {job.order_id.partner_id.email}",
+                message_type='notification',
+            )
+        names = ', '.join(self.order_id[:5].mapped('name'))
+        if len(self) > 5:
+            names += ', ...'
+        self._notify_user(
+            user,
+            'Email envoyé!',
+            f"{len(self)} demande(s) de signature envoyée(s) : {names}",
+            'success',
+        )
+
+    def _handle_failure(self, error):
+        """Enregistre l'échec et prévient l'utilisateur si le job est abandonné"""
+        if self._record_failure(error):
+            message = f"Le contrat de {self.order_id.name} n'a pas pu être généré : {error}"
+            self.order_id.message_post(body=message, message_type='notification')
+            self._notify_user(self.user_id, 'Signature impossible', message, 'danger')
+
+    @api.model
+    def _notify_user(self, user, title, message, notification_type):
+        """Notification instantanée à l'utilisateur"""
+        user._bus_send('simple_notification', {
+            'title': title,
+            'message': message,
+            'type': notification_type,
+            'sticky': notification_type == 'danger',
+        })
@@ -10,18 +10,23 @@ class SignRequest(models.Model):
         'sale.order',
         string='Commande de vente',
         compute='_compute_sale_order_id',
-        store=True
+        store=True,
+        index='btree_not_null',
     )
 
 
     @api.depends('reference_doc')
     def _compute_sale_order_id(self):
-        """Extraire l'ID de sale.order depuis reference_doc"""
+        """Extraire l'ID de sale.order depuis reference_doc
+
+        La référence est analysée en mémoire ("sale.order,<id>") : aucun
+        browse/exists() par enregistrement. Une commande supprimée remet le
+        champ à vide (ondelete='set null').
+        """
         for record in self:
-            if (record.reference_doc and
-                hasattr(record.reference_doc, '_name') and
-                record.reference_doc._name == 'sale.order'):
-                record.sale_order_id = record.reference_doc.id
+            reference = record.reference_doc
+            if reference and reference._name == 'sale.order':
+                record.sale_order_id = reference.id
             else:
                 record.sale_order_id = False
 
@@ -37,27 +42,27 @@ class SignRequest(models.Model):
             self._handle_signed_quotation()
 
     def _handle_signed_quotation(self):
-        """Traiter le devis après signature"""
-        try:
-            order = self.reference_doc
+        """Traiter le devis après signature
 
-            # Mettre à jour le statut
-            order.signature_status = 'signed'
+        Dans un savepoint : une erreur base de données n'interrompt pas la
+        transaction du signataire, sa signature reste enregistrée.
+        """
+        try:
+            with self.env.cr.savepoint():
+                order = self.reference_doc
 
-            # Optionnel : Confirmer automatiquement le devis
-            if order.state in ['draft', 'sent']:
-                order.action_confirm()
-                _logger.info(f"Devis {order.name} confirmé automatiquement après signature")
+                # Mettre à jour le statut
+                order.signature_status = 'signed'
 
-            # Notification sur la commande
-            order.message_post(
-                body=f"✅ Le devis a été signé avec succès. Document signé disponible dans les demandes de signature.",
-                message_type='notification'
-            )
+                # Figer le contrat : les réimpressions ne passent plus par wkhtmltopdf
+                order._store_signed_contract(self.template_id.attachment_id)
 
-            _logger.info(f"Devis signé traité: {order.name}")
+                # Confirmation (stock, réservations) et notification en arrière-plan,
+                # pour rendre la main au signataire immédiatement
+                self.env['mb.sign.confirm.job']._enqueue(self)
 
         except Exception as e:
+            self.env.invalidate_all()
             _logger.error(f"Erreur traitement devis signé: {e}")
 
     def _get_linked_record_action(self, default_action=None):
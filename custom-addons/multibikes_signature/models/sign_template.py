@@ -0,0 +1,14 @@
+from odoo import models, fields
+
+
+class SignTemplate(models.Model):
+    _inherit = 'sign.template'
+
+    mb_content_key = fields.Char(
+        string='Empreinte du contenu',
+        index='btree_not_null',
+        copy=False,
+        readonly=True,
+        help="Empreinte du PDF rendu (hors dates de génération), permettant de "
+             "réutiliser le modèle pour un contrat identique",
+    )
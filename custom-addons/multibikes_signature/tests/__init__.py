@@ -0,0 +1,8 @@
+from . import test_query_budgets
+from . import test_signature_status
+from . import test_sign_pdf_job
+from . import test_pdf_pages
+from . import test_benchmark_pdf_pages
+from . import test_sign_template
+from . import test_signed_contract
+from . import test_sign_confirm_job
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""Helpers shared by the multibikes_signature tests."""
+from odoo.addons.multibikes_signature.tools.pdf_samples import make_pdf
+
+
+def create_sign_request(env, order, page_count=1):
+    """Demande de signature du client de order sur un modèle PDF généré"""
+    attachment = env["ir.attachment"].create(
+        {"name": "contrat.pdf", "raw": make_pdf(page_count, 2), "mimetype": "application/pdf"}
+    )
+    template = env["sign.template"].create(
+        {"name": f"Modèle {order.name}", "attachment_id": attachment.id}
+    )
+    return env["sign.request"].with_context(no_sign_mail=True).create(
+        {
+            "template_id": template.id,
+            "reference": f"Signature {order.name}",
+            "reference_doc": f"sale.order,{order.id}",
+            "request_item_ids": [
+                (
+                    0,
+                    0,
+                    {
+                        "role_id": env.ref("sign.sign_item_role_customer").id,
+                        "partner_id": order.partner_id.id,
+                        "signer_email": order.partner_id.email,
+                    },
+                )
+            ],
+        }
+    )
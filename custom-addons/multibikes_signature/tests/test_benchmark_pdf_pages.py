@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the PDF page counter against pdfminer.
+
+Exclu de la suite standard, à lancer avec :
+
+    odoo-bin -d <base> --test-tags mb_benchmark
+"""
+import io
+import json
+import logging
+import statistics
+import time
+
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+
+from odoo.addons.multibikes_signature.tools import pdf_pages
+from .common import make_pdf
+
+_logger = logging.getLogger(__name__)
+
+PAGE_COUNTS = (1, 10, 100)
+REPEAT = 5
+
+
+def _pdfminer_count(data):
+    from pdfminer.high_level import extract_pages
+
+    return len(list(extract_pages(io.BytesIO(data))))
+
+
+@tagged("-standard", "mb_benchmark")
+class TestBenchmarkPdfPages(TransactionCase):
+    """Durée médiane (ms) du comptage des pages selon la taille du PDF."""
+
+    def _measure(self, func, data):
+        durations = []
+        for _i in range(REPEAT):
+            started = time.perf_counter()
+            result = func(data)
+            durations.append((time.perf_counter() - started) * 1000)
+        return result, round(statistics.median(durations), 3)
+
+    def test_page_count_benchmark(self):
+        try:
+            import pdfminer  # noqa: F401
+        except ImportError:
+            pdfminer = None
+
+        results = {}
+        for page_count in PAGE_COUNTS:
+            data = make_pdf(page_count)
+            counters = {"page_tree": pdf_pages.count_pages}
+            if pdfminer:
+                counters["pdfminer"] = _pdfminer_count
+            for name, func in counters.items():
+                result, median_ms = self._measure(func, data)
+                self.assertEqual(result, page_count)
+                results[f"{name}/pages={page_count}"] = median_ms
+
+        _logger.info("⏱️ Benchmark comptage de pages : %s", json.dumps(results))
+        if pdfminer:
+            for page_count in PAGE_COUNTS:
+                self.assertLess(
+                    results[f"page_tree/pages={page_count}"],
+                    results[f"pdfminer/pages={page_count}"],
+                )
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""Page counting of the contracts sent for signature."""
+from unittest.mock import patch
+
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+
+from odoo.addons.multibikes_signature.tools import pdf_pages
+from .common import make_pdf
+
+
+@tagged("post_install", "-at_install")
+class TestPdfPages(TransactionCase):
+    """
+    Nombre de pages lu dans l'arbre des pages et mis en cache sur la pièce
+    jointe par empreinte du contenu.
+    """
+
+    def _attachment(self, data):
+        return self.env["ir.attachment"].create(
+            {"name": "contrat.pdf", "raw": data, "mimetype": "application/pdf"}
+        )
+
+    def test_count_pages(self):
+        for page_count in (1, 3, 12):
+            self.assertEqual(pdf_pages.count_pages(make_pdf(page_count, 2)), page_count)
+        self.assertIsNone(pdf_pages.count_pages(b"pas un pdf"))
+
+    def test_count_pages_fallback(self):
+        """Sans arbre des pages lisible, le lecteur pypdf prend le relais."""
+        with patch.object(pdf_pages, "_count_from_page_tree", return_value=None):
+            self.assertEqual(pdf_pages.count_pages(make_pdf(4, 2)), 4)
+
+    def test_attachment_cache(self):
+        attachment = self._attachment(make_pdf(5, 2))
+        self.assertEqual(attachment._mb_get_pdf_page_count(), 5)
+        self.assertEqual(attachment.mb_pdf_page_count_checksum, attachment.checksum)
+
+        # Même contenu : le nombre est repris sans relire le fichier
+        duplicate = self._attachment(make_pdf(5, 2))
+        with patch.object(pdf_pages, "count_pages_file") as count_file, patch.object(
+            pdf_pages, "count_pages"
+        ) as count:
+            self.assertEqual(duplicate._mb_get_pdf_page_count(), 5)
+        count_file.assert_not_called()
+        count.assert_not_called()
+
+        # Contenu modifié : l'empreinte change, le nombre est recalculé
+        attachment.raw = make_pdf(2, 2)
+        self.assertEqual(attachment._mb_get_pdf_page_count(), 2)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""Query-count and wall-time budget for the signature status compute."""
+import time
+
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+
+from .common import create_sign_request
+
+ORDER_COUNT = 1000
+# Une commande sur SIGNED_EVERY a une demande de signature, dont une sur deux
+# est annulée : le calcul agrège de vraies lignes de sign_request
+SIGNED_EVERY = 10
+
+# Budgets maximaux : une régression de coût fait échouer le test ; une
+# amélioration ne fait rien échouer et doit être reportée ici à la main.
+QUERY_BUDGET = 60
+# Comptage des demandes : un _read_group sur sale_order_id
+COUNT_QUERY_BUDGET = 10
+TIME_BUDGET = 5.0
+
+
+@tagged("post_install", "-at_install", "-standard", "mb_query_budget")
+class TestSignatureStatusBudget(TransactionCase):
+    """
+    Budget de requêtes SQL et de durée du calcul du statut de signature.
+
+    Exclu de la suite standard (durées dépendantes de la machine), à lancer
+    seul avec --test-tags mb_query_budget.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        partner = cls.env["res.partner"].create(
+            {"name": "Client budget", "email": "budget@multibikes.test"}
+        )
+        cls.orders = cls.env["sale.order"].create(
+            [{"partner_id": partner.id} for _i in range(ORDER_COUNT)]
+        )
+        cls.signed_orders = cls.orders[::SIGNED_EVERY]
+        cls.cancelled_orders = cls.signed_orders[::2]
+        for order in cls.signed_orders:
+            sign_request = create_sign_request(cls.env, order)
+            if order in cls.cancelled_orders:
+                sign_request.write({"state": "canceled"})
+
+    def test_signature_status_1000_orders(self):
+        """Statut de signature de 1 000 commandes, dont 100 avec une demande."""
+        field = self.orders._fields["signature_status"]
+        self.env.invalidate_all()
+
+        started = time.perf_counter()
+        with self.assertQueryCount(QUERY_BUDGET):
+            self.env.add_to_compute(field, self.orders)
+            self.orders.flush_recordset(["signature_status"])
+        elapsed = time.perf_counter() - started
+
+        self.assertLessEqual(
+            elapsed,
+            TIME_BUDGET,
+            f"Statut de signature : {elapsed:.2f}s pour un budget de {TIME_BUDGET}s",
+        )
+        self.assertEqual(
+            set(self.cancelled_orders.mapped("signature_status")), {"cancelled"}
+        )
+        pending_orders = self.signed_orders - self.cancelled_orders
+        self.assertEqual(set(pending_orders.mapped("signature_status")), {"sent"})
+        self.assertEqual(
+            set((self.orders - self.signed_orders).mapped("signature_status")), {"none"}
+        )
+
+    def test_sign_request_count_1000_orders(self):
+        """Nombre de demandes de 1 000 commandes, dont 100 avec une demande."""
+        field = self.orders._fields["sign_request_count"]
+        self.env.invalidate_all()
+
+        with self.assertQueryCount(COUNT_QUERY_BUDGET):
+            self.env.add_to_compute(field, self.orders)
+            self.orders.flush_recordset(["sign_request_count"])
+
+        self.assertEqual(set(self.signed_orders.mapped("sign_request_count")), {1})
+        self.assertEqual(
+            set((self.orders - self.signed_orders).mapped("sign_request_count")), {0}
+        )
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Queued confirmation of the signed quotations."""
+from unittest.mock import patch
+
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+from odoo.tools import mute_logger
+
+from odoo.addons.sale.models.sale_order import SaleOrder
+from odoo.addons.multibikes_signature.models.sign_job_mixin import MAX_ATTEMPTS
+from .common import create_sign_request
+
+SIGN_REQUEST_LOGGER = "odoo.addons.multibikes_signature.models.sign_request"
+
+
+@tagged("post_install", "-at_install")
+class TestSignConfirmJob(TransactionCase):
+    """
+    La signature met la confirmation du devis en file d'attente ; le cron
+    confirme une seule fois, réessaie en cas d'erreur puis abandonne.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        partner = cls.env["res.partner"].create(
+            {"name": "Client signature", "email": "client.signature@example.com"}
+        )
+        cls.order = cls.env["sale.order"].create({"partner_id": partner.id})
+        cls.sign_request = create_sign_request(cls.env, cls.order)
+        cls.Job = cls.env["mb.sign.confirm.job"]
+
+    def test_signed_quotation_enqueued(self):
+        """La signature ne confirme pas le devis dans la requête du signataire."""
+        with patch.object(SaleOrder, "action_confirm") as confirm:
+            self.sign_request._handle_signed_quotation()
+            self.sign_request._handle_signed_quotation()
+        confirm.assert_not_called()
+        job = self.Job.search([("sign_request_id", "=", self.sign_request.id)])
+        self.assertEqual(len(job), 1)
+        self.assertEqual(job.order_id, self.order)
+        self.assertEqual(self.order.state, "draft")
+
+    def test_enqueue_concurrent(self):
+        """Un job créé entre-temps par un autre signataire n'est pas dupliqué."""
+        self.Job.create(
+            {"order_id": self.order.id, "sign_request_id": self.sign_request.id}
+        )
+        # La recherche préalable ne voit pas le job concurrent : seule la
+        # contrainte d'unicité peut départager les deux signatures
+        with patch.object(type(self.Job), "search", return_value=self.Job.browse()):
+            jobs = self.Job._enqueue(self.sign_request)
+        self.assertFalse(jobs)
+        self.assertEqual(
+            self.Job.search_count([("sign_request_id", "=", self.sign_request.id)]), 1
+        )
+
+    def test_signed_quotation_database_error(self):
+        """Une erreur base de données après signature n'avorte pas la transaction."""
+        def _store(order, attachment):
+            self.env.cr.execute("SELECT 1 / 0")
+
+        with patch.object(
+            type(self.order),
+            "_store_signed_contract",
+            autospec=True,
+            side_effect=_store,
+        ), mute_logger("odoo.sql_db", SIGN_REQUEST_LOGGER):
+            self.sign_request._handle_signed_quotation()
+
+        self.env.cr.execute("SELECT 1")
+        self.assertEqual(self.env.cr.fetchone(), (1,))
+        self.assertFalse(
+            self.Job.search([("sign_request_id", "=", self.sign_request.id)])
+        )
+
+    def test_next_batch_committed_and_triggered(self):
+        """Chaque confirmation est validée et le lot suivant est planifié."""
+        self.env["ir.config_parameter"].sudo().set_param(
+            self.Job._batch_size_param, "2"
+        )
+        orders = self.env["sale.order"].create(
+            [{"partner_id": self.order.partner_id.id} for _i in range(3)]
+        )
+        sign_requests = self.env["sign.request"]
+        for order in orders:
+            sign_requests |= create_sign_request(self.env, order)
+        jobs = self.Job._enqueue(sign_requests)
+        Cron = self.env["ir.cron"]
+
+        with patch.object(
+            type(self.Job), "_auto_commit", return_value=True
+        ), patch.object(self.env.cr, "commit") as commit, patch.object(
+            type(Cron), "_trigger", autospec=True
+        ) as trigger:
+            self.assertEqual(self.Job._cron_process_jobs(), 2)
+            self.assertEqual(commit.call_count, 2)
+            trigger.assert_called_once()
+            self.assertEqual(
+                trigger.call_args.args[0],
+                self.env.ref("multibikes_signature.cron_process_sign_confirm_jobs"),
+            )
+            self.assertEqual(self.Job._cron_process_jobs(), 1)
+            trigger.assert_called_once()
+        self.assertEqual(set(jobs.mapped("state")), {"done"})
+
+    def test_confirm_once(self):
+        job = self.Job._enqueue(self.sign_request)
+        self.assertEqual(self.Job._cron_process_jobs(), 1)
+        self.assertEqual(job.state, "done")
+        self.assertEqual(self.order.state, "sale")
+
+        # Une nouvelle signature de la même demande ne recrée pas de job
+        self.assertFalse(self.Job._enqueue(self.sign_request))
+        self.assertEqual(self.Job._cron_process_jobs(), 0)
+
+    def test_already_confirmed(self):
+        """Un devis déjà confirmé n'est pas reconfirmé."""
+        self.order.action_confirm()
+        job = self.Job._enqueue(self.sign_request)
+        with patch.object(SaleOrder, "action_confirm") as confirm:
+            self.Job._cron_process_jobs()
+        confirm.assert_not_called()
+        self.assertEqual(job.state, "done")
+
+    def test_retry_then_fail(self):
+        job = self.Job._enqueue(self.sign_request)
+        with patch.object(SaleOrder, "action_confirm", side_effect=ValueError("stock")):
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                self.Job._cron_process_jobs()
+                self.assertEqual(job.attempts, attempt)
+        self.assertEqual(job.state, "failed")
+        self.assertEqual(self.order.state, "draft")
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""Queued generation of the contracts sent for signature."""
+from unittest.mock import patch
+
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+
+from odoo.addons.multibikes_signature.models.sale_order import SaleOrder
+from odoo.addons.multibikes_signature.models.sign_job_mixin import MAX_ATTEMPTS
+from .common import create_sign_request
+
+
+@tagged("post_install", "-at_install")
+class TestSignPdfJob(TransactionCase):
+    """
+    L'envoi en signature met le rendu du contrat en file d'attente ; le cron
+    crée la demande, réessaie en cas d'erreur puis abandonne.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        partner = cls.env["res.partner"].create(
+            {"name": "Client signature", "email": "client.signature@example.com"}
+        )
+        cls.order = cls.env["sale.order"].create({"partner_id": partner.id})
+        cls.order.action_confirm()
+        cls.Job = cls.env["mb.sign.pdf.job"]
+
+    def test_enqueue_once(self):
+        """Un seul job en attente par commande, sans rendu dans la requête."""
+        with patch.object(SaleOrder, "_render_contract_pdfs") as render:
+            self.order.action_send_signature_by_email()
+            self.order.action_send_signature_by_email()
+        render.assert_not_called()
+        jobs = self.Job.search([("order_id", "=", self.order.id)])
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(jobs.state, "pending")
+        self.assertEqual(jobs.user_id, self.env.user)
+
+    def test_process_job(self):
+        """Le cron crée la demande de signature et termine le job."""
+        job = self.Job._enqueue(self.order)
+        sign_request = self.env["sign.request"]
+        with patch.object(
+            SaleOrder,
+            "_create_signature_requests",
+            return_value={self.order: sign_request},
+        ) as create:
+            self.assertEqual(self.Job._cron_process_jobs(), 1)
+            self.assertEqual(self.Job._cron_process_jobs(), 0)
+        create.assert_called_once()
+        self.assertEqual(job.state, "done")
+
+    def test_retry_then_fail(self):
+        """Une erreur de rendu est réessayée puis le job passe en échec."""
+        job = self.Job._enqueue(self.order)
+        with patch.object(
+            SaleOrder, "_create_signature_requests", side_effect=ValueError("wkhtmltopdf")
+        ):
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                self.Job._cron_process_jobs()
+                self.assertEqual(job.attempts, attempt)
+        self.assertEqual(job.state, "failed")
+        self.assertIn("wkhtmltopdf", job.error_message)
+
+    def test_bulk_send(self):
+        """L'envoi groupé met en file les seules commandes éligibles."""
+        partner = self.order.partner_id
+        no_email = self.env["res.partner"].create({"name": "Client sans email"})
+        orders = self.env["sale.order"].create(
+            [{"partner_id": partner.id} for _i in range(3)]
+            + [{"partner_id": no_email.id}]
+        )
+        self.Job._enqueue(orders[0])
+        # Une demande annulée n'empêche pas un nouvel envoi
+        cancelled = create_sign_request(self.env, orders[1])
+        cancelled.write({"state": "canceled"})
+        self.assertEqual(orders[1].signature_status, "cancelled")
+        # Une demande en cours, si
+        create_sign_request(self.env, orders[2])
+
+        orders.action_send_signature_bulk()
+        jobs = self.Job.search([("order_id", "in", orders.ids)])
+        self.assertEqual(jobs.order_id, orders[:2])
+
+    def test_next_batch_triggered(self):
+        """Un envoi plus grand qu'un lot relance le cron jusqu'à la fin de la file."""
+        self.env["ir.config_parameter"].sudo().set_param(
+            self.Job._batch_size_param, "2"
+        )
+        orders = self.env["sale.order"].create(
+            [{"partner_id": self.order.partner_id.id} for _i in range(3)]
+        )
+        jobs = self.Job._enqueue(orders)
+        Cron = self.env["ir.cron"]
+
+        with patch.object(
+            SaleOrder,
+            "_create_signature_requests",
+            autospec=True,
+            side_effect=lambda records: {o: self.env["sign.request"] for o in records},
+        ), patch.object(type(Cron), "_trigger", autospec=True) as trigger:
+            self.assertEqual(self.Job._cron_process_jobs(), 2)
+            trigger.assert_called_once()
+            self.assertEqual(
+                trigger.call_args.args[0],
+                self.env.ref("multibikes_signature.cron_process_sign_pdf_jobs"),
+            )
+            self.assertEqual(self.Job._cron_process_jobs(), 1)
+            trigger.assert_called_once()
+        self.assertEqual(set(jobs.mapped("state")), {"done"})
+
+    def test_commit_per_group(self):
+        """Chaque groupe utilisateur/société est validé dès son traitement."""
+        other_user = self.env["res.users"].create(
+            {"name": "Vendeur signature", "login": "mb_sign_seller"}
+        )
+        orders = self.env["sale.order"].create(
+            [{"partner_id": self.order.partner_id.id} for _i in range(2)]
+        )
+        self.Job._enqueue(orders[0])
+        self.Job.with_user(other_user)._enqueue(orders[1])
+
+        with patch.object(
+            SaleOrder,
+            "_create_signature_requests",
+            autospec=True,
+            side_effect=lambda records: {o: self.env["sign.request"] for o in records},
+        ), patch.object(
+            type(self.Job), "_auto_commit", return_value=True
+        ), patch.object(self.env.cr, "commit") as commit:
+            self.assertEqual(self.Job._cron_process_jobs(), 2)
+        self.assertEqual(commit.call_count, 2)
+
+    def test_batch_failure_isolated(self):
+        """Une commande en erreur n'empêche pas l'envoi des autres du lot."""
+        orders = self.env["sale.order"].create(
+            [{"partner_id": self.order.partner_id.id} for _i in range(3)]
+        )
+        jobs = self.Job._enqueue(orders)
+        failing = orders[1]
+
+        def _create(records):
+            if failing in records:
+                raise ValueError("wkhtmltopdf")
+            return {order: self.env["sign.request"] for order in records}
+
+        with patch.object(
+            SaleOrder, "_create_signature_requests", autospec=True, side_effect=_create
+        ):
+            self.assertEqual(self.Job._cron_process_jobs(), 3)
+        self.assertEqual(jobs.mapped("state"), ["done", "pending", "done"])
+        self.assertEqual(jobs.mapped("attempts"), [0, 1, 0])
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Content-addressed reuse of the signature templates."""
+from unittest.mock import patch
+
+from odoo.exceptions import UserError
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+
+from odoo.addons.multibikes_signature.models.sale_order import (
+    CONTRACT_REPORT,
+    SaleOrder,
+)
+from odoo.addons.multibikes_signature.tools import pdf_pages
+from .common import make_pdf
+
+
+@tagged("post_install", "-at_install")
+class TestSignTemplate(TransactionCase):
+    """
+    Un contrat dont le rendu est identique réutilise la pièce jointe et le
+    modèle de signature ; les zones sont placées sur la dernière page.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        partner = cls.env["res.partner"].create({"name": "Client signature"})
+        cls.order = cls.env["sale.order"].create({"partner_id": partner.id})
+
+    def _create_template(self, pdf):
+        with patch.object(
+            SaleOrder, "_render_contract_pdfs", return_value={self.order: pdf}
+        ):
+            return self.order._create_sign_template()
+
+    def test_content_key_ignores_dates(self):
+        pdf = make_pdf(2, 2)
+        first = pdf + b"<</CreationDate (D:20250601120000+02'00')>>"
+        second = pdf + b"<</CreationDate (D:20250702080000+02'00')>>"
+        self.assertEqual(pdf_pages.content_key(first), pdf_pages.content_key(second))
+        self.assertNotEqual(
+            pdf_pages.content_key(pdf), pdf_pages.content_key(make_pdf(3, 2))
+        )
+
+    def test_template_reused(self):
+        template = self._create_template(make_pdf(3, 2))
+        self.assertEqual(set(template.sign_item_ids.mapped("page")), {3})
+        self.assertEqual(
+            set(template.sign_item_ids.mapped("name")),
+            {"accept_conditions", "customer_signature"},
+        )
+
+        attachments = self.env["ir.attachment"].search_count([])
+        self.assertEqual(self._create_template(make_pdf(3, 2)), template)
+        self.assertEqual(self.env["ir.attachment"].search_count([]), attachments)
+
+        other = self._create_template(make_pdf(4, 2))
+        self.assertNotEqual(other, template)
+        self.assertEqual(set(other.sign_item_ids.mapped("page")), {4})
+
+    def test_layout_cached(self):
+        SaleOrder = self.env["sale.order"]
+        self.env.registry.clear_cache()
+        layout = SaleOrder._get_signature_item_layout(CONTRACT_REPORT, 3)
+        with patch.object(type(self.env["ir.model.data"]), "_xmlid_to_res_model_res_id") as lookup:
+            self.assertIs(SaleOrder._get_signature_item_layout(CONTRACT_REPORT, 3), layout)
+        lookup.assert_not_called()
+
+    def test_layout_missing_types(self):
+        """Sans type de zone, aucune mise en page vide n'est mise en cache."""
+        SaleOrder = self.env["sale.order"]
+        self.env["ir.model.data"].search(
+            [("module", "=", "sign"), ("name", "=", "sign_item_type_checkbox")]
+        ).unlink()
+        self.env.registry.clear_cache()
+        with self.assertRaises(UserError):
+            SaleOrder._get_signature_item_layout(CONTRACT_REPORT, 3)
+        with self.assertRaises(UserError):
+            SaleOrder._get_signature_item_layout(CONTRACT_REPORT, 3)
+
+    def test_templates_batch(self):
+        """Les contrats identiques d'un lot partagent un seul modèle."""
+        orders = self.order | self.env["sale.order"].create(
+            [{"partner_id": self.order.partner_id.id} for _i in range(2)]
+        )
+        pdfs = {orders[0]: make_pdf(2, 2), orders[1]: make_pdf(2, 2), orders[2]: make_pdf(5, 2)}
+        templates = orders._create_sign_templates(pdfs)
+        self.assertEqual(templates[orders[0]], templates[orders[1]])
+        self.assertNotEqual(templates[orders[0]], templates[orders[2]])
+        self.assertEqual(set(templates[orders[2]].sign_item_ids.mapped("page")), {5})
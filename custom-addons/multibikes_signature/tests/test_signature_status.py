@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""Signature status aggregate compared to the per-record implementation."""
+import base64
+import random
+
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+
+SEED = 20250715
+ORDER_COUNT = 40
+
+# PDF minimal d'une page, suffisant pour créer un modèle de signature
+MINIMAL_PDF = (
+    b"%PDF-1.4\n"
+    b"1 0 obj <</Type /Catalog /Pages 2 0 R>> endobj\n"
+    b"2 0 obj <</Type /Pages /Kids [3 0 R] /Count 1>> endobj\n"
+    b"3 0 obj <</Type /Page /Parent 2 0 R /MediaBox [0 0 595 842]>> endobj\n"
+    b"trailer <</Root 1 0 R>>\n"
+    b"%%EOF\n"
+)
+
+
+def reference_signature_status(order):
+    """Ancienne implémentation, enregistrement par enregistrement"""
+    if not order.sign_request_ids:
+        return "none"
+    active_requests = order.sign_request_ids.filtered(lambda r: r.state != "canceled")
+    if not active_requests:
+        return "cancelled"
+    states = active_requests.mapped("state")
+    all_request_items = active_requests.mapped("request_item_ids")
+    item_states = all_request_items.mapped("state")
+    if "completed" in states:
+        return "completed"
+    if "signed" in item_states or any(
+        item.state == "completed" for item in all_request_items
+    ):
+        return "signed"
+    if "sent" in states:
+        return "sent"
+    return "none"
+
+
+@tagged("post_install", "-at_install")
+class TestSignatureStatus(TransactionCase):
+    """
+    Le statut calculé par agrégat SQL doit être identique à celui de
+    l'implémentation par enregistrement, sur des données aléatoires.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.partner = cls.env["res.partner"].create(
+            {"name": "Client signature", "email": "client.signature@example.com"}
+        )
+        attachment = cls.env["ir.attachment"].create(
+            {
+                "name": "contrat.pdf",
+                "datas": base64.b64encode(MINIMAL_PDF),
+                "mimetype": "application/pdf",
+            }
+        )
+        cls.template = cls.env["sign.template"].create(
+            {"name": "Modèle de test", "attachment_id": attachment.id}
+        )
+        cls.customer_role = cls.env.ref("sign.sign_item_role_customer")
+        cls.request_states = [
+            value
+            for value, _label in cls.env["sign.request"]._fields[
+                "state"
+            ]._description_selection(cls.env)
+        ]
+        cls.item_states = [
+            value
+            for value, _label in cls.env["sign.request.item"]._fields[
+                "state"
+            ]._description_selection(cls.env)
+        ]
+
+    def _create_random_requests(self, rng, orders):
+        SignRequest = self.env["sign.request"].with_context(no_sign_mail=True)
+        for order in orders:
+            for _i in range(rng.randint(0, 3)):
+                request = SignRequest.create(
+                    {
+                        "template_id": self.template.id,
+                        "reference": f"Signature {order.name}",
+                        "reference_doc": f"sale.order,{order.id}",
+                        "request_item_ids": [
+                            (
+                                0,
+                                0,
+                                {
+                                    "role_id": self.customer_role.id,
+                                    "partner_id": self.partner.id,
+                                    "signer_email": self.partner.email,
+                                },
+                            )
+                            for _j in range(rng.randint(1, 2))
+                        ],
+                    }
+                )
+                request.write({"state": rng.choice(self.request_states)})
+                for item in request.request_item_ids:
+                    item.write({"state": rng.choice(self.item_states)})
+
+    def test_signature_status_matches_reference(self):
+        rng = random.Random(SEED)
+        orders = self.env["sale.order"].create(
+            [{"partner_id": self.partner.id} for _i in range(ORDER_COUNT)]
+        )
+        self._create_random_requests(rng, orders)
+        self.env.invalidate_all()
+
+        expected = {order.id: reference_signature_status(order) for order in orders}
+        self.env.add_to_compute(orders._fields["signature_status"], orders)
+        orders.flush_recordset(["signature_status"])
+        self.env.invalidate_all()
+
+        self.assertEqual(
+            {order.id: order.signature_status for order in orders}, expected
+        )
+        self.assertEqual(
+            orders.mapped("sign_request_count"),
+            [len(order.sign_request_ids) for order in orders],
+        )
+
+    def test_signature_status_flags(self):
+        """Priorité des indicateurs agrégés."""
+        status = self.env["sale.order"]._signature_status_from_flags
+        self.assertEqual(status(None), "none")
+        self.assertEqual(status((False, False, False, False)), "cancelled")
+        self.assertEqual(status((True, True, True, True)), "completed")
+        self.assertEqual(status((True, False, True, True)), "signed")
+        self.assertEqual(status((True, False, False, True)), "sent")
+        self.assertEqual(status((True, False, False, False)), "none")
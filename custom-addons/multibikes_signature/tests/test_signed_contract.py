@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Frozen contract PDF of signed orders."""
+from unittest.mock import patch
+
+from odoo.exceptions import UserError
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+
+from odoo.addons.multibikes_signature.models.sale_order import CONTRACT_REPORT
+from .common import make_pdf
+
+
+@tagged("post_install", "-at_install")
+class TestSignedContract(TransactionCase):
+    """
+    Le contrat d'une commande signée est figé et renvoyé tel quel par le
+    rapport, sans appel à wkhtmltopdf.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        partner = cls.env["res.partner"].create({"name": "Client signature"})
+        cls.order = cls.env["sale.order"].create({"partner_id": partner.id})
+        cls.signed_pdf = make_pdf(3, 2)
+        cls.source = cls.env["ir.attachment"].create(
+            {"name": "contrat.pdf", "raw": cls.signed_pdf, "mimetype": "application/pdf"}
+        )
+
+    def _render_pdf(self, orders):
+        """Impression complète du contrat, comme depuis la commande"""
+        Report = self.env["ir.actions.report"].with_context(
+            force_report_rendering=True
+        )
+        with patch.object(
+            type(Report), "_run_wkhtmltopdf", return_value=make_pdf(1, 2)
+        ) as run:
+            pdf, _report_type = Report._render_qweb_pdf(
+                CONTRACT_REPORT, res_ids=orders.ids
+            )
+        return pdf, run.call_count
+
+    def test_signed_contract_served(self):
+        attachment = self.order._store_signed_contract(self.source)
+        self.assertEqual(attachment.raw, self.signed_pdf)
+
+        pdf, calls = self._render_pdf(self.order)
+        self.assertEqual(calls, 0)
+        self.assertEqual(pdf, self.signed_pdf)
+
+    def test_signed_contract_immutable(self):
+        attachment = self.order._store_signed_contract(self.source)
+        other = self.env["ir.attachment"].create({"name": "autre.pdf", "raw": make_pdf(1, 2)})
+        self.assertEqual(self.order._store_signed_contract(other), attachment)
+        with self.assertRaises(UserError):
+            self.order.mb_signed_contract_id = other
+
+    def test_unsigned_contract_rendered(self):
+        _pdf, calls = self._render_pdf(self.order)
+        self.assertEqual(calls, 1)
+
+    def test_signed_contract_not_rerendered(self):
+        """Un rendu non découpable des autres commandes épargne le contrat signé"""
+        self.order._store_signed_contract(self.source)
+        others = self.env["sale.order"].create(
+            [{"partner_id": self.order.partner_id.id} for _i in range(2)]
+        )
+        Report = self.env["ir.actions.report"]
+        with patch.object(
+            type(Report), "_run_wkhtmltopdf", return_value=make_pdf(1, 2)
+        ) as run:
+            streams = Report._render_qweb_pdf_prepare_streams(
+                CONTRACT_REPORT, {}, res_ids=(self.order | others).ids
+            )
+        self.assertEqual(run.call_count, 1)
+        self.assertEqual(set(streams), {self.order.id, False})
+        self.assertEqual(streams[self.order.id]["stream"].getvalue(), self.signed_pdf)
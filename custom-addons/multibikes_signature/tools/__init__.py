@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""Outils pour multibikes_signature module."""
+from . import pdf_pages
+from . import pdf_samples
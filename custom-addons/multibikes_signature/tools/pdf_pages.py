@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Comptage rapide des pages et empreinte d'un PDF
+-----------------------------------------------
+count_pages lit uniquement le trailer et la racine de l'arbre des pages (/Root →
+/Pages → /Count), sans analyse de mise en page. Les PDF produits par
+wkhtmltopdf ont une table xref classique : le chemin rapide suffit. Pour
+les PDF dont les objets sont compressés (object streams), on se rabat sur
+le lecteur pypdf d'Odoo, qui ne lit lui aussi que l'arbre des pages.
+
+content_key donne une empreinte du contenu indépendante des dates de
+génération, pour réutiliser les modèles de signature identiques.
+"""
+import hashlib
+import io
+import logging
+import re
+
+_logger = logging.getLogger(__name__)
+
+_ROOT_RE = re.compile(rb"/Root\s+(\d+)\s+(\d+)\s+R")
+_PAGES_RE = re.compile(rb"/Pages\s+(\d+)\s+(\d+)\s+R")
+_COUNT_RE = re.compile(rb"/Count\s+(\d+)")
+# Métadonnées qui changent à chaque rendu sans changer le document
+_VOLATILE_RE = re.compile(
+    rb"/(?:CreationDate|ModDate)\s*\([^)]*\)|/ID\s*\[\s*<[0-9A-Fa-f]*>\s*<[0-9A-Fa-f]*>\s*\]"
+)
+
+
+def _object_body(data, number, generation):
+    """Contenu de la dernière définition de l'objet (mises à jour incrémentales)"""
+    header = b"%d %d obj" % (number, generation)
+    start = data.rfind(header)
+    while start > 0 and data[start - 1:start].isdigit():
+        start = data.rfind(header, 0, start)
+    if start >= 0:
+        start += len(header)
+    else:
+        # Espacement non standard : recherche plus lente par expression régulière
+        pattern = re.compile(rb"(?<![0-9])%d\s+%d\s+obj\b" % (number, generation))
+        match = None
+        for match in pattern.finditer(data):
+            pass
+        if match is None:
+            return None
+        start = match.end()
+    end = data.find(b"endobj", start)
+    return data[start:end if end >= 0 else None]
+
+
+def _count_from_page_tree(data):
+    """Nombre de pages lu dans l'arbre des pages, None si introuvable"""
+    position = data.rfind(b"/Root")
+    if position < 0:
+        return None
+    root = _ROOT_RE.match(data, position)
+    if not root:
+        return None
+    catalog = _object_body(data, int(root.group(1)), int(root.group(2)))
+    pages = catalog and _PAGES_RE.search(catalog)
+    if not pages:
+        return None
+    page_tree = _object_body(data, int(pages.group(1)), int(pages.group(2)))
+    count = page_tree and _COUNT_RE.search(page_tree)
+    return int(count.group(1)) if count else None
+
+
+def _count_with_pypdf(data):
+    from odoo.tools.pdf import PdfFileReader
+
+    return len(PdfFileReader(io.BytesIO(data), strict=False).pages)
+
+
+def count_pages(data):
+    """
+    Nombre de pages du PDF data (bytes).
+
+    Returns:
+        int: Nombre de pages, None si le PDF est illisible
+    """
+    count = _count_from_page_tree(data)
+    if count:
+        return count
+    try:
+        return _count_with_pypdf(data) or None
+    except Exception as e:
+        _logger.warning(f"PDF illisible, nombre de pages inconnu: {e}")
+        return None
+
+
+def count_pages_file(path):
+    """Nombre de pages d'un fichier PDF sur disque"""
+    with open(path, "rb") as pdf_file:
+        return count_pages(pdf_file.read())
+
+
+def content_key(data):
+    """Empreinte SHA-1 du PDF, sans les dates de création/modification ni /ID"""
+    return hashlib.sha1(_VOLATILE_RE.sub(b"", data)).hexdigest()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+PDF de contrat factice
+----------------------
+make_pdf produit un PDF texte valide, sans wkhtmltopdf, pour les jeux de
+données de charge et les tests.
+"""
+
+
+def make_pdf(page_count, lines_per_page=40):
+    """
+    PDF valide de page_count pages de texte, avec une table xref classique
+    (comme ceux produits par wkhtmltopdf).
+    """
+    objects = [
+        b"<</Type /Catalog /Pages 2 0 R>>",
+        None,  # Arbre des pages, complété une fois les pages numérotées
+        b"<</Type /Font /Subtype /Type1 /BaseFont /Helvetica>>",
+    ]
+    kids = []
+    for page in range(page_count):
+        text = b"".join(
+            b"BT /F1 10 Tf 40 %d Td (Page %d - ligne %d du contrat de location) Tj ET\n"
+            % (800 - 18 * line, page + 1, line + 1)
+            for line in range(lines_per_page)
+        )
+        objects.append(b"<</Length %d>>\nstream\n%s\nendstream" % (len(text), text))
+        content_number = len(objects)
+        objects.append(
+            b"<</Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources <</Font <</F1 3 0 R>>>> /Contents %d 0 R>>" % content_number
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<</Type /Pages /Kids [%s] /Count %d>>" % (b" ".join(kids), page_count)
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<</Size %d /Root 1 0 R>>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(output)
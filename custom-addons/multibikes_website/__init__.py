@@ -2,4 +2,5 @@
 """Imports for multibikes_website module."""
 from . import models
 from . import controllers
-from . import wizards
\ No newline at end of file
+from . import wizards
+from . import cli
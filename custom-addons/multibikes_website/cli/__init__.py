@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+"""Commandes odoo-bin du module multibikes_website."""
+from . import load_data
@@ -5,6 +5,8 @@ from odoo.http import request
 from odoo.addons.website_sale_renting.controllers.main import WebsiteSaleRenting
 from datetime import timedelta
 
+from ..tools import availability_metrics
+
 
 class WebsiteSaleRentingCustom(WebsiteSaleRenting):
 
@@ -33,6 +35,46 @@ class WebsiteSaleRentingCustom(WebsiteSaleRenting):
             "renting_minimal_time": {"duration": "1", "unit": "hour"},
         }
 
+    @http.route(
+        "/multibikes/availability/metrics",
+        type="http",
+        auth="user",
+        methods=["GET"],
+    )
+    def availability_metrics(self):
+        """Return availability timing metrics of the current worker.
+
+        Restricted to administrators. Each worker keeps its own metrics:
+        count, mean, max and p50/p95/p99 durations per stage of
+        ProductProduct._get_availability_intervals.
+
+        :rtype: JSON response
+        """
+        if not request.env.user._is_system():
+            raise request.not_found()
+        return request.make_json_response(availability_metrics.snapshot())
+
+    @http.route(
+        "/multibikes/availability/metrics/reset",
+        type="http",
+        auth="user",
+        methods=["POST"],
+        csrf=True,
+    )
+    def availability_metrics_reset(self):
+        """Reset the availability metrics of the current worker.
+
+        Restricted to administrators, POST only with a valid CSRF token.
+
+        :return: the metrics as they were before the reset
+        :rtype: JSON response
+        """
+        if not request.env.user._is_system():
+            raise request.not_found()
+        data = availability_metrics.snapshot()
+        availability_metrics.reset()
+        return request.make_json_response(data)
+
     def _get_rental_periods(self):
         """Get rental periods data for the next 3 years.
 
@@ -8,3 +8,5 @@ from . import product_template
 from . import product_product
 from . import stock_warehouse
 from . import stock_picking
+from . import mb_failed_transfer_digest
+from . import ir_http
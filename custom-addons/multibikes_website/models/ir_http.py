@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+"""Model Ir Http for multibikes_website module."""
+from odoo import models
+from odoo.http import request
+
+from ..tools import availability_log
+
+
+class IrHttp(models.AbstractModel):
+    _inherit = "ir.http"
+
+    @classmethod
+    def _post_dispatch(cls, response):
+        """Émet une seule synthèse des calculs de disponibilité par requête"""
+        super()._post_dispatch(response)
+        availability_log.flush_request_summary(request.env)
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Model MBFailedTransferDigest for multibikes_website module."""
+import hashlib
+import logging
+
+from psycopg2.errors import UniqueViolation
+
+from odoo import api, fields, models
+from odoo.tools import mute_logger
+
+_logger = logging.getLogger(__name__)
+
+
+class MBFailedTransferDigest(models.Model):
+    """
+    Digest des notifications de transferts ratés
+    --------------------------------------------
+    Un enregistrement par (ensemble de transferts ratés, jour). Il permet de ne
+    notifier les gestionnaires de stock qu'une seule fois tant que l'ensemble
+    des transferts en échec ne change pas.
+    """
+
+    _name = "mb.failed.transfer.digest"
+    _description = "Digest des notifications de transferts ratés"
+    _order = "digest_date desc, id desc"
+
+    name = fields.Char(string="Résumé", required=True)
+    digest_date = fields.Date(
+        string="Date du digest",
+        required=True,
+        index=True,
+        default=fields.Date.context_today,
+    )
+    digest_hash = fields.Char(
+        string="Empreinte",
+        required=True,
+        index=True,
+        help="Empreinte de l'ensemble des transferts ratés notifiés",
+    )
+    picking_ids = fields.Many2many(
+        "stock.picking",
+        string="Transferts ratés",
+        readonly=True,
+    )
+    picking_count = fields.Integer(string="Nombre de transferts", readonly=True)
+    notified_user_count = fields.Integer(
+        string="Gestionnaires notifiés", readonly=True
+    )
+
+    _sql_constraints = [
+        (
+            "digest_hash_date_unique",
+            "UNIQUE(digest_hash, digest_date)",
+            "Un digest existe déjà pour ces transferts à cette date.",
+        ),
+    ]
+
+    @api.model
+    def _compute_digest_hash(self, picking_ids):
+        """Calcule l'empreinte d'un ensemble d'IDs de transferts (ordre ignoré)"""
+        key = ",".join(str(picking_id) for picking_id in sorted(set(picking_ids)))
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @api.model
+    def _find_digest(self, digest_hash, digest_date=None):
+        """Retourne le digest existant pour cette empreinte et cette date"""
+        return self.search(
+            [
+                ("digest_hash", "=", digest_hash),
+                ("digest_date", "=", digest_date or fields.Date.context_today(self)),
+            ],
+            limit=1,
+        )
+
+    @api.model
+    def _claim_digest(self, digest_hash, digest_date, vals):
+        """
+        Crée le digest de (digest_hash, digest_date) s'il n'existe pas encore
+
+        L'insertion se fait dans un savepoint : si une détection concurrente a
+        déjà créé le même digest, la violation d'unicité est absorbée et
+        l'ensemble est considéré comme déjà notifié.
+
+        Returns:
+            mb.failed.transfer.digest: le digest créé, ou un recordset vide si
+            l'ensemble a déjà été notifié ce jour-là
+        """
+        if self._find_digest(digest_hash, digest_date):
+            return self.browse()
+        try:
+            with mute_logger("odoo.sql_db"), self.env.cr.savepoint():
+                return self.create(
+                    dict(vals, digest_hash=digest_hash, digest_date=digest_date)
+                )
+        except UniqueViolation:
+            _logger.info("📧 Digest %s déjà créé par une autre détection", digest_hash)
+            return self.browse()
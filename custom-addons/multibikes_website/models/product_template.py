@@ -6,6 +6,7 @@ from odoo import models
 from odoo.tools import format_amount
 from odoo.http import request
 from odoo.addons.sale_renting.models.product_pricing import PERIOD_RATIO
+from ..tools import availability_kernel, availability_log
 
 _logger = logging.getLogger(__name__)
 
@@ -183,7 +184,9 @@ class ProductTemplate(models.Model):
                 }
             )
 
-        _logger.info(
+        availability_log.detail(
+            _logger,
+            self.env,
             "Valeur finale de free_qty pour le produit %s: %s",
             product_or_template.name,
             free_qty,
@@ -217,44 +220,31 @@ class ProductTemplate(models.Model):
         Calcule la quantité minimale disponible sur une période donnée
         en tenant compte de toutes les sous-périodes retournées par _get_availabilities
         """
-        availabilities = product_or_template._get_availabilities(
-            from_date=start_date, to_date=end_date, warehouse_id=False, with_cart=True
-        )
+        if product_or_template.is_product_variant:
+            # Intervalles de bout en bout, sans passer par les dictionnaires
+            availabilities = product_or_template._get_availability_intervals(
+                start_date, end_date, warehouse_id=False, with_cart=True
+            )
+        else:
+            availabilities = product_or_template._get_availabilities(
+                from_date=start_date,
+                to_date=end_date,
+                warehouse_id=False,
+                with_cart=True,
+            )
 
         if not availabilities:
             return 0
 
-        min_qty = None
-
-        # Parcourir toutes les périodes et trouver celles qui chevauchent
-        for availability in availabilities:
-            period_start = availability["start"]
-            period_end = availability["end"]
-
-            # Calculer la zone de chevauchement
-            overlap_start = max(period_start, start_date)
-            overlap_end = min(period_end, end_date)
-
-            # S'il y a un chevauchement
-            if overlap_start < overlap_end:
-                quantity = int(availability.get("quantity_available", 0))
-
-                if min_qty is None:
-                    min_qty = quantity  # Premier résultat
-                else:
-                    min_qty = min(min_qty, quantity)
-
-                _logger.info(
-                    "Chevauchement trouvé: %s à %s, quantité: %s",
-                    overlap_start,
-                    overlap_end,
-                    quantity,
-                )
+        # Quantité minimale parmi les périodes qui chevauchent la fenêtre
+        min_qty = availability_kernel.min_quantity_over_window(
+            availabilities, start_date, end_date
+        )
 
         # Si aucun chevauchement trouvé
         if min_qty is None:
             _logger.warning(
-                ("Aucun chevauchement trouvé entre les périodes disponibles et %s-%s"),
+                "Aucun chevauchement trouvé entre les périodes disponibles et %s-%s",
                 start_date,
                 end_date,
             )
@@ -8,6 +8,15 @@ from odoo.exceptions import UserError, ValidationError, AccessError, MissingErro
 
 _logger = logging.getLogger(__name__)
 
+# Nombre de transferts réservés ensemble lors d'une relance
+RETRY_BATCH_SIZE = 50
+
+# États dans lesquels un transfert de période peut être considéré en échec
+FAILURE_CHECK_STATES = ("draft", "waiting", "confirmed", "partially_available")
+
+# Tolérance (en heures) après la date programmée avant de considérer un retard
+FAILURE_TOLERANCE_HOURS = 2
+
 
 class StockPicking(models.Model):
     _inherit = "stock.picking"
@@ -40,103 +49,146 @@ class StockPicking(models.Model):
         store=True,
     )
 
+    # Calculé à la demande (non stocké) : le texte n'est construit que lorsqu'il
+    # est affiché, pas à chaque écriture de mouvement
     failed_product_details = fields.Text(
         string="Détails des échecs produits",
         help="Liste des produits qui n'ont pas pu être transférés avec les quantités",
         compute="_compute_failed_product_details",
-        store=True,
     )
 
     # === Champs calculés pour l'analyse des échecs ===
 
+    # Les dépendances se limitent volontairement à l'état des mouvements : une
+    # réservation partielle ou manquante se traduit toujours par un état
+    # confirmed/partially_available du mouvement, ce qui évite de recalculer
+    # tous les transferts à chaque écriture de move line (livraisons/retours).
     @api.depends(
-        "move_ids",
+        "is_period_transfer",
+        "state",
+        "scheduled_date",
         "move_ids.state",
         "move_ids.product_uom_qty",
-        "move_ids.move_line_ids",
-        "move_ids.move_line_ids.qty_done",
-        "state",
     )
     def _compute_has_failed_products(self):
         """Détermine si le transfert a des produits en échec"""
-        for picking in self:
-            if not picking.is_period_transfer:
-                picking.has_failed_products = False
-                continue
-
-            has_failures = False
-
-            if picking.state in [
-                "draft",
-                "waiting",
-                "confirmed",
-                "partially_available",
-            ]:
-                # Vérifier si certains mouvements n'ont pas assez de stock réservé
-                for move in picking.move_ids:
-                    if move.state not in ["done", "cancel"]:
-                        # Calculer la quantité effectivement réservée via les move_lines
-                        reserved_qty = sum(move.move_line_ids.mapped("quantity"))
-                        if move.product_uom_qty > reserved_qty:
-                            has_failures = True
-                            break
-
-                # Ou si le transfert est en retard
-                if not has_failures and picking.scheduled_date:
-                    now = fields.Datetime.now()
-                    if picking.scheduled_date < now - timedelta(hours=2):
-                        has_failures = True
-
-            picking.has_failed_products = has_failures
+        pickings_to_check = self.filtered(
+            lambda p: p.is_period_transfer and p.state in FAILURE_CHECK_STATES
+        )
+        (self - pickings_to_check).has_failed_products = False
+        if not pickings_to_check:
+            return
+
+        shortages = pickings_to_check._get_move_shortages()
+        cutoff_datetime = fields.Datetime.now() - timedelta(
+            hours=FAILURE_TOLERANCE_HOURS
+        )
+
+        for picking in pickings_to_check:
+            # Certains mouvements n'ont pas assez de stock réservé,
+            # ou le transfert est en retard
+            picking.has_failed_products = bool(
+                shortages.get(picking.id)
+                or (picking.scheduled_date and picking.scheduled_date < cutoff_datetime)
+            )
 
     @api.depends(
-        "move_ids",
+        "is_period_transfer",
+        "scheduled_date",
         "move_ids.state",
         "move_ids.product_uom_qty",
-        "move_ids.move_line_ids",
-        "move_ids.move_line_ids.qty_done",
+        "move_ids.move_line_ids.quantity",
     )
     def _compute_failed_product_details(self):
         """Calcule les détails des produits en échec"""
-        for picking in self:
-            if not picking.is_period_transfer:
-                picking.failed_product_details = ""
-                continue
-
-            failed_details = []
-
-            for move in picking.move_ids:
-                if move.state not in ["done", "cancel"]:
-                    qty_expected = move.product_uom_qty
+        period_pickings = self.filtered("is_period_transfer")
+        (self - period_pickings).failed_product_details = ""
+        if not period_pickings:
+            return
 
-                    # Quantité réservée = somme des quantités dans les move_lines
-                    qty_reserved = sum(move.move_line_ids.mapped("quantity"))
+        shortages = period_pickings._get_move_shortages()
+        products = self.env["product.product"].browse(
+            {row["product_id"] for rows in shortages.values() for row in rows}
+        )
+        products.fetch(["name", "default_code"])
+        now = fields.Datetime.now()
 
-                    # Quantité effectivement faite =
-                    # somme des qty_done dans les move_lines
-                    qty_done = sum(move.move_line_ids.mapped("qty_done"))
+        for picking in period_pickings:
+            failed_details = []
 
-                    if qty_expected > qty_reserved:
-                        shortage = qty_expected - qty_reserved
-                        failed_details.append(
-                            f"• {move.product_id.name}"
-                            f" (Réf: {move.product_id.default_code or 'N/A'}): "
-                            f"Manque {shortage} sur {qty_expected} attendues"
-                            f" (réservé: {qty_reserved}, fait: {qty_done})"
-                        )
+            for row in shortages.get(picking.id, []):
+                product = self.env["product.product"].browse(row["product_id"])
+                shortage = row["product_uom_qty"] - row["reserved"]
+                failed_details.append(
+                    f"• {product.name}"
+                    f" (Réf: {product.default_code or 'N/A'}): "
+                    f"Manque {shortage} sur {row['product_uom_qty']} attendues"
+                    f" (réservé: {row['reserved']}, fait: {row['done']})"
+                )
 
             # Ajouter info sur le retard si applicable
             if picking.scheduled_date and not failed_details:
-                now = fields.Datetime.now()
-                if picking.scheduled_date < now - timedelta(hours=2):
+                if picking.scheduled_date < now - timedelta(
+                    hours=FAILURE_TOLERANCE_HOURS
+                ):
                     delay_hours = (now - picking.scheduled_date).total_seconds() / 3600
                     failed_details.append(
                         f"⚠️ Transfert en retard de {delay_hours:.1f} heures"
                     )
 
-            picking.failed_product_details = (
-                "\n".join(failed_details) if failed_details else ""
+            picking.failed_product_details = "\n".join(failed_details)
+
+    def _get_move_shortages(self):
+        """
+        Récupère en une seule requête les mouvements en manque de réservation
+
+        Returns:
+            dict: {picking_id: [{"move_id", "product_id", "product_uom_qty",
+            "reserved", "done"}, ...]} pour les mouvements non terminés dont la
+            quantité demandée dépasse la quantité réservée
+        """
+        picking_ids = [picking_id for picking_id in self.ids if picking_id]
+        if not picking_ids:
+            return {}
+
+        self.env["stock.move"].flush_model(
+            ["picking_id", "state", "product_id", "product_uom_qty"]
+        )
+        self.env["stock.move.line"].flush_model(["move_id", "quantity", "picked"])
+
+        self.env.cr.execute(
+            """
+            SELECT sm.picking_id,
+                   sm.id,
+                   sm.product_id,
+                   sm.product_uom_qty,
+                   COALESCE(SUM(sml.quantity), 0) AS reserved,
+                   COALESCE(SUM(sml.quantity) FILTER (WHERE sml.picked), 0) AS done
+            FROM stock_move sm
+            LEFT JOIN stock_move_line sml ON sml.move_id = sm.id
+            WHERE sm.picking_id IN %s
+            AND sm.state NOT IN ('done', 'cancel')
+            GROUP BY sm.id
+            HAVING sm.product_uom_qty > COALESCE(SUM(sml.quantity), 0)
+            ORDER BY sm.picking_id, sm.id
+        """,
+            (tuple(picking_ids),),
+        )
+
+        shortages = {}
+        for picking_id, move_id, product_id, qty, reserved, done in (
+            self.env.cr.fetchall()
+        ):
+            shortages.setdefault(picking_id, []).append(
+                {
+                    "move_id": move_id,
+                    "product_id": product_id,
+                    "product_uom_qty": qty,
+                    "reserved": reserved,
+                    "done": done,
+                }
             )
+        return shortages
 
     # === Méthodes de détection des transferts ratés ===
 
@@ -154,14 +206,13 @@ class StockPicking(models.Model):
         now = fields.Datetime.now()
 
         # Définir la tolérance (par exemple 2 heures après l'heure programmée)
-        tolerance_hours = 2
-        cutoff_datetime = now - timedelta(hours=tolerance_hours)
+        cutoff_datetime = now - timedelta(hours=FAILURE_TOLERANCE_HOURS)
 
         # Rechercher les transferts automatiques potentiellement ratés
         domain = [
             ("is_period_transfer", "=", True),  # Transferts de période
             ("scheduled_date", "<=", cutoff_datetime),  # Date programmée dépassée
-            ("state", "in", ["draft", "waiting", "confirmed", "partially_available"]),
+            ("state", "in", list(FAILURE_CHECK_STATES)),
         ]
 
         failed_pickings = self.search(domain)
@@ -320,6 +371,10 @@ class StockPicking(models.Model):
         """
         Méthode privée pour notifier les transferts ratés
 
+        Les notifications sont dédupliquées via mb.failed.transfer.digest :
+        un seul lot d'activités est créé par (ensemble de transferts, jour),
+        les détections suivantes avec le même ensemble sont ignorées.
+
         Args:
             failed_transfer_ids (list): Liste des IDs des transferts ratés
         """
@@ -327,46 +382,64 @@ class StockPicking(models.Model):
             return
 
         try:
-            message_body = f"""
-            <p><strong>⚠️ Transferts de stock en échec détectés</strong></p>
-            <p>{len(failed_transfer_ids)}
-            transferts automatiques n'ont pas pu être exécutés:</p>
-            <ul>
-            """
-
+            Digest = self.env["mb.failed.transfer.digest"].sudo()
+            digest_hash = Digest._compute_digest_hash(failed_transfer_ids)
+            today = fields.Date.context_today(self)
             failed_pickings = self.browse(failed_transfer_ids)
-            for picking in failed_pickings:
-                message_body += (
-                    f"<li>{picking.name} - {picking.origin}"
-                    f" (prévu le {picking.scheduled_date})</li>"
-                )
 
-            message_body += """
-            </ul>
-            <p>Veuillez vérifier les stocks et traiter ces transferts.</p>
-            """
+            # Le digest est réservé avant de créer les activités : la contrainte
+            # d'unicité départage deux détections concurrentes, la seconde
+            # considère l'ensemble comme déjà notifié.
+            digest = Digest._claim_digest(
+                digest_hash,
+                today,
+                {
+                    "name": f"{len(failed_transfer_ids)} transferts ratés",
+                    "picking_ids": [(6, 0, failed_pickings.ids)],
+                    "picking_count": len(failed_pickings),
+                },
+            )
+            if not digest:
+                _logger.info(
+                    "📧 Transferts ratés inchangés (%s), notification ignorée",
+                    len(failed_transfer_ids),
+                )
+                return
+
+            picking_items = [
+                f"<li>{picking.name} - {picking.origin}"
+                f" (prévu le {picking.scheduled_date})</li>"
+                for picking in failed_pickings
+            ]
+            message_body = (
+                "<p><strong>⚠️ Transferts de stock en échec détectés</strong></p>"
+                f"<p>{len(failed_transfer_ids)}"
+                " transferts automatiques n'ont pas pu être exécutés:</p>"
+                f"<ul>{''.join(picking_items)}</ul>"
+                "<p>Veuillez vérifier les stocks et traiter ces transferts.</p>"
+            )
 
             # Créer une activité pour les gestionnaires de stock
             admin_users = self.env["res.users"].search(
                 [("groups_id", "in", [self.env.ref("stock.group_stock_manager").id])]
             )
+            activity_type_id = self.env.ref("mail.mail_activity_data_todo").id
 
-            for admin in admin_users:
-                self.env["mail.activity"].create(
+            self.env["mail.activity"].create(
+                [
                     {
                         "summary": "🚨 Transferts de stock en échec",
                         "note": message_body,
                         "res_model": "stock.picking",
-                        "res_id": (
-                            failed_pickings[0].id if failed_pickings else admin.id
-                        ),
+                        "res_id": failed_pickings[0].id,
                         "user_id": admin.id,
-                        "activity_type_id": self.env.ref(
-                            "mail.mail_activity_data_todo"
-                        ).id,
-                        "date_deadline": fields.Date.today(),
+                        "activity_type_id": activity_type_id,
+                        "date_deadline": today,
                     }
-                )
+                    for admin in admin_users
+                ]
+            )
+            digest.notified_user_count = len(admin_users)
 
             _logger.info(
                 "📧 Notifications envoyées à %s administrateurs", len(admin_users)
@@ -379,15 +452,21 @@ class StockPicking(models.Model):
             raise  # Re-raise pour ne pas masquer les erreurs critiques
 
     @api.model
-    def attempt_retry_failed_transfers(self, failed_transfer_ids=None):
+    def attempt_retry_failed_transfers(self, failed_transfer_ids=None, batch_size=None):
         """
         Tente de relancer automatiquement les transferts ratés
 
+        Les transferts sont réservés par lots (action_assign sur un recordset),
+        chaque lot dans son propre savepoint. Si un lot échoue, il est coupé en
+        deux récursivement pour isoler le ou les transferts fautifs sans
+        pénaliser les autres.
+
         Args:
             failed_transfer_ids (list, optional): Liste spécifique d'IDs à traiter.
+            batch_size (int, optional): Taille des lots de réservation.
 
         Returns:
-            dict: Résumé des actions effectuées
+            dict: Résumé des actions effectuées, avec le résultat par transfert
         """
         if failed_transfer_ids is None:
             failed_transfer_ids = self.detect_failed_transfers()
@@ -403,47 +482,95 @@ class StockPicking(models.Model):
             "💡 Tentative de relance de %s transferts", len(failed_transfer_ids)
         )
 
+        failed_pickings = self.browse(failed_transfer_ids).exists()
+        batch_size = batch_size or RETRY_BATCH_SIZE
+        outcomes = {}
+
+        for start in range(0, len(failed_pickings), batch_size):
+            self._retry_assign_batch(
+                failed_pickings[start:start + batch_size], outcomes
+            )
+
         success_count = 0
         still_failed_count = 0
         results = []
 
-        failed_pickings = self.browse(failed_transfer_ids)
-
         for picking in failed_pickings:
-            try:
-                # Tenter de vérifier la disponibilité
-                picking.action_assign()
-
-                # Si maintenant disponible, noter le succès
-                if picking.state == "assigned":
-                    success_count += 1
-                    results.append(f"✅ {picking.name}: réassigné avec succès")
-                    _logger.info("✅ Transfert %s réparé automatiquement", picking.name)
-                else:
-                    still_failed_count += 1
-                    results.append(
-                        f"❌ {picking.name}: toujours bloqué ({picking.state})"
-                    )
-                    _logger.warning("❌ Transfert %s toujours en échec", picking.name)
-
-            except Exception as e:
+            outcome = outcomes[picking.id]
+            if outcome["status"] == "assigned":
+                success_count += 1
+                results.append(f"✅ {picking.name}: réassigné avec succès")
+                _logger.info("✅ Transfert %s réparé automatiquement", picking.name)
+            elif outcome["status"] == "blocked":
+                still_failed_count += 1
+                results.append(
+                    f"❌ {picking.name}: toujours bloqué ({outcome['state']})"
+                )
+                _logger.warning("❌ Transfert %s toujours en échec", picking.name)
+            else:
                 still_failed_count += 1
-                results.append(f"💥 {picking.name}: erreur lors de la relance - {e}")
+                results.append(
+                    f"💥 {picking.name}: erreur lors de la relance - {outcome['error']}"
+                )
                 _logger.error(
-                    "💥 Erreur lors de la relance de %s : %s", picking.name, e
+                    "💥 Erreur lors de la relance de %s : %s",
+                    picking.name,
+                    outcome["error"],
                 )
 
         summary = {
             "success": success_count,
             "failed": still_failed_count,
             "details": results,
+            "outcomes": outcomes,
             "message": f"{success_count} transferts relancés,"
             f" {still_failed_count} toujours en échec",
         }
 
-        _logger.info("💡 Relance terminée: %s", {summary["message"]})
+        _logger.info("💡 Relance terminée: %s", summary["message"])
         return summary
 
+    def _retry_assign_batch(self, pickings, outcomes):
+        """
+        Réserve un lot de transferts dans un savepoint, avec bissection en cas d'erreur
+
+        Args:
+            pickings: Recordset stock.picking à réserver
+            outcomes (dict): Résultats par ID de transfert, complété sur place
+        """
+        if not pickings:
+            return
+
+        try:
+            with self.env.cr.savepoint():
+                pickings.action_assign()
+        except Exception as e:  # pylint: disable=broad-except
+            if len(pickings) == 1:
+                outcomes[pickings.id] = {
+                    "name": pickings.name,
+                    "status": "error",
+                    "state": pickings.state,
+                    "error": str(e),
+                }
+                return
+
+            _logger.debug(
+                "Lot de %s transferts en erreur, découpage pour isoler l'échec",
+                len(pickings),
+            )
+            middle = len(pickings) // 2
+            self._retry_assign_batch(pickings[:middle], outcomes)
+            self._retry_assign_batch(pickings[middle:], outcomes)
+            return
+
+        for picking in pickings:
+            outcomes[picking.id] = {
+                "name": picking.name,
+                "status": "assigned" if picking.state == "assigned" else "blocked",
+                "state": picking.state,
+                "error": False,
+            }
+
     # === Protection avec clause d'urgence ===
 
     def _check_period_transfer_immutability(self):
@@ -1,2 +1,10 @@
 from . import test_stock_warehouse
 from . import test_controller_main
+from . import test_availability_kernel
+from . import test_benchmark_intervals
+from . import test_availability_log
+from . import test_availability_metrics
+from . import test_query_budgets
+from . import test_load_data
+from . import test_benchmark_availability
+from . import test_stock_picking
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""Tests for the availability kernel of multibikes_website module."""
+import random
+from datetime import datetime, timedelta
+from unittest import skipUnless
+
+from odoo.tests.common import TransactionCase
+
+from odoo.addons.multibikes_website.tools import availability_kernel
+
+
+def _random_case(rng):
+    """Génère une fenêtre, des périodes d'origine et des mouvements aléatoires"""
+    origin = datetime(2025, 1, 1)
+    window_days = rng.randint(1, 240)
+    from_date = origin + timedelta(hours=rng.randint(0, 48))
+    to_date = from_date + timedelta(days=window_days)
+
+    # Périodes d'origine contiguës, parfois vides ou de longueur nulle
+    availabilities = []
+    cursor = from_date - timedelta(days=rng.randint(0, 3))
+    while cursor < to_date and len(availabilities) < 300:
+        end = cursor + timedelta(hours=rng.choice([0, 1, 6, 24, 72, 240]))
+        availabilities.append(
+            {
+                "start": cursor,
+                "end": end,
+                "quantity_available": rng.randint(-2, 40),
+            }
+        )
+        cursor = end + timedelta(hours=rng.choice([0, 0, 0, 5]))
+
+    def _moves(count):
+        moves = []
+        for _i in range(count):
+            move_date = from_date + timedelta(
+                minutes=rng.randint(-600, window_days * 24 * 60 + 600)
+            )
+            if rng.random() < 0.1:
+                move_date = move_date.strftime("%Y-%m-%d %H:%M:%S")
+            moves.append((move_date, float(rng.randint(0, 12))))
+        return moves
+
+    return {
+        "from_date": from_date,
+        "to_date": to_date,
+        "original_availabilities": availabilities,
+        "outgoing_moves": _moves(rng.randint(0, 150)),
+        "incoming_moves": _moves(rng.randint(0, 150)),
+        "winter_qty": float(rng.randint(0, 30)),
+    }
+
+
+class TestAvailabilityKernel(TransactionCase):
+    """Propriétés du noyau de disponibilité sur des données aléatoires."""
+
+    SEED = 20250601
+    CASES = 100
+
+    def _cases(self):
+        rng = random.Random(self.SEED)
+        for _i in range(self.CASES):
+            yield _random_case(rng)
+
+    def test_python_periods_cover_window(self):
+        """Les périodes ajustées sont triées, disjointes et dans la fenêtre."""
+        for case in self._cases():
+            result = availability_kernel.compute_adjusted_availabilities(
+                use_numpy=False, **case
+            )
+            for period in result:
+                self.assertLessEqual(case["from_date"], period["start"])
+                self.assertLess(period["start"], period["end"])
+                self.assertLessEqual(period["end"], case["to_date"])
+                self.assertGreaterEqual(period["quantity_available"], 0)
+            for previous, current in zip(result, result[1:]):
+                self.assertEqual(previous["end"], current["start"])
+
+    def test_python_matches_single_period_reference(self):
+        """Une seule période d'origine : quantité = base - hivernage cumulé."""
+        start = datetime(2025, 3, 1)
+        end = start + timedelta(days=10)
+        moves_out = [(start + timedelta(days=2), 3.0)]
+        moves_in = [(start + timedelta(days=5), 1.0)]
+        result = availability_kernel.compute_adjusted_availabilities(
+            start,
+            end,
+            [{"start": start, "end": end, "quantity_available": 10}],
+            moves_out,
+            moves_in,
+            4.0,
+            use_numpy=False,
+        )
+        self.assertEqual(
+            [period["quantity_available"] for period in result], [6.0, 9.0, 8.0]
+        )
+
+    @skipUnless(availability_kernel.numpy_available(), "NumPy non installé")
+    def test_numpy_matches_python(self):
+        """Le noyau NumPy donne exactement les mêmes périodes que Python."""
+        for case in self._cases():
+            self.assertEqual(
+                availability_kernel.compute_adjusted_availabilities(
+                    use_numpy=True, **case
+                ),
+                availability_kernel.compute_adjusted_availabilities(
+                    use_numpy=False, **case
+                ),
+            )
+
+    @skipUnless(availability_kernel.numpy_available(), "NumPy non installé")
+    def test_numpy_min_matches_python(self):
+        """Le minimum sur une fenêtre est identique avec et sans NumPy."""
+        rng = random.Random(self.SEED)
+        for case in self._cases():
+            availabilities = case["original_availabilities"]
+            start_date = case["from_date"] + timedelta(hours=rng.randint(-24, 240))
+            end_date = start_date + timedelta(hours=rng.randint(0, 2000))
+            self.assertEqual(
+                availability_kernel.min_quantity_over_window(
+                    availabilities, start_date, end_date, use_numpy=True
+                ),
+                availability_kernel.min_quantity_over_window(
+                    availabilities, start_date, end_date, use_numpy=False
+                ),
+            )
+
+    def test_min_without_overlap(self):
+        """Aucun chevauchement : None, quelle que soit l'implémentation."""
+        start = datetime(2025, 3, 1)
+        availabilities = [
+            {"start": start, "end": start + timedelta(days=1), "quantity_available": 3}
+        ]
+        self.assertIsNone(
+            availability_kernel.min_quantity_over_window(
+                availabilities,
+                start + timedelta(days=2),
+                start + timedelta(days=3),
+                use_numpy=False,
+            )
+        )
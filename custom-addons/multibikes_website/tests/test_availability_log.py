@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Tests for the availability logging helpers of multibikes_website module."""
+import logging
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase
+
+from odoo.addons.multibikes_website.tools import availability_log
+from odoo.addons.multibikes_website.tools.availability_kernel import (
+    AvailabilityInterval,
+)
+
+
+class TestAvailabilityLog(TransactionCase):
+    """Filtrage des logs de détail et synthèse par requête."""
+
+    def setUp(self):
+        super().setUp()
+        self.logger = logging.getLogger("odoo.addons.multibikes_website.test_log")
+        self.env["ir.config_parameter"].sudo().set_param(
+            availability_log.SAMPLE_RATE_PARAM, "0"
+        )
+
+    def test_detail_hidden_at_info_without_trace(self):
+        """Sans trace, les détails ne sont pas émis au niveau INFO."""
+        with self.assertNoLogs(self.logger, level="INFO"):
+            availability_log.detail(self.logger, self.env, "détail %s", 1)
+
+    def test_detail_emitted_with_trace_context(self):
+        """La clé de contexte de trace remonte les détails au niveau INFO."""
+        env = self.env(context=dict(self.env.context, mb_availability_trace=True))
+        with self.assertLogs(self.logger, level="INFO") as logs:
+            availability_log.detail(self.logger, env, "détail %s", 1)
+        self.assertEqual(logs.records[0].levelno, logging.INFO)
+
+    def test_summary_single_record(self):
+        """La synthèse produit un seul enregistrement avec compteurs et durées."""
+        env = self.env(context=dict(self.env.context, mb_availability_trace=True))
+        summary = availability_log.AvailabilitySummary(
+            self.logger, env, "availability.summary", product=42
+        )
+        with summary.timer("super"):
+            pass
+        summary.count(outgoing=2)
+        summary.count(outgoing=1, incoming=4)
+        with self.assertLogs(self.logger, level="INFO") as logs:
+            summary.emit()
+        self.assertEqual(len(logs.records), 1)
+        message = logs.records[0].getMessage()
+        for token in ("product=42", "outgoing=3", "incoming=4", "t_super=", "t_total="):
+            self.assertIn(token, message)
+
+    def test_summary_once_per_request(self):
+        """Les calculs d'une requête HTTP donnent une seule synthèse."""
+        env = self.env(context=dict(self.env.context, mb_availability_trace=True))
+        fake_request = SimpleNamespace(
+            httprequest=SimpleNamespace(path="/shop", headers={})
+        )
+        with patch.object(availability_log, "request", fake_request):
+            with self.assertNoLogs(self.logger, level="DEBUG"):
+                for product in (1, 2, 3):
+                    summary = availability_log.AvailabilitySummary(
+                        self.logger, env, "availability.summary", product=product
+                    )
+                    with summary.timer("super"):
+                        pass
+                    summary.count(outgoing=2)
+                    summary.emit()
+            with self.assertLogs(self.logger, level="INFO") as logs:
+                availability_log.flush_request_summary(env)
+                availability_log.flush_request_summary(env)
+        self.assertEqual(len(logs.records), 1)
+        message = logs.records[0].getMessage()
+        for token in ("path=/shop", "calls=3", "outgoing=6", "t_super=", "t_total="):
+            self.assertIn(token, message)
+
+    def test_trace_not_checked_when_info_disabled(self):
+        """La trace n'est pas évaluée si le logger n'émet pas au niveau INFO."""
+        self.logger.setLevel(logging.WARNING)
+        self.addCleanup(self.logger.setLevel, logging.NOTSET)
+        with patch.object(
+            availability_log, "is_trace_enabled", return_value=True
+        ) as trace_mock:
+            availability_log.detail(self.logger, self.env, "détail %s", 1)
+            self.assertFalse(availability_log.detail_enabled(self.logger, self.env))
+        trace_mock.assert_not_called()
+
+    def test_no_overlap_logged_as_warning(self):
+        """L'absence de chevauchement reste un WARNING, même sans trace."""
+        template_logger = logging.getLogger(
+            "odoo.addons.multibikes_website.models.product_template"
+        )
+        product = self.env["product.product"].create({"name": "Vélo test log"})
+        ProductTemplate = self.env["product.template"]
+        start = datetime(2025, 6, 1)
+        outside = AvailabilityInterval(datetime(2025, 1, 1), datetime(2025, 2, 1), 3)
+        with patch.object(
+            type(product), "_get_availability_intervals", return_value=[outside]
+        ), self.assertLogs(template_logger, level="WARNING") as logs:
+            quantity = ProductTemplate.calculate_min_availability_over_period(
+                product, start, start + timedelta(days=2)
+            )
+        self.assertEqual(quantity, 0)
+        self.assertEqual(logs.records[0].levelno, logging.WARNING)
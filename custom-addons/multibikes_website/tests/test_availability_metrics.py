@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Tests for the availability metrics of multibikes_website module."""
+import json
+
+from datetime import timedelta
+
+from odoo import fields, http
+from odoo.tests import HttpCase, new_test_user, tagged
+from odoo.tests.common import TransactionCase
+
+from odoo.addons.multibikes_website.tools import availability_metrics
+
+
+class TestAvailabilityMetrics(TransactionCase):
+    """Agrégation par worker des durées du calcul des disponibilités."""
+
+    def setUp(self):
+        super().setUp()
+        availability_metrics.reset()
+        self.addCleanup(availability_metrics.reset)
+
+    def test_percentiles_per_stage(self):
+        """Compteur et percentiles au rang le plus proche, par étape."""
+        for i in range(1, 101):
+            availability_metrics.record({"super": i / 1000, "total": i / 500})
+
+        stages = availability_metrics.snapshot()["stages"]
+        self.assertEqual(stages["super"]["count"], 100)
+        self.assertEqual(stages["super"]["p50_ms"], 50.0)
+        self.assertEqual(stages["super"]["p95_ms"], 95.0)
+        self.assertEqual(stages["super"]["p99_ms"], 99.0)
+        self.assertEqual(stages["super"]["max_ms"], 100.0)
+        self.assertEqual(stages["total"]["p50_ms"], 100.0)
+
+    def test_reset(self):
+        """La remise à zéro vide toutes les étapes."""
+        availability_metrics.record({"periods": 0.01})
+        availability_metrics.reset()
+        self.assertEqual(availability_metrics.snapshot()["stages"], {})
+
+    def test_dump_disabled_by_default(self):
+        """Sans intervalle configuré, rien n'est écrit dans le log serveur."""
+        self.env["ir.config_parameter"].sudo().set_param(
+            availability_metrics.DUMP_MINUTES_PARAM, "0"
+        )
+        availability_metrics.record({"periods": 0.01})
+        self.assertFalse(availability_metrics.maybe_dump(self.env))
+
+    def test_availabilities_feed_metrics(self):
+        """Un calcul de disponibilité alimente les métriques du worker."""
+        product = self.env["product.product"].create(
+            {"name": "Vélo métriques", "type": "consu", "rent_ok": True}
+        )
+        now = fields.Datetime.now()
+        product._get_availabilities(now, now + timedelta(days=30), False)
+        stages = availability_metrics.snapshot()["stages"]
+        self.assertEqual(stages["total"]["count"], 1)
+        self.assertIn("super", stages)
+
+
+@tagged("post_install", "-at_install")
+class TestAvailabilityMetricsEndpoint(HttpCase):
+    """Accès à l'endpoint JSON des métriques."""
+
+    URL = "/multibikes/availability/metrics"
+    RESET_URL = "/multibikes/availability/metrics/reset"
+
+    def test_admin_can_read_metrics(self):
+        self.authenticate("admin", "admin")
+        response = self.url_open(self.URL)
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertIn("stages", data)
+        self.assertIn("pid", data)
+
+    def test_non_admin_gets_not_found(self):
+        new_test_user(self.env, login="mb_metrics_user", groups="base.group_user")
+        self.authenticate("mb_metrics_user", "mb_metrics_user")
+        response = self.url_open(self.URL)
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_does_not_reset(self):
+        """Une lecture (GET), même avec reset=1, conserve les métriques."""
+        availability_metrics.record({"periods": 0.01})
+        self.addCleanup(availability_metrics.reset)
+        self.authenticate("admin", "admin")
+        response = self.url_open(f"{self.URL}?reset=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("periods", availability_metrics.snapshot()["stages"])
+
+    def test_reset_requires_csrf_token(self):
+        """La remise à zéro refuse un POST sans jeton CSRF."""
+        availability_metrics.record({"periods": 0.01})
+        self.addCleanup(availability_metrics.reset)
+        self.authenticate("admin", "admin")
+        response = self.url_open(self.RESET_URL, data={})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("periods", availability_metrics.snapshot()["stages"])
+
+    def test_admin_can_reset_metrics(self):
+        """Un POST avec jeton CSRF retourne les métriques puis les remet à zéro."""
+        availability_metrics.record({"periods": 0.01})
+        self.addCleanup(availability_metrics.reset)
+        self.authenticate("admin", "admin")
+        response = self.url_open(
+            self.RESET_URL, data={"csrf_token": http.Request.csrf_token(self)}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("periods", json.loads(response.content)["stages"])
+        self.assertEqual(availability_metrics.snapshot()["stages"], {})
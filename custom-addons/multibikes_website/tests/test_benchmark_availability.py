@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the availability computations of multibikes_website module.
+
+Exclu de la suite standard, à lancer avec :
+
+    odoo-bin -d <base> --test-tags mb_benchmark
+
+Variables d'environnement :
+
+- MB_BENCHMARK_OUTPUT : chemin du fichier JSON de résultats ;
+- MB_BENCHMARK_BASELINE : référence à comparer (par défaut le fichier
+  data/availability_benchmark_baseline.json du module) ;
+- MB_BENCHMARK_TOLERANCE : écart relatif toléré sur la médiane (0.5 = +50 %) ;
+- MB_BENCHMARK_WRITE_BASELINE=1 : écrit les résultats comme nouvelle référence.
+
+La référence versionnée donne pour chaque scénario une médiane mesurée
+(« source » : measured) ou un plafond initial (« source » : ceiling) tant
+qu'elle n'a pas été régénérée sur la machine de référence. Si un scénario
+mesuré n'y figure pas, le test échoue et indique comment la régénérer.
+
+Les scénarios « kernel_python » et « kernel_numpy » mesurent le noyau
+d'ajustement seul avec use_numpy=False puis True (ce dernier uniquement si
+NumPy est installé), sur les mêmes données.
+"""
+import json
+import logging
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+
+from odoo.addons.multibikes_website.tools import availability_kernel
+from odoo.addons.multibikes_website.tools.load_data import RentalLoadGenerator
+
+_logger = logging.getLogger(__name__)
+
+SEED = 20250601
+PRODUCT_COUNTS = (5, 25)
+WINDOW_DAYS = (7, 90, 365)
+# Nombre moyen de lignes de location confirmées par produit
+MOVE_DENSITIES = (0, 5, 20)
+# Transferts d'hivernage planifiés, pour que le noyau d'ajustement soit sollicité
+PERIOD_TRANSFERS = 200
+# Mouvements d'hivernage par jour de fenêtre pour les scénarios du noyau seul
+KERNEL_MOVES_PER_DAY = (1, 10)
+REPEAT = 3
+
+DEFAULT_TOLERANCE = 0.5
+BASELINE_DESCRIPTION = (
+    "Référence du benchmark de disponibilité (test mb_benchmark). Régénérer avec "
+    "MB_BENCHMARK_WRITE_BASELINE=1 sur la machine de référence."
+)
+BASELINE_PATH = os.path.join(
+    os.path.dirname(__file__), "data", "availability_benchmark_baseline.json"
+)
+
+
+def scenario_key(method, product_count, window_days, density):
+    return f"{method}/products={product_count}/window={window_days}d/moves={density}"
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Compare les médianes aux références et retourne les régressions.
+
+    Les scénarios absents de la référence sont ignorés.
+    """
+    regressions = []
+    for key, values in sorted(results.items()):
+        reference = baseline.get(key)
+        if not reference:
+            continue
+        limit = reference["median_ms"] * (1 + tolerance)
+        if values["median_ms"] > limit:
+            regressions.append(
+                {
+                    "scenario": key,
+                    "median_ms": values["median_ms"],
+                    "baseline_ms": reference["median_ms"],
+                    "limit_ms": round(limit, 3),
+                }
+            )
+    return regressions
+
+
+def missing_scenarios(results, baseline):
+    """Scénarios mesurés absents de la référence"""
+    return sorted(set(results) - set(baseline))
+
+
+def _kernel_case(rng, origin, window_days, moves_per_day):
+    """Périodes horaires d'origine et mouvements d'hivernage aléatoires"""
+    to_date = origin + timedelta(days=window_days)
+    availabilities = [
+        {
+            "start": origin + timedelta(hours=hour),
+            "end": origin + timedelta(hours=hour + 1),
+            "quantity_available": rng.randint(0, 40),
+        }
+        for hour in range(window_days * 24)
+    ]
+
+    def _moves():
+        return [
+            (
+                origin + timedelta(minutes=rng.randint(0, window_days * 24 * 60)),
+                float(rng.randint(1, 10)),
+            )
+            for _i in range(window_days * moves_per_day)
+        ]
+
+    return origin, to_date, availabilities, _moves(), _moves(), 20.0
+
+
+@tagged("-standard", "mb_benchmark")
+class TestBenchmarkAvailability(TransactionCase):
+    """
+    Durées de _get_availabilities et de calculate_min_availability_over_period
+    selon le nombre de produits, la longueur de la fenêtre et la densité de
+    mouvements, ainsi que du noyau seul avec et sans NumPy, comparées à une
+    référence stockée.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.generator = RentalLoadGenerator(cls.env, seed=SEED)
+        cls.products = cls.generator.create_products(max(PRODUCT_COUNTS), 0)
+        periods = cls.generator.create_periods(1)
+        cls.generator.create_period_transfers(
+            cls.products, periods, PERIOD_TRANSFERS, 0.0
+        )
+        cls.origin = datetime.combine(
+            fields.Date.today() + timedelta(days=1), datetime.min.time()
+        )
+
+    def _measure(self, func):
+        """Médiane et minimum (ms) sur REPEAT exécutions à cache vide"""
+        durations = []
+        queries = 0
+        for _i in range(REPEAT):
+            self.env.invalidate_all()
+            count0 = self.cr.sql_log_count
+            started = time.perf_counter()
+            func()
+            durations.append((time.perf_counter() - started) * 1000)
+            queries = self.cr.sql_log_count - count0
+        return {
+            "median_ms": round(statistics.median(durations), 3),
+            "min_ms": round(min(durations), 3),
+            "queries": queries,
+        }
+
+    def _add_moves(self, density, previous_density):
+        """Complète les commandes confirmées jusqu'à la densité demandée"""
+        missing = (density - previous_density) * len(self.products)
+        if missing > 0:
+            self.generator.create_rental_orders(
+                self.products, missing, lines_per_order=1, confirm_ratio=1.0
+            )
+
+    def _run_scenarios(self):
+        ProductTemplate = self.env["product.template"]
+        results = {}
+        previous_density = 0
+        for density in MOVE_DENSITIES:
+            self._add_moves(density, previous_density)
+            previous_density = density
+            for product_count in PRODUCT_COUNTS:
+                products = self.products[:product_count]
+                for window_days in WINDOW_DAYS:
+                    start = self.origin
+                    end = start + timedelta(days=window_days)
+
+                    def _availabilities(products=products, start=start, end=end):
+                        for product in products:
+                            product._get_availabilities(start, end, False)
+
+                    def _min_over_period(products=products, start=start, end=end):
+                        for product in products:
+                            ProductTemplate.calculate_min_availability_over_period(
+                                product, start, end
+                            )
+
+                    for method, func in (
+                        ("get_availabilities", _availabilities),
+                        ("min_availability", _min_over_period),
+                    ):
+                        key = scenario_key(method, product_count, window_days, density)
+                        results[key] = self._measure(func)
+        results.update(self._run_kernel_scenarios())
+        return results
+
+    def _run_kernel_scenarios(self):
+        """Noyau seul, implémentations Python et NumPy sur les mêmes données"""
+        implementations = [("kernel_python", False)]
+        if availability_kernel.numpy_available():
+            implementations.append(("kernel_numpy", True))
+
+        results = {}
+        rng = random.Random(SEED)
+        for window_days in WINDOW_DAYS:
+            for moves_per_day in KERNEL_MOVES_PER_DAY:
+                case = _kernel_case(rng, self.origin, window_days, moves_per_day)
+                reference = None
+                for method, use_numpy in implementations:
+
+                    def _kernel(case=case, use_numpy=use_numpy):
+                        return availability_kernel.compute_adjusted_intervals(
+                            *case, use_numpy=use_numpy
+                        )
+
+                    key = scenario_key(method, 1, window_days, moves_per_day)
+                    results[key] = self._measure(_kernel)
+                    output = _kernel()
+                    if reference is None:
+                        reference = output
+                    else:
+                        self.assertEqual(output, reference, key)
+        return results
+
+    def _load_baseline(self):
+        path = os.environ.get("MB_BENCHMARK_BASELINE", BASELINE_PATH)
+        if not os.path.exists(path):
+            return path, {}
+        with open(path, encoding="utf-8") as baseline_file:
+            return path, json.load(baseline_file).get("results", {})
+
+    def _write_baseline(self, path, results):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as baseline_file:
+            json.dump(
+                {"description": BASELINE_DESCRIPTION, "results": results},
+                baseline_file,
+                indent=2,
+                sort_keys=True,
+            )
+
+    def test_availability_benchmark(self):
+        results = self._run_scenarios()
+        baseline_path, baseline = self._load_baseline()
+        tolerance = float(
+            os.environ.get("MB_BENCHMARK_TOLERANCE", DEFAULT_TOLERANCE)
+        )
+        regressions = compare_to_baseline(results, baseline, tolerance)
+
+        report = {
+            "generated_at": fields.Datetime.to_string(fields.Datetime.now()),
+            "seed": SEED,
+            "numpy": availability_kernel.numpy_available(),
+            "repeat": REPEAT,
+            "tolerance": tolerance,
+            "baseline": baseline_path,
+            "results": results,
+            "regressions": regressions,
+        }
+        output = os.environ.get("MB_BENCHMARK_OUTPUT")
+        if output:
+            with open(output, "w", encoding="utf-8") as output_file:
+                json.dump(report, output_file, indent=2, sort_keys=True)
+        _logger.info("⏱️ Benchmark disponibilités : %s", json.dumps(report))
+
+        if os.environ.get("MB_BENCHMARK_WRITE_BASELINE") == "1":
+            self._write_baseline(baseline_path, results)
+            return
+
+        missing = missing_scenarios(results, baseline)
+        if missing:
+            self.fail(
+                f"Référence absente ou incomplète ({baseline_path}) pour"
+                f" {len(missing)} scénario(s), dont {missing[0]}. Générer la"
+                " référence avec MB_BENCHMARK_WRITE_BASELINE=1 sur la machine"
+                " de référence."
+            )
+
+        self.assertFalse(
+            regressions,
+            "Régressions par rapport à la référence :\n"
+            + "\n".join(
+                f"{r['scenario']} : {r['median_ms']} ms > {r['limit_ms']} ms"
+                for r in regressions
+            ),
+        )
+
+
+@tagged("post_install", "-at_install")
+class TestBenchmarkBaseline(TransactionCase):
+    """Comparaison à la référence, exécutée avec la suite standard."""
+
+    def test_compare_to_baseline(self):
+        """Seules les médianes au-delà de la tolérance sont des régressions."""
+        baseline = {"a": {"median_ms": 10.0}, "b": {"median_ms": 10.0}}
+        results = {
+            "a": {"median_ms": 14.0},
+            "b": {"median_ms": 16.0},
+            "c": {"median_ms": 99.0},
+        }
+        regressions = compare_to_baseline(results, baseline, 0.5)
+        self.assertEqual([r["scenario"] for r in regressions], ["b"])
+        self.assertEqual(missing_scenarios(results, baseline), ["c"])
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of the interval representation on the availability entry points."""
+import logging
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+
+from odoo.addons.multibikes_website.tools.availability_kernel import (
+    min_quantity_over_window,
+)
+from odoo.addons.multibikes_website.tools.load_data import RentalLoadGenerator
+
+_logger = logging.getLogger(__name__)
+
+PRODUCT_COUNT = 20
+WINDOW_DAYS = 365
+PERIOD_TRANSFERS = 400
+REPEAT = 3
+
+
+def _measure(func):
+    """Retourne (résultat, pic mémoire en octets, meilleure durée en secondes)"""
+    best = None
+    for _index in range(REPEAT):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    func()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak, best
+
+
+@tagged("-standard", "mb_benchmark")
+class TestBenchmarkIntervals(TransactionCase):
+    """
+    Compare, sur les points d'entrée réels, le calcul de la quantité minimale
+    en passant par les dictionnaires de _get_availabilities (ancien chemin) et
+    par les AvailabilityInterval de bout en bout (calculate_min_availability_
+    over_period).
+
+    Exclu de la suite standard, à lancer avec --test-tags mb_benchmark.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        generator = RentalLoadGenerator(cls.env, seed=30)
+        cls.products = generator.create_products(PRODUCT_COUNT, 0)
+        periods = generator.create_periods(1)
+        # Transferts d'hivernage planifiés : le noyau d'ajustement est sollicité
+        generator.create_period_transfers(
+            cls.products, periods, PERIOD_TRANSFERS, 0.0
+        )
+        generator.create_rental_orders(
+            cls.products, 5 * PRODUCT_COUNT, lines_per_order=1, confirm_ratio=1.0
+        )
+        cls.start = datetime.combine(
+            fields.Date.today() + timedelta(days=1), datetime.min.time()
+        )
+        cls.end = cls.start + timedelta(days=WINDOW_DAYS)
+
+    def _dict_path(self):
+        return [
+            min_quantity_over_window(
+                product._get_availabilities(
+                    self.start, self.end, False, with_cart=True
+                ),
+                self.start,
+                self.end,
+            )
+            for product in self.products
+        ]
+
+    def _interval_path(self):
+        ProductTemplate = self.env["product.template"]
+        return [
+            ProductTemplate.calculate_min_availability_over_period(
+                product, self.start, self.end
+            )
+            for product in self.products
+        ]
+
+    def test_min_availability_entry_points(self):
+        dict_result, dict_peak, dict_time = _measure(self._dict_path)
+        interval_result, interval_peak, interval_time = _measure(self._interval_path)
+
+        _logger.info(
+            "Benchmark quantité minimale (%s produits, %s jours) - dicts: %.0f Ko,"
+            " %.1f ms | intervalles: %.0f Ko, %.1f ms",
+            PRODUCT_COUNT,
+            WINDOW_DAYS,
+            dict_peak / 1024,
+            dict_time * 1000,
+            interval_peak / 1024,
+            interval_time * 1000,
+        )
+
+        self.assertEqual([max(0, qty or 0) for qty in dict_result], interval_result)
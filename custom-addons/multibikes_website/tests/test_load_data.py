@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Tests for the synthetic load data generator of multibikes_website module."""
+from odoo.models import BaseModel
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+
+from odoo.addons.multibikes_website.tools.load_data import RentalLoadGenerator
+
+SMALL_SIZES = {
+    "bikes": 6,
+    "accessories": 3,
+    "years": 1,
+    "orders": 12,
+    "lines_per_order": 3,
+    "confirm_ratio": 0.0,
+    "period_transfers": 8,
+    "failed_ratio": 0.5,
+    "extension_ratio": 0.0,
+    "sign_ratio": 0.0,
+}
+
+
+@tagged("post_install", "-at_install")
+class TestLoadData(TransactionCase):
+    """Générateur de données de charge reproductible."""
+
+    def test_generate_small_dataset(self):
+        """Les compteurs correspondent aux tailles demandées."""
+        counts = RentalLoadGenerator(self.env, seed=7, **SMALL_SIZES).generate()
+        self.assertEqual(counts["products"], 9)
+        self.assertEqual(counts["periods"], 2)
+        self.assertEqual(counts["day_configs"], 14)
+        self.assertEqual(counts["orders"], 12)
+        self.assertEqual(counts["period_transfers"], 8)
+
+    def test_same_seed_same_data(self):
+        """Une même graine produit les mêmes prix et commandes."""
+        first = RentalLoadGenerator(self.env, seed=11)
+        second = RentalLoadGenerator(self.env, seed=11)
+        first_products = first.create_products(5, 2)
+        second_products = second.create_products(5, 2)
+        self.assertEqual(
+            first_products.mapped("product_pricing_ids.price"),
+            second_products.mapped("product_pricing_ids.price"),
+        )
+
+    def test_period_transfers_use_stock_configs(self):
+        """Les transferts sont liés à la configuration de stock de leur produit"""
+        generator = RentalLoadGenerator(self.env, seed=3)
+        products = generator.create_products(4, 0)
+        periods = generator.create_periods(1)
+        pickings = generator.create_period_transfers(products, periods, 6, 0.5)
+
+        self.assertEqual(len(pickings), 6)
+        self.assertTrue(all(pickings.mapped("is_period_transfer")))
+        for picking in pickings:
+            config = picking.period_config_id
+            self.assertEqual(config._name, "mb.renting.stock.period.config")
+            self.assertIn(config.period_id, periods)
+            self.assertEqual(config.storable_product_ids, picking.move_ids.product_id)
+
+    def test_sign_requests_recordset(self):
+        """Sans demande à créer, un recordset vide est retourné"""
+        generator = RentalLoadGenerator(self.env, seed=5)
+        sign_requests = generator.create_sign_requests(self.env["sale.order"], 0.0)
+        self.assertIsInstance(sign_requests, BaseModel)
+        self.assertFalse(sign_requests)
+
+    def test_unknown_size(self):
+        """Une taille inconnue est refusée."""
+        with self.assertRaises(ValueError):
+            RentalLoadGenerator(self.env, bicycles=3)
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""Query-count and wall-time budgets for the shop hot paths."""
+import time
+from datetime import datetime, time as dt_time, timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+from odoo.addons.website.tools import MockRequest
+
+from odoo.addons.multibikes_website.controllers.main import WebsiteSaleRentingCustom
+from odoo.addons.multibikes_website.tools.load_data import RentalLoadGenerator
+
+# Tailles mesurées : chaque chemin est mesuré sur le petit jeu de données, puis
+# après agrandissement au grand ; le nombre de requêtes ne doit pas augmenter.
+CATALOG_SIZES = (5, 20)
+# Grille de la boutique : infos de combinaison de chacun de ses produits
+GRID_SIZE = 20
+# Lignes de location confirmées par produit de la grille, avant puis après
+GRID_RENTAL_DENSITIES = (1, 5)
+PERIOD_MONTHS = (12, 24)
+PERIOD_CONFIG_COUNTS = (50, 500)
+# Stock souhaité des configurations de transition : un transfert chacune
+TRANSITION_STOCK = 2
+CART_LINE_COUNT = 5
+
+# Budgets maximaux constants : nombre de requêtes SQL et durée en secondes,
+# valables pour chacune des deux tailles. Toute régression de coût fait
+# échouer le test ; une amélioration doit être reportée ici. Les transitions
+# de période créent un transfert par configuration : leur budget est par
+# transfert créé.
+QUERY_BUDGETS = {
+    "combination_info": 40 * GRID_SIZE,
+    "rental_constraints": 15,
+    "cart_update_renting": 120,
+    "period_transitions": 40,
+}
+TIME_BUDGETS = {
+    "combination_info": 1.0 * GRID_SIZE,
+    "rental_constraints": 1.0,
+    "cart_update_renting": 3.0,
+    "period_transitions": 0.1,
+}
+
+
+@tagged("post_install", "-at_install", "-standard", "mb_query_budget")
+class TestQueryBudgets(TransactionCase):
+    """
+    Budgets de requêtes SQL et de durée des chemins critiques de la boutique.
+
+    Exclu de la suite standard (durées dépendantes de la machine), à lancer
+    seul avec --test-tags mb_query_budget.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.website = cls.env["website"].search([], limit=1)
+        cls.company = cls.env.company
+        cls.partner = cls.env["res.partner"].create({"name": "Client budget"})
+
+        cls.recurrence = cls.env["sale.temporal.recurrence"].search(
+            [("duration", "=", 1), ("unit", "=", "day")], limit=1
+        ) or cls.env["sale.temporal.recurrence"].create(
+            {"name": "Jour", "duration": 1, "unit": "day"}
+        )
+
+        cls.generator = RentalLoadGenerator(cls.env)
+        # Entrepôts principal et d'hivernage, utilisés par les transitions
+        cls.generator._get_rental_warehouses()
+        cls.templates = cls.generator.create_products(
+            CATALOG_SIZES[0], 0
+        ).product_tmpl_id
+
+        # Un an de périodes mensuelles avec leurs configurations de jours, la
+        # première commençant aujourd'hui à minuit (utilisée par le cron)
+        cls.today = datetime.combine(fields.Date.today(), dt_time.min)
+        cls.periods = cls._create_periods(range(PERIOD_MONTHS[0]))
+
+    @classmethod
+    def _create_periods(cls, months):
+        periods = cls.env["mb.renting.period"].create(
+            [
+                {
+                    "name": f"Période budget {month}",
+                    "start_date": cls.today + timedelta(days=30 * month),
+                    "end_date": cls.today + timedelta(days=30 * month + 29),
+                    "company_id": cls.company.id,
+                    "recurrence_id": cls.recurrence.id,
+                }
+                for month in months
+            ]
+        )
+        cls.env["mb.renting.day.config"].create(
+            [
+                {
+                    "period_id": period.id,
+                    "day_of_week": str(day),
+                    "is_open": day != 7,
+                    "allow_pickup": day != 7,
+                    "pickup_hour_from": 9.0,
+                    "pickup_hour_to": 18.0,
+                    "allow_return": day != 7,
+                    "return_hour_from": 8.0,
+                    "return_hour_to": 19.0,
+                }
+                for period in periods
+                for day in range(1, 8)
+            ]
+        )
+        return periods
+
+    def assertConstantBudget(self, name, run, grow):
+        """
+        Mesure run() sur le petit jeu de données puis, après grow(), sur le
+        grand : chaque mesure doit tenir dans le budget constant de name et
+        le nombre de requêtes ne doit pas augmenter avec la taille.
+        """
+        run()  # Préchauffage des caches du registre (ormcache)
+        counts = []
+        for step in range(2):
+            if step:
+                grow()
+            self.env.flush_all()
+            self.env.invalidate_all()
+            started = time.perf_counter()
+            count_before = self.cr.sql_log_count
+            run()
+            counts.append(self.cr.sql_log_count - count_before)
+            elapsed = time.perf_counter() - started
+            self.assertLessEqual(
+                elapsed,
+                TIME_BUDGETS[name],
+                f"{name} : {elapsed:.2f}s pour un budget de {TIME_BUDGETS[name]}s",
+            )
+
+        small, large = counts
+        for count in counts:
+            self.assertLessEqual(
+                count,
+                QUERY_BUDGETS[name],
+                f"{name} : {count} requêtes pour un budget de {QUERY_BUDGETS[name]}",
+            )
+        self.assertLessEqual(
+            large,
+            small,
+            f"{name} : {small} requêtes puis {large} sur le grand jeu de données,"
+            " le coût dépend de la taille",
+        )
+
+    def test_combination_info(self):
+        """Infos de combinaison d'une grille de 20 produits, 1 puis 5 locations."""
+        start_date = fields.Datetime.now() + timedelta(days=1)
+        products = self.templates.product_variant_ids | self.generator.create_products(
+            GRID_SIZE - len(self.templates), 0
+        )
+        grid = products.product_tmpl_id.with_context(
+            website_id=self.website.id,
+            start_date=start_date,
+            end_date=start_date + timedelta(days=3),
+        )
+
+        def add_rentals(density):
+            self.generator.create_rental_orders(
+                products, density * len(products), lines_per_order=1, confirm_ratio=1.0
+            )
+
+        def run():
+            for template in grid:
+                template._get_combination_info()
+
+        def grow():
+            add_rentals(GRID_RENTAL_DENSITIES[1] - GRID_RENTAL_DENSITIES[0])
+
+        add_rentals(GRID_RENTAL_DENSITIES[0])
+        with MockRequest(self.env, website=self.website):
+            self.assertConstantBudget("combination_info", run, grow)
+
+    def test_rental_constraints(self):
+        """Route /rental/product/constraints sur un puis deux ans de périodes."""
+        controller = WebsiteSaleRentingCustom()
+        results = []
+
+        def run():
+            results.append(controller.renting_product_constraints())
+
+        def grow():
+            self._create_periods(range(PERIOD_MONTHS[0], PERIOD_MONTHS[1]))
+
+        with MockRequest(self.env, website=self.website):
+            self.assertConstantBudget("rental_constraints", run, grow)
+        self.assertGreaterEqual(len(results[-1]["renting_periods"]), PERIOD_MONTHS[1])
+
+    def test_cart_update_renting(self):
+        """Mise à jour des dates de location d'un panier de 5 lignes."""
+        start_date = fields.Datetime.now() + timedelta(days=2)
+        order = self.env["sale.order"].create(
+            {
+                "partner_id": self.partner.id,
+                "website_id": self.website.id,
+                "rental_start_date": start_date,
+                "rental_return_date": start_date + timedelta(days=1),
+                "order_line": [
+                    (
+                        0,
+                        0,
+                        {
+                            "product_id": template.product_variant_id.id,
+                            "product_uom_qty": 1,
+                        },
+                    )
+                    for template in self.templates[:CART_LINE_COUNT]
+                ],
+            }
+        )
+        controller = WebsiteSaleRentingCustom()
+        durations = iter(range(3, 10))
+
+        def run():
+            days = next(durations)
+            controller.cart_update_renting(
+                start_date=fields.Datetime.to_string(start_date),
+                end_date=fields.Datetime.to_string(start_date + timedelta(days=days)),
+            )
+
+        def grow():
+            # Le coût du panier ne doit pas dépendre du catalogue
+            self.generator.create_products(CATALOG_SIZES[1], 0)
+
+        with MockRequest(self.env, website=self.website, sale_order_id=order.id):
+            self.assertConstantBudget("cart_update_renting", run, grow)
+
+    def test_execute_period_transitions(self):
+        """Cron de transition créant 50 puis 500 transferts, coût par transfert."""
+        period = self.periods[0]
+        StockConfig = self.env["mb.renting.stock.period.config"]
+        name = "period_transitions"
+
+        per_transfer = []
+        for count in PERIOD_CONFIG_COUNTS:
+            # Chaque taille est mesurée seule : les transferts de la
+            # précédente sont annulés avec le savepoint
+            savepoint = self.cr.savepoint()
+            products = self.generator.create_products(count, 0)
+            StockConfig.create(
+                [
+                    {
+                        "period_id": period.id,
+                        "storable_product_ids": [(6, 0, product.ids)],
+                        "stock_available_for_period": TRANSITION_STOCK,
+                    }
+                    for product in products
+                ]
+            )
+            self.env.flush_all()
+            self.env.invalidate_all()
+            started = time.perf_counter()
+            count_before = self.cr.sql_log_count
+            created = StockConfig.execute_period_transitions()
+            queries = self.cr.sql_log_count - count_before
+            elapsed = time.perf_counter() - started
+            savepoint.close(rollback=True)
+            self.env.invalidate_all()
+
+            self.assertEqual(created, count)
+            per_transfer.append(queries / created)
+            self.assertLessEqual(
+                queries / created,
+                QUERY_BUDGETS[name],
+                f"{name} : {queries / created:.1f} requêtes par transfert pour un"
+                f" budget de {QUERY_BUDGETS[name]}",
+            )
+            self.assertLessEqual(
+                elapsed / created,
+                TIME_BUDGETS[name],
+                f"{name} : {elapsed / created:.3f}s par transfert pour un budget"
+                f" de {TIME_BUDGETS[name]}s",
+            )
+
+        small, large = per_transfer
+        self.assertLessEqual(
+            large,
+            small,
+            f"{name} : {small:.1f} requêtes par transfert puis {large:.1f} sur le"
+            " grand jeu de données, le coût dépend de la taille",
+        )
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""Tests for the period transfer failure handling of multibikes_website module."""
+from datetime import timedelta
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.exceptions import UserError
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+
+from odoo.addons.multibikes_website.tools.load_data import RentalLoadGenerator
+
+
+@tagged("post_install", "-at_install")
+class TestPeriodTransferFailures(TransactionCase):
+    """Détection, notification et relance des transferts de période ratés."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.generator = RentalLoadGenerator(cls.env, seed=26)
+        cls.products = cls.generator.create_products(3, 0)
+        cls.period = cls.generator.create_periods(1)[0]
+        cls.main_warehouse, cls.winter_warehouse = (
+            cls.generator._get_rental_warehouses()
+        )
+        cls.stock_config = cls.env["mb.renting.stock.period.config"].create(
+            {
+                "period_id": cls.period.id,
+                "storable_product_ids": [(6, 0, cls.products.ids)],
+            }
+        )
+        stock_manager_group = cls.env.ref("stock.group_stock_manager")
+        cls.managers = cls.env["res.users"].create(
+            [
+                {
+                    "name": f"Gestionnaire stock {index}",
+                    "login": f"mb_stock_manager_{index}",
+                    "groups_id": [(6, 0, [stock_manager_group.id])],
+                }
+                for index in range(3)
+            ]
+        )
+
+    def _create_transfer(self, product, quantity, days_ago=1):
+        """Transfert de période confirmé depuis l'entrepôt principal"""
+        source = self.main_warehouse.lot_stock_id
+        dest = self.winter_warehouse.lot_stock_id
+        scheduled = fields.Datetime.now() - timedelta(days=days_ago)
+        picking = self.env["stock.picking"].create(
+            {
+                "picking_type_id": self.main_warehouse.int_type_id.id,
+                "location_id": source.id,
+                "location_dest_id": dest.id,
+                "scheduled_date": scheduled,
+                "period_config_id": self.stock_config.id,
+                "origin": f"Transition test {product.name}",
+                "move_ids": [
+                    (
+                        0,
+                        0,
+                        {
+                            "name": product.name,
+                            "product_id": product.id,
+                            "product_uom_qty": quantity,
+                            "product_uom": product.uom_id.id,
+                            "location_id": source.id,
+                            "location_dest_id": dest.id,
+                            "date": scheduled,
+                        },
+                    )
+                ],
+            }
+        )
+        picking.action_confirm()
+        picking.write({"is_period_transfer": True})
+        return picking
+
+    def _set_stock(self, product, quantity):
+        self.env["stock.quant"]._update_available_quantity(
+            product, self.main_warehouse.lot_stock_id, quantity
+        )
+
+    def _manager_activities(self):
+        return self.env["mail.activity"].search(
+            [
+                ("res_model", "=", "stock.picking"),
+                ("user_id", "in", self.managers.ids),
+            ]
+        )
+
+    # === Notifications dédupliquées (digest) ===
+
+    def test_notify_once_per_day(self):
+        """Le même ensemble de transferts ratés n'est notifié qu'une fois par jour"""
+        pickings = self._create_transfer(self.products[0], 2) | self._create_transfer(
+            self.products[1], 2
+        )
+        Picking = self.env["stock.picking"]
+
+        Picking._notify_failed_transfers(pickings.ids)
+        Picking._notify_failed_transfers(list(reversed(pickings.ids)))
+
+        self.assertEqual(len(self._manager_activities()), len(self.managers))
+        digest = self.env["mb.failed.transfer.digest"].search(
+            [("picking_ids", "in", pickings.ids)]
+        )
+        self.assertEqual(len(digest), 1)
+        self.assertEqual(digest.picking_count, 2)
+        self.assertGreaterEqual(digest.notified_user_count, len(self.managers))
+
+        # Un ensemble différent donne lieu à une nouvelle notification
+        Picking._notify_failed_transfers(pickings[:1].ids)
+        self.assertEqual(len(self._manager_activities()), 2 * len(self.managers))
+
+    def test_notify_concurrent_digest(self):
+        """Un digest créé entre-temps par une autre détection vaut notification"""
+        picking = self._create_transfer(self.products[0], 2)
+        Digest = self.env["mb.failed.transfer.digest"]
+        digest_hash = Digest._compute_digest_hash(picking.ids)
+        Digest.create(
+            {
+                "name": "Détection concurrente",
+                "digest_date": fields.Date.context_today(Digest),
+                "digest_hash": digest_hash,
+            }
+        )
+
+        # La recherche préalable ne voit pas le digest concurrent : seule la
+        # contrainte d'unicité peut départager les deux détections
+        with patch.object(
+            type(Digest), "_find_digest", return_value=Digest.browse()
+        ):
+            self.env["stock.picking"]._notify_failed_transfers(picking.ids)
+
+        self.assertFalse(self._manager_activities())
+        self.assertEqual(Digest.search_count([("digest_hash", "=", digest_hash)]), 1)
+
+    def test_notify_batched_activities(self):
+        """Les activités de tous les gestionnaires sont créées en un seul appel"""
+        picking = self._create_transfer(self.products[0], 2)
+        Activity = self.env["mail.activity"]
+        original_create = type(Activity).create
+
+        with patch.object(
+            type(Activity), "create", autospec=True, side_effect=original_create
+        ) as create_mock:
+            self.env["stock.picking"]._notify_failed_transfers(picking.ids)
+
+        self.assertEqual(create_mock.call_count, 1)
+        activities = self._manager_activities()
+        self.assertEqual(activities.user_id, self.managers)
+        self.assertEqual(set(activities.mapped("res_id")), {picking.id})
+
+    # === Relance par lots ===
+
+    def test_retry_isolates_failing_picking(self):
+        """Un transfert en erreur ne bloque pas la réservation du reste du lot"""
+        self._set_stock(self.products[0], 10)
+        pickings = self.env["stock.picking"]
+        for _index in range(4):
+            pickings |= self._create_transfer(self.products[0], 1)
+        pickings |= self._create_transfer(self.products[1], 1)  # sans stock
+        faulty = pickings[1]
+        Picking = self.env["stock.picking"]
+        original_assign = type(Picking).action_assign
+
+        def action_assign(records):
+            if faulty in records:
+                raise UserError("Réservation impossible")
+            return original_assign(records)
+
+        with patch.object(
+            type(Picking), "action_assign", autospec=True, side_effect=action_assign
+        ):
+            summary = Picking.attempt_retry_failed_transfers(
+                pickings.ids, batch_size=len(pickings)
+            )
+
+        outcomes = summary["outcomes"]
+        self.assertEqual(outcomes[faulty.id]["status"], "error")
+        self.assertIn("Réservation impossible", outcomes[faulty.id]["error"])
+        for picking in pickings[:4] - faulty:
+            self.assertEqual(outcomes[picking.id]["status"], "assigned")
+            self.assertEqual(picking.state, "assigned")
+        self.assertEqual(outcomes[pickings[4].id]["status"], "blocked")
+        self.assertEqual(summary["success"], 3)
+        self.assertEqual(summary["failed"], 2)
+
+    # === Manques de réservation ===
+
+    def _per_move_shortages(self, pickings):
+        """Calcul de référence, mouvement par mouvement via l'ORM"""
+        shortages = {}
+        for picking in pickings:
+            for move in picking.move_ids.sorted("id"):
+                if move.state in ("done", "cancel"):
+                    continue
+                reserved = sum(move.move_line_ids.mapped("quantity"))
+                if move.product_uom_qty <= reserved:
+                    continue
+                shortages.setdefault(picking.id, []).append(
+                    {
+                        "move_id": move.id,
+                        "product_id": move.product_id.id,
+                        "product_uom_qty": move.product_uom_qty,
+                        "reserved": reserved,
+                        "done": sum(
+                            move.move_line_ids.filtered("picked").mapped("quantity")
+                        ),
+                    }
+                )
+        return shortages
+
+    def test_move_shortages_match_per_move(self):
+        """La requête groupée donne le même résultat que le calcul par mouvement"""
+        self._set_stock(self.products[0], 3)
+        self._set_stock(self.products[1], 5)
+
+        # Réservation partielle : 3 sur 5
+        partial = self._create_transfer(self.products[0], 5)
+        # Réservation partielle dont les quantités sont prélevées : 5 sur 8
+        picked = self._create_transfer(self.products[1], 8)
+        # Un mouvement annulé et un mouvement sans stock dans le même transfert
+        cancelled = self._create_transfer(self.products[2], 4)
+        extra_move = self.env["stock.move"].create(
+            {
+                "name": self.products[2].name,
+                "picking_id": cancelled.id,
+                "product_id": self.products[2].id,
+                "product_uom_qty": 6,
+                "product_uom": self.products[2].uom_id.id,
+                "location_id": cancelled.location_id.id,
+                "location_dest_id": cancelled.location_dest_id.id,
+            }
+        )
+        extra_move._action_confirm()
+        (partial | picked | cancelled).action_assign()
+        picked.move_ids.move_line_ids.write({"picked": True})
+        (cancelled.move_ids - extra_move)._action_cancel()
+
+        # Transfert entièrement réservé : aucun manque
+        self._set_stock(self.products[0], 1)
+        reserved = self._create_transfer(self.products[0], 1)
+        reserved.action_assign()
+
+        pickings = partial | picked | cancelled | reserved
+
+        shortages = pickings._get_move_shortages()
+
+        self.assertEqual(shortages, self._per_move_shortages(pickings))
+        self.assertEqual(shortages[partial.id][0]["reserved"], 3)
+        self.assertEqual(shortages[picked.id][0]["done"], 5)
+        self.assertEqual(
+            [row["move_id"] for row in shortages[cancelled.id]], extra_move.ids
+        )
+        self.assertNotIn(reserved.id, shortages)
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""Outils de calcul pour multibikes_website module."""
+from . import availability_kernel
+from . import availability_metrics
+from . import availability_log
+from . import load_data
@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+"""
+Noyau de calcul des disponibilités pour multibikes_website
+---------------------------------------------------------
+Calculs d'intervalles utilisés par ProductProduct._get_availability_intervals
+et ProductTemplate.calculate_min_availability_over_period :
+
+- découpage de la fenêtre en périodes sur les dates critiques,
+- recherche de la quantité de base de chaque période,
+- impact cumulé des transferts d'hivernage au début de chaque période,
+- quantité minimale disponible sur une fenêtre.
+
+Deux implémentations donnant des résultats identiques sont fournies : une
+version Python pure (référence, toujours disponible) et une version
+vectorisée NumPy (dates en int64, quantités en float64, sommes cumulées et
+searchsorted), utilisée automatiquement pour les longues fenêtres lorsque
+NumPy est installé.
+
+Ce module ne dépend pas de l'ORM : les mouvements sont passés sous forme de
+couples (date, quantité).
+"""
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    np = None
+
+# En dessous de ce nombre de dates critiques, le coût de conversion en
+# tableaux dépasse le gain de la vectorisation
+NUMPY_MIN_CRITICAL_DATES = 64
+
+
+class AvailabilityInterval:
+    """
+    Période de disponibilité [start, end[ avec sa quantité disponible.
+
+    Remplace les dictionnaires {"start", "end", "quantity_available"} à
+    l'intérieur du noyau : __slots__ évite un dictionnaire par instance et
+    rend l'accès aux attributs plus rapide que les clés de dict. Le calcul de
+    la boutique (_get_availability_intervals puis min_quantity_over_window)
+    ne convertit qu'une fois, à la lecture du calcul standard ; la conversion
+    en dictionnaires n'a lieu que pour _get_availabilities, qui les expose à
+    sale_renting.
+    """
+
+    __slots__ = ("start", "end", "quantity_available")
+
+    def __init__(self, start, end, quantity_available=0):
+        self.start = start
+        self.end = end
+        self.quantity_available = quantity_available
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(
+            values["start"], values["end"], values.get("quantity_available", 0)
+        )
+
+    def to_dict(self):
+        return {
+            "start": self.start,
+            "end": self.end,
+            "quantity_available": self.quantity_available,
+        }
+
+    def __eq__(self, other):
+        if not isinstance(other, AvailabilityInterval):
+            return NotImplemented
+        return (self.start, self.end, self.quantity_available) == (
+            other.start,
+            other.end,
+            other.quantity_available,
+        )
+
+    __hash__ = None
+
+    def __repr__(self):
+        return (
+            f"AvailabilityInterval({self.start!r}, {self.end!r}, "
+            f"{self.quantity_available!r})"
+        )
+
+
+class VirtualMove:
+    """
+    Mouvement virtuel issu d'un transfert raté, compatible avec les champs
+    de stock.move utilisés par le calcul (date, product_qty).
+    """
+
+    __slots__ = ("date", "product_qty", "product_id", "is_virtual", "origin_picking")
+
+    def __init__(self, date, product_qty, product_id, origin_picking):
+        self.date = date
+        self.product_qty = product_qty
+        self.product_id = product_id
+        self.is_virtual = True
+        self.origin_picking = origin_picking
+
+
+def as_intervals(availabilities):
+    """Convertit une liste de dicts de disponibilité en AvailabilityInterval"""
+    return [
+        availability
+        if isinstance(availability, AvailabilityInterval)
+        else AvailabilityInterval.from_dict(availability)
+        for availability in availabilities
+    ]
+
+
+def numpy_available():
+    """Indique si le noyau vectorisé peut être utilisé"""
+    return np is not None
+
+
+def to_datetime(value):
+    """Normalise une date de mouvement (datetime ou chaîne Odoo) en datetime"""
+    if isinstance(value, datetime):
+        return value
+    return datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+
+
+def _use_numpy(use_numpy, size):
+    """Choisit l'implémentation : forcée par use_numpy ou selon la taille"""
+    if use_numpy is None:
+        return np is not None and size >= NUMPY_MIN_CRITICAL_DATES
+    if use_numpy and np is None:
+        raise ImportError("NumPy n'est pas installé")
+    return use_numpy
+
+
+def compute_adjusted_availabilities(  # pylint: disable=too-many-arguments
+    from_date,
+    to_date,
+    original_availabilities,
+    outgoing_moves,
+    incoming_moves,
+    winter_qty,
+    use_numpy=None,
+):
+    """
+    Calcule les disponibilités ajustées des quantités d'hivernage.
+
+    Args:
+        from_date (datetime): Début de la fenêtre
+        to_date (datetime): Fin de la fenêtre
+        original_availabilities (list): Périodes {"start", "end",
+            "quantity_available"} retournées par le calcul standard
+        outgoing_moves (list): Couples (date, quantité) sortant de l'hivernage
+        incoming_moves (list): Couples (date, quantité) entrant en hivernage
+        winter_qty (float): Quantité actuellement en hivernage (stock + loué)
+        use_numpy (bool, optional): Force (True) ou interdit (False) le noyau
+            NumPy. Par défaut, choix automatique selon la taille.
+
+    Returns:
+        list: Périodes {"start", "end", "quantity_available"} ajustées
+    """
+    return [
+        interval.to_dict()
+        for interval in compute_adjusted_intervals(
+            from_date,
+            to_date,
+            original_availabilities,
+            outgoing_moves,
+            incoming_moves,
+            winter_qty,
+            use_numpy=use_numpy,
+        )
+    ]
+
+
+def compute_adjusted_intervals(  # pylint: disable=too-many-arguments
+    from_date,
+    to_date,
+    original_availabilities,
+    outgoing_moves,
+    incoming_moves,
+    winter_qty,
+    use_numpy=None,
+):
+    """
+    Variante de compute_adjusted_availabilities travaillant sur des
+    AvailabilityInterval (entrée : dicts ou intervalles, sortie : intervalles).
+    """
+    original_availabilities = as_intervals(original_availabilities)
+    outgoing_moves = [(to_datetime(date), qty) for date, qty in outgoing_moves]
+    incoming_moves = [(to_datetime(date), qty) for date, qty in incoming_moves]
+    critical_dates = _collect_critical_dates(
+        original_availabilities, outgoing_moves, incoming_moves
+    )
+    if _use_numpy(use_numpy, len(critical_dates)):
+        return _compute_numpy(
+            from_date,
+            to_date,
+            critical_dates,
+            original_availabilities,
+            outgoing_moves,
+            incoming_moves,
+            winter_qty,
+        )
+    return _compute_python(
+        from_date,
+        to_date,
+        critical_dates,
+        original_availabilities,
+        outgoing_moves,
+        incoming_moves,
+        winter_qty,
+    )
+
+
+def min_quantity_over_window(availabilities, start_date, end_date, use_numpy=None):
+    """
+    Quantité minimale disponible sur les périodes chevauchant [start_date, end_date[.
+
+    Returns:
+        int | None: Quantité minimale (tronquée à l'entier), None si aucune
+        période ne chevauche la fenêtre
+    """
+    availabilities = as_intervals(availabilities)
+    if _use_numpy(use_numpy, len(availabilities)):
+        return _min_numpy(availabilities, start_date, end_date)
+    return _min_python(availabilities, start_date, end_date)
+
+
+def _collect_critical_dates(original_availabilities, outgoing_moves, incoming_moves):
+    """Dates critiques triées : bornes des périodes et dates des transferts"""
+    critical_dates = set()
+    for availability in original_availabilities:
+        critical_dates.add(availability.start)
+        critical_dates.add(availability.end)
+    for move_date, _qty in outgoing_moves:
+        critical_dates.add(move_date)
+    for move_date, _qty in incoming_moves:
+        critical_dates.add(move_date)
+    return sorted(critical_dates)
+
+
+# === Implémentation Python (référence) ===
+
+
+def _compute_python(  # pylint: disable=too-many-arguments
+    from_date,
+    to_date,
+    critical_dates,
+    original_availabilities,
+    outgoing_moves,
+    incoming_moves,
+    winter_qty,
+):
+    adjusted_availabilities = []
+    for i in range(len(critical_dates) - 1):
+        start = critical_dates[i]
+        end = critical_dates[i + 1]
+        if not from_date <= start < end <= to_date:
+            continue
+
+        base_qty = _find_base_quantity_python(start, end, original_availabilities)
+        net_transfer_impact = _transfer_total_python(
+            incoming_moves, start
+        ) - _transfer_total_python(outgoing_moves, start)
+
+        total_winter_qty = max(0, winter_qty + net_transfer_impact)
+        adjusted_availabilities.append(
+            AvailabilityInterval(start, end, max(0, base_qty - total_winter_qty))
+        )
+    return adjusted_availabilities
+
+
+def _find_base_quantity_python(start, end, original_availabilities):
+    """Première période d'origine qui chevauche [start, end]"""
+    for orig_avail in original_availabilities:
+        if (
+            orig_avail.start <= start < orig_avail.end
+            or orig_avail.start < end <= orig_avail.end
+            or (start <= orig_avail.start and end >= orig_avail.end)
+        ):
+            return orig_avail.quantity_available
+    return 0
+
+
+def _transfer_total_python(moves, period_start):
+    """Somme des quantités des mouvements datés au plus tard de period_start"""
+    total = 0
+    for move_date, qty in moves:
+        if move_date <= period_start:
+            total += qty
+    return total
+
+
+def _min_python(availabilities, start_date, end_date):
+    min_qty = None
+    for availability in availabilities:
+        overlap_start = max(availability.start, start_date)
+        overlap_end = min(availability.end, end_date)
+        if overlap_start < overlap_end:
+            quantity = int(availability.quantity_available)
+            min_qty = quantity if min_qty is None else min(min_qty, quantity)
+    return min_qty
+
+
+# === Implémentation NumPy ===
+
+
+def _datetimes_to_int64(dates):
+    """Convertit une séquence de datetimes naïfs en microsecondes int64"""
+    return np.array(dates, dtype="datetime64[us]").astype(np.int64)
+
+
+def _datetime_to_int64(value):
+    return np.datetime64(value, "us").astype(np.int64)
+
+
+def _cumulative_totals(moves, period_starts):
+    """
+    Somme des quantités des mouvements datés au plus tard de chaque début de
+    période : tri des dates, somme cumulée puis searchsorted.
+    """
+    if not moves:
+        return np.zeros(len(period_starts), dtype=np.float64)
+
+    dates = _datetimes_to_int64([move_date for move_date, _qty in moves])
+    quantities = np.array([qty for _date, qty in moves], dtype=np.float64)
+    order = np.argsort(dates, kind="stable")
+    cumulated = np.concatenate(([0.0], np.cumsum(quantities[order])))
+    counts = np.searchsorted(dates[order], period_starts, side="right")
+    return cumulated[counts]
+
+
+def _compute_numpy(  # pylint: disable=too-many-arguments,too-many-locals
+    from_date,
+    to_date,
+    critical_dates,
+    original_availabilities,
+    outgoing_moves,
+    incoming_moves,
+    winter_qty,
+):
+    if len(critical_dates) < 2:
+        return []
+
+    critical = _datetimes_to_int64(critical_dates)
+    starts, ends = critical[:-1], critical[1:]
+    keep = (
+        (starts >= _datetime_to_int64(from_date))
+        & (starts < ends)
+        & (ends <= _datetime_to_int64(to_date))
+    )
+    kept_index = np.nonzero(keep)[0]
+    if not len(kept_index):
+        return []
+    starts, ends = starts[kept_index], ends[kept_index]
+
+    # Quantité de base : première période d'origine qui chevauche, dans
+    # l'ordre de la liste (mêmes conditions que la version Python)
+    if original_availabilities:
+        orig_starts = _datetimes_to_int64(
+            [avail.start for avail in original_availabilities]
+        )
+        orig_ends = _datetimes_to_int64(
+            [avail.end for avail in original_availabilities]
+        )
+        period_starts = starts[:, None]
+        period_ends = ends[:, None]
+        overlaps = (
+            ((orig_starts <= period_starts) & (period_starts < orig_ends))
+            | ((orig_starts < period_ends) & (period_ends <= orig_ends))
+            | ((period_starts <= orig_starts) & (period_ends >= orig_ends))
+        )
+        has_base = overlaps.any(axis=1).tolist()
+        base_index = overlaps.argmax(axis=1).tolist()
+    else:
+        has_base = [False] * len(starts)
+        base_index = [0] * len(starts)
+
+    net_impacts = (
+        _cumulative_totals(incoming_moves, starts)
+        - _cumulative_totals(outgoing_moves, starts)
+    ).tolist()
+
+    adjusted_availabilities = []
+    for position, date_index in enumerate(kept_index.tolist()):
+        base_qty = (
+            original_availabilities[base_index[position]].quantity_available
+            if has_base[position]
+            else 0
+        )
+        total_winter_qty = max(0, winter_qty + net_impacts[position])
+        adjusted_availabilities.append(
+            AvailabilityInterval(
+                critical_dates[date_index],
+                critical_dates[date_index + 1],
+                max(0, base_qty - total_winter_qty),
+            )
+        )
+    return adjusted_availabilities
+
+
+def _min_numpy(availabilities, start_date, end_date):
+    if not availabilities:
+        return None
+
+    starts = _datetimes_to_int64([avail.start for avail in availabilities])
+    ends = _datetimes_to_int64([avail.end for avail in availabilities])
+    overlap = np.maximum(starts, _datetime_to_int64(start_date)) < np.minimum(
+        ends, _datetime_to_int64(end_date)
+    )
+    if not overlap.any():
+        return None
+
+    return min(
+        int(availabilities[index].quantity_available)
+        for index in np.nonzero(overlap)[0].tolist()
+    )
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Journalisation du calcul des disponibilités pour multibikes_website
+------------------------------------------------------------------
+Le calcul des disponibilités est exécuté à chaque affichage de produit sur la
+boutique. Pour ne pas noyer les logs :
+
+- les messages de détail (par période, par mouvement, par entrepôt) ne sont
+  émis qu'au niveau DEBUG, ou au niveau INFO quand la trace est activée pour
+  la requête courante ; les anomalies (transferts ratés, absence de
+  chevauchement) restent des WARNING émis directement par le logger ;
+- les calculs d'une même requête HTTP produisent un seul enregistrement de
+  synthèse (compteurs et durées cumulés, nombre de calculs), émis à la fin de
+  la requête par ir.http ; hors requête HTTP (cron, shell), chaque calcul
+  produit sa propre synthèse. La synthèse est émise au niveau INFO pour un
+  échantillon des requêtes et au niveau DEBUG sinon.
+
+La trace est activée par la clé de contexte ``mb_availability_trace`` ou,
+pour un administrateur, par l'en-tête HTTP ``X-MB-Availability-Trace: 1``.
+Le taux d'échantillonnage des synthèses est lu dans le paramètre système
+``multibikes_website.availability_log_sample_rate`` (0 par défaut).
+
+Les durées de chaque synthèse alimentent aussi les métriques du worker
+(voir availability_metrics), quel que soit le niveau de log.
+"""
+import logging
+import random
+import time
+from contextlib import contextmanager
+
+from odoo.http import request
+
+from . import availability_metrics
+
+TRACE_CONTEXT_KEY = "mb_availability_trace"
+TRACE_HEADER = "X-MB-Availability-Trace"
+SAMPLE_RATE_PARAM = "multibikes_website.availability_log_sample_rate"
+# Attribut de la requête HTTP mémorisant la décision de trace
+TRACE_REQUEST_ATTR = "_mb_availability_trace"
+# Attribut de la requête HTTP portant la synthèse cumulée de ses calculs
+SUMMARY_REQUEST_ATTR = "_mb_availability_summary"
+
+
+def _http_request():
+    """Requête HTTP courante, ou None hors requête (cron, shell, tests)"""
+    if not request or not getattr(request, "httprequest", None):
+        return None
+    return request
+
+
+def is_trace_enabled(env):
+    """
+    Indique si la trace détaillée est demandée pour la requête courante
+
+    La décision liée à l'en-tête (qui vérifie les droits administrateur) est
+    calculée une seule fois par requête HTTP.
+    """
+    if env.context.get(TRACE_CONTEXT_KEY):
+        return True
+    http_request = _http_request()
+    if http_request is None:
+        return False
+    enabled = getattr(http_request, TRACE_REQUEST_ATTR, None)
+    if enabled is None:
+        enabled = (
+            http_request.httprequest.headers.get(TRACE_HEADER) == "1"
+            and env.user._is_system()
+        )
+        setattr(http_request, TRACE_REQUEST_ATTR, enabled)
+    return enabled
+
+
+def detail(logger, env, msg, *args):
+    """Message de détail : DEBUG, ou INFO si la trace est activée"""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(msg, *args)
+    elif logger.isEnabledFor(logging.INFO) and is_trace_enabled(env):
+        logger.info(msg, *args)
+
+
+def detail_enabled(logger, env):
+    """Permet d'éviter de construire des arguments coûteux inutilement"""
+    return logger.isEnabledFor(logging.DEBUG) or (
+        logger.isEnabledFor(logging.INFO) and is_trace_enabled(env)
+    )
+
+
+def _sample_rate(env):
+    try:
+        return float(
+            env["ir.config_parameter"].sudo().get_param(SAMPLE_RATE_PARAM, 0)
+        )
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class AvailabilitySummary:
+    """
+    Synthèse d'un calcul de disponibilité : compteurs et durées par étape,
+    cumulée à l'échelle de la requête HTTP puis émise en un seul
+    enregistrement de log structuré (clé=valeur).
+    """
+
+    __slots__ = (
+        "logger", "env", "label", "started", "counts", "timings", "fields", "total"
+    )
+
+    def __init__(self, logger, env, label, **fields):
+        self.logger = logger
+        self.env = env
+        self.label = label
+        self.started = time.perf_counter()
+        self.counts = {}
+        self.timings = {}
+        self.fields = fields
+        # Durée cumulée des calculs, pour une synthèse de requête
+        self.total = 0.0
+
+    def count(self, **counts):
+        """Ajoute des compteurs à la synthèse"""
+        for key, value in counts.items():
+            self.counts[key] = self.counts.get(key, 0) + value
+
+    @contextmanager
+    def timer(self, stage):
+        """Mesure la durée d'une étape du calcul"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = self.timings.get(stage, 0.0) + (
+                time.perf_counter() - started
+            )
+
+    def _merge(self, other, total):
+        """Cumule la synthèse d'un calcul dans la synthèse de la requête"""
+        self.count(calls=1, **other.counts)
+        for stage, duration in other.timings.items():
+            self.timings[stage] = self.timings.get(stage, 0.0) + duration
+        self.total += total
+
+    def emit(self):
+        """
+        Enregistre les durées dans les métriques du worker puis cumule la
+        synthèse dans celle de la requête HTTP, ou l'émet directement hors
+        requête
+        """
+        total = time.perf_counter() - self.started
+        availability_metrics.record(dict(self.timings, total=total))
+        availability_metrics.maybe_dump(self.env)
+
+        http_request = _http_request()
+        if http_request is None:
+            self._log(total)
+            return
+        aggregate = getattr(http_request, SUMMARY_REQUEST_ATTR, None)
+        if aggregate is None:
+            aggregate = AvailabilitySummary(
+                self.logger, self.env, self.label, path=http_request.httprequest.path
+            )
+            setattr(http_request, SUMMARY_REQUEST_ATTR, aggregate)
+        aggregate._merge(self, total)
+
+    def _log(self, total):
+        """Émet la synthèse : INFO si tracée ou échantillonnée, sinon DEBUG"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        if is_trace_enabled(self.env) or random.random() < _sample_rate(self.env):
+            level = logging.INFO
+        else:
+            level = logging.DEBUG
+        if not self.logger.isEnabledFor(level):
+            return
+
+        parts = [f"{key}={value}" for key, value in self.fields.items()]
+        parts += [f"{key}={value}" for key, value in self.counts.items()]
+        parts += [
+            f"t_{stage}={duration * 1000:.1f}ms"
+            for stage, duration in self.timings.items()
+        ]
+        parts.append(f"t_total={total * 1000:.1f}ms")
+        self.logger.log(level, "%s %s", self.label, " ".join(parts))
+
+
+def flush_request_summary(env):
+    """
+    Émet la synthèse cumulée des calculs de la requête HTTP courante
+
+    Appelé une fois en fin de requête (voir ir.http) ; sans effet si la
+    requête n'a calculé aucune disponibilité.
+    """
+    http_request = _http_request()
+    aggregate = http_request and getattr(http_request, SUMMARY_REQUEST_ATTR, None)
+    if aggregate is None:
+        return
+    setattr(http_request, SUMMARY_REQUEST_ATTR, None)
+    aggregate.env = env
+    aggregate._log(aggregate.total)
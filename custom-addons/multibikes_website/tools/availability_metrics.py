@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Métriques de durée du calcul des disponibilités
+-----------------------------------------------
+Chaque synthèse de calcul (voir availability_log.AvailabilitySummary) alimente
+un registre propre au processus (worker) : nombre d'appels et dernières durées
+observées pour chaque étape (super, winter_moves, failed_transfers,
+winter_qty, periods, total).
+
+Le registre expose les percentiles p50/p95/p99 via snapshot(), utilisé par
+l'endpoint JSON réservé aux administrateurs, et peut être écrit dans le log
+serveur toutes les N minutes via le paramètre système
+``multibikes_website.availability_metrics_dump_minutes`` (0 = désactivé).
+"""
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+
+_logger = logging.getLogger(__name__)
+
+DUMP_MINUTES_PARAM = "multibikes_website.availability_metrics_dump_minutes"
+
+# Nombre de durées conservées par étape pour le calcul des percentiles
+SAMPLE_SIZE = 2048
+PERCENTILES = (50, 95, 99)
+
+_lock = threading.Lock()
+_stages = {}
+_state = {"started": time.time(), "last_dump": time.monotonic()}
+
+
+class _StageStats:
+    """Compteur et fenêtre glissante des durées d'une étape"""
+
+    __slots__ = ("count", "total", "maximum", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        self.maximum = max(self.maximum, duration)
+        self.samples.append(duration)
+
+    def to_dict(self):
+        ordered = sorted(self.samples)
+        values = {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.maximum * 1000, 3),
+        }
+        for percentile in PERCENTILES:
+            values[f"p{percentile}_ms"] = round(
+                _percentile(ordered, percentile) * 1000, 3
+            )
+        return values
+
+
+def _percentile(ordered, percentile):
+    """Percentile au rang le plus proche sur une liste triée"""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def record(timings):
+    """Enregistre les durées (en secondes) d'un calcul, par étape"""
+    with _lock:
+        for stage, duration in timings.items():
+            stats = _stages.get(stage)
+            if stats is None:
+                stats = _stages[stage] = _StageStats()
+            stats.add(duration)
+
+
+def snapshot():
+    """Photographie des métriques du worker courant"""
+    with _lock:
+        stages = {stage: stats.to_dict() for stage, stats in _stages.items()}
+    return {
+        "pid": os.getpid(),
+        "since": _state["started"],
+        "sample_size": SAMPLE_SIZE,
+        "stages": stages,
+    }
+
+
+def reset():
+    """Remet à zéro les métriques du worker courant"""
+    with _lock:
+        _stages.clear()
+        _state["started"] = time.time()
+
+
+def _dump_minutes(env):
+    try:
+        return float(
+            env["ir.config_parameter"].sudo().get_param(DUMP_MINUTES_PARAM, 0)
+        )
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def maybe_dump(env):
+    """Écrit les métriques dans le log serveur si l'intervalle est écoulé"""
+    minutes = _dump_minutes(env)
+    if minutes <= 0:
+        return False
+    now = time.monotonic()
+    with _lock:
+        if now - _state["last_dump"] < minutes * 60:
+            return False
+        _state["last_dump"] = now
+
+    data = snapshot()
+    for stage, values in sorted(data["stages"].items()):
+        _logger.info(
+            "⏱️ availability.metrics pid=%s stage=%s %s",
+            data["pid"],
+            stage,
+            " ".join(f"{key}={value}" for key, value in values.items()),
+        )
+    return True
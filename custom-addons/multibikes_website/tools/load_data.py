@@ -0,0 +1,468 @@
+# -*- coding: utf-8 -*-
+"""
+Générateur de données synthétiques pour les tests de charge
+-----------------------------------------------------------
+Charge dans une base de test un volume réaliste pour la pile de location :
+
+- vélos et accessoires louables avec leurs tarifs ;
+- calendrier saisonnier de mb.renting.period avec configurations de jours ;
+- commandes de location et leurs lignes ;
+- transferts de période vers/depuis l'hivernage, dont une part ratée ;
+- commandes de prolongation (si multibikes_prolongation est installé) ;
+- demandes de signature (si multibikes_signature est installé).
+
+La génération est reproductible : même graine et mêmes tailles donnent les
+mêmes données. Les enregistrements sont créés par lots via create() multiple
+(un INSERT multi-lignes par lot) afin de garder les champs calculés cohérents.
+
+Utilisé par la commande ``odoo-bin mb_load_data`` ainsi que par les suites de
+benchmark et de budgets de requêtes.
+"""
+import logging
+import random
+from datetime import datetime, time, timedelta
+
+from odoo import fields
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_SEED = 20250601
+
+DEFAULT_SIZES = {
+    "bikes": 200,
+    "accessories": 100,
+    "years": 2,
+    "orders": 500,
+    "lines_per_order": 4,
+    "confirm_ratio": 0.3,
+    "period_transfers": 100,
+    "failed_ratio": 0.25,
+    "extension_ratio": 0.1,
+    "sign_ratio": 0.3,
+}
+
+BATCH_SIZE = 500
+
+
+def _batches(values, size=BATCH_SIZE):
+    for index in range(0, len(values), size):
+        yield values[index : index + size]
+
+
+class RentalLoadGenerator:
+    """
+    Génère un jeu de données de location reproductible.
+
+    :param env: environnement Odoo (idéalement superutilisateur)
+    :param seed: graine du générateur aléatoire
+    :param sizes: surcharges de DEFAULT_SIZES
+    """
+
+    def __init__(self, env, seed=DEFAULT_SEED, **sizes):
+        unknown = set(sizes) - set(DEFAULT_SIZES)
+        if unknown:
+            raise ValueError(f"Tailles inconnues : {', '.join(sorted(unknown))}")
+        self.env = env
+        self.seed = seed
+        self.sizes = dict(DEFAULT_SIZES, **sizes)
+        self.rng = random.Random(seed)
+        self.prefix = f"MB-LOAD-{seed}"
+        self._product_sequence = 0
+
+    # === Point d'entrée ===
+
+    def generate(self):
+        """Génère l'ensemble du jeu de données et retourne les compteurs"""
+        sizes = self.sizes
+        products = self.create_products(sizes["bikes"], sizes["accessories"])
+        periods = self.create_periods(sizes["years"])
+        orders = self.create_rental_orders(
+            products, sizes["orders"], sizes["lines_per_order"], sizes["confirm_ratio"]
+        )
+        pickings = self.create_period_transfers(
+            products, periods, sizes["period_transfers"], sizes["failed_ratio"]
+        )
+        extensions = self.create_extensions(orders, sizes["extension_ratio"])
+        sign_requests = self.create_sign_requests(orders, sizes["sign_ratio"])
+
+        counts = {
+            "products": len(products),
+            "periods": len(periods),
+            "day_configs": len(periods.day_configs_ids),
+            "orders": len(orders),
+            "order_lines": len(orders.order_line),
+            "period_transfers": len(pickings),
+            "extensions": len(extensions),
+            "sign_requests": len(sign_requests),
+        }
+        _logger.info(
+            "📦 Données de charge générées (graine %s) : %s", self.seed, counts
+        )
+        return counts
+
+    # === Produits ===
+
+    def create_products(self, bike_count, accessory_count):
+        """Crée des vélos et accessoires louables, avec un tarif journalier"""
+        recurrence = self._get_day_recurrence()
+        categories = self.env["product.category"].create(
+            [{"name": f"{self.prefix} Vélos"}, {"name": f"{self.prefix} Accessoires"}]
+        )
+
+        vals_list = []
+        for kind, code, count, category, price_range in (
+            ("Vélo", "BIKE", bike_count, categories[0], (15, 60)),
+            ("Accessoire", "ACC", accessory_count, categories[1], (2, 10)),
+        ):
+            for _index in range(count):
+                self._product_sequence += 1
+                number = f"{self._product_sequence:06d}"
+                vals_list.append(
+                    {
+                        "name": f"{self.prefix} {kind} {number}",
+                        "default_code": f"{code}-{self.seed}-{number}",
+                        "type": "consu",
+                        "is_storable": True,
+                        "rent_ok": True,
+                        "is_published": True,
+                        "categ_id": category.id,
+                        "product_pricing_ids": [
+                            (
+                                0,
+                                0,
+                                {
+                                    "recurrence_id": recurrence.id,
+                                    "price": self.rng.randint(*price_range),
+                                },
+                            )
+                        ],
+                    }
+                )
+
+        templates = self.env["product.template"]
+        for batch in _batches(vals_list):
+            templates |= templates.create(batch)
+        return templates.product_variant_ids
+
+    def _get_day_recurrence(self):
+        Recurrence = self.env["sale.temporal.recurrence"]
+        return Recurrence.search(
+            [("duration", "=", 1), ("unit", "=", "day")], limit=1
+        ) or Recurrence.create({"name": "Jour", "duration": 1, "unit": "day"})
+
+    # === Calendrier saisonnier ===
+
+    def create_periods(self, years):
+        """
+        Crée un calendrier saisonnier contigu (basse saison d'octobre à mars,
+        haute saison d'avril à septembre) à la suite des périodes existantes.
+        """
+        Period = self.env["mb.renting.period"]
+        recurrence = self._get_day_recurrence()
+        cursor = Period.get_next_period_start()
+        if cursor <= fields.Datetime.now():
+            cursor = datetime.combine(fields.Date.today(), time.min)
+
+        vals_list = []
+        for _index in range(years * 2):
+            high_season = 4 <= cursor.month <= 9
+            if high_season:
+                end = datetime(cursor.year, 10, 1)
+            elif cursor.month >= 10:
+                end = datetime(cursor.year + 1, 4, 1)
+            else:
+                end = datetime(cursor.year, 4, 1)
+            vals_list.append(
+                {
+                    "name": (
+                        f"{self.prefix} {'Haute' if high_season else 'Basse'}"
+                        f" saison {cursor.year}"
+                    ),
+                    "start_date": cursor,
+                    "end_date": end,
+                    "company_id": self.env.company.id,
+                    "recurrence_id": recurrence.id,
+                }
+            )
+            cursor = end
+
+        periods = Period.create(vals_list)
+        self.env["mb.renting.day.config"].create(
+            [
+                {
+                    "period_id": period.id,
+                    "day_of_week": str(day),
+                    "is_open": day != 7,
+                    "allow_pickup": day != 7,
+                    "pickup_hour_from": 9.0,
+                    "pickup_hour_to": 12.0,
+                    "allow_return": day != 7,
+                    "return_hour_from": 17.0,
+                    "return_hour_to": 19.0,
+                }
+                for period in periods
+                for day in range(1, 8)
+            ]
+        )
+        return periods
+
+    # === Commandes de location ===
+
+    def create_rental_orders(self, products, count, lines_per_order, confirm_ratio):
+        """Crée des commandes de location réparties sur les 180 prochains jours"""
+        partners = self.env["res.partner"].create(
+            [
+                {
+                    "name": f"{self.prefix} Client {index:04d}",
+                    "email": f"client{index}@load.multibikes.test",
+                }
+                for index in range(max(1, count // 10))
+            ]
+        )
+        origin = datetime.combine(fields.Date.today(), time(9, 0))
+
+        vals_list = []
+        for _index in range(count):
+            start = origin + timedelta(days=self.rng.randint(0, 180))
+            end = start + timedelta(days=self.rng.randint(1, 14))
+            lines = self.rng.sample(
+                products.ids, min(len(products), self.rng.randint(1, lines_per_order))
+            )
+            vals_list.append(
+                {
+                    "partner_id": self.rng.choice(partners.ids),
+                    "is_rental_order": True,
+                    "rental_start_date": start,
+                    "rental_return_date": end,
+                    "order_line": [
+                        (
+                            0,
+                            0,
+                            {
+                                "product_id": product_id,
+                                "product_uom_qty": self.rng.randint(1, 3),
+                                "is_rental": True,
+                            },
+                        )
+                        for product_id in lines
+                    ],
+                }
+            )
+
+        orders = self.env["sale.order"]
+        for batch in _batches(vals_list):
+            orders |= orders.create(batch)
+
+        to_confirm = orders.filtered(lambda _o: self.rng.random() < confirm_ratio)
+        for batch in _batches(to_confirm):
+            batch.action_confirm()
+        return orders
+
+    # === Transferts de période ===
+
+    def create_period_transfers(self, products, periods, count, failed_ratio):
+        """
+        Crée des transferts de période entre l'entrepôt principal et
+        l'entrepôt d'hivernage. Les transferts ratés sont planifiés dans le
+        passé et restent confirmés faute de stock.
+        """
+        if not count:
+            return self.env["stock.picking"]
+        main_warehouse, winter_warehouse = self._get_rental_warehouses()
+        now = fields.Datetime.now()
+
+        transfers = []
+        for _index in range(count):
+            transfers.append(
+                (
+                    products[self.rng.randrange(len(products))],
+                    periods[self.rng.randrange(len(periods))],
+                    self.rng.random() < 0.5,
+                    self.rng.random() < failed_ratio,
+                )
+            )
+
+        # Une configuration de stock par (période, produit) transféré, comme
+        # celles créées par action_auto_configure_all_products
+        config_keys = sorted(
+            {(period.id, product.id) for product, period, _dir, _failed in transfers}
+        )
+        StockConfig = self.env["mb.renting.stock.period.config"]
+        configs = StockConfig
+        for batch in _batches(config_keys):
+            configs |= StockConfig.create(
+                [
+                    {
+                        "period_id": period_id,
+                        "storable_product_ids": [(6, 0, [product_id])],
+                    }
+                    for period_id, product_id in batch
+                ]
+            )
+        config_by_key = dict(zip(config_keys, configs.ids))
+
+        vals_list = []
+        for product, period, to_winter, failed in transfers:
+            source, dest = (
+                (main_warehouse.lot_stock_id, winter_warehouse.lot_stock_id)
+                if to_winter
+                else (winter_warehouse.lot_stock_id, main_warehouse.lot_stock_id)
+            )
+            if failed:
+                scheduled = now - timedelta(days=self.rng.randint(1, 30))
+            else:
+                scheduled = now + timedelta(days=self.rng.randint(1, 365))
+            quantity = self.rng.randint(1, 10)
+            vals_list.append(
+                {
+                    "picking_type_id": main_warehouse.int_type_id.id,
+                    "location_id": source.id,
+                    "location_dest_id": dest.id,
+                    "scheduled_date": scheduled,
+                    "period_config_id": config_by_key[(period.id, product.id)],
+                    "origin": (
+                        f"{self.prefix} Transition "
+                        f"{'vers' if to_winter else 'depuis'} hivernage"
+                    ),
+                    "move_ids": [
+                        (
+                            0,
+                            0,
+                            {
+                                "name": f"Transition {product.name}",
+                                "product_id": product.id,
+                                "product_uom_qty": quantity,
+                                "product_uom": product.uom_id.id,
+                                "location_id": source.id,
+                                "location_dest_id": dest.id,
+                                "date": scheduled,
+                            },
+                        )
+                    ],
+                }
+            )
+
+        pickings = self.env["stock.picking"]
+        for batch in _batches(vals_list):
+            created = pickings.create(batch)
+            created.action_confirm()
+            created.with_context(skip_period_transfer_check=True).write(
+                {"is_period_transfer": True}
+            )
+            pickings |= created
+        return pickings
+
+    def _get_rental_warehouses(self):
+        Warehouse = self.env["stock.warehouse"]
+        main_warehouse = Warehouse.get_main_rental_warehouse()
+        if not main_warehouse:
+            main_warehouse = Warehouse.search(
+                [("company_id", "=", self.env.company.id)], limit=1
+            )
+            main_warehouse.is_main_rental_warehouse = True
+        winter_warehouse = Warehouse.get_winter_storage_warehouse()
+        if not winter_warehouse:
+            winter_warehouse = Warehouse.create(
+                {
+                    "name": f"{self.prefix} Hivernage",
+                    "code": "HIV",
+                    "company_id": self.env.company.id,
+                    "is_winter_storage_warehouse": True,
+                }
+            )
+        return main_warehouse, winter_warehouse
+
+    # === Prolongations ===
+
+    def create_extensions(self, orders, ratio):
+        """Crée des commandes de prolongation (multibikes_prolongation)"""
+        SaleOrder = self.env["sale.order"]
+        if "mb_original_rental_id" not in SaleOrder._fields or not ratio:
+            return SaleOrder
+
+        vals_list = []
+        for order in orders.filtered(lambda _o: self.rng.random() < ratio):
+            start = order.rental_return_date
+            end = start + timedelta(days=self.rng.randint(1, 7))
+            vals_list.append(
+                {
+                    "partner_id": order.partner_id.id,
+                    "is_rental_order": True,
+                    "mb_is_rental_extension": True,
+                    "mb_original_rental_id": order.id,
+                    "rental_start_date": start,
+                    "rental_return_date": end,
+                    "order_line": [
+                        (
+                            0,
+                            0,
+                            {
+                                "product_id": line.product_id.id,
+                                "product_uom_qty": line.product_uom_qty,
+                                "is_rental": True,
+                            },
+                        )
+                        for line in order.order_line
+                    ],
+                }
+            )
+
+        extensions = SaleOrder
+        for batch in _batches(vals_list):
+            extensions |= SaleOrder.create(batch)
+        return extensions
+
+    # === Demandes de signature ===
+
+    def create_sign_requests(self, orders, ratio):
+        """
+        Crée des demandes de signature liées aux commandes (multibikes_signature)
+
+        Returns:
+            Recordset sign.request créé, vide si le ratio est nul. Sans le
+            module sign, recordset sale.order vide (aucune commande signée).
+        """
+        if "sign.request" not in self.env:
+            return orders.browse()
+        SignRequest = self.env["sign.request"]
+        if "sale_order_id" not in SignRequest._fields or not ratio:
+            return SignRequest
+
+        # multibikes_signature est installé : contrat factice de son module
+        # pylint: disable=import-outside-toplevel
+        from odoo.addons.multibikes_signature.tools.pdf_samples import make_pdf
+
+        attachment = self.env["ir.attachment"].create(
+            {
+                "name": f"{self.prefix} contrat.pdf",
+                "raw": make_pdf(1, 2),
+                "mimetype": "application/pdf",
+            }
+        )
+        template = self.env["sign.template"].create({"attachment_id": attachment.id})
+        role = self.env.ref("sign.sign_item_role_customer")
+
+        vals_list = [
+            {
+                "template_id": template.id,
+                "reference": f"{self.prefix} {order.name}",
+                "reference_doc": f"sale.order,{order.id}",
+                "request_item_ids": [
+                    (
+                        0,
+                        0,
+                        {
+                            "partner_id": order.partner_id.id,
+                            "role_id": role.id,
+                            "signer_email": order.partner_id.email,
+                        },
+                    )
+                ],
+            }
+            for order in orders.filtered(lambda _o: self.rng.random() < ratio)
+        ]
+
+        sign_requests = SignRequest
+        for batch in _batches(vals_list):
+            sign_requests |= SignRequest.with_context(no_sign_mail=True).create(batch)
+        return sign_requests